@@ -0,0 +1,85 @@
+"""Wall time of one whole-body bend of articulated bodies of growing size.
+
+Builds a 15 segment gymnast (torso, neck, head, two arms and two legs of
+three segments each) and chains of more segments, bends every joint once per step
+and reports the time per step. The time per segment stays flat because the
+articulated-body algorithm is linear in the number of segments.
+
+Usage:
+    python benchmarks/bench_articulated.py [--steps STEPS]
+"""
+import argparse
+import time
+from airtime import Vector
+from airtime.articulated import ArticulatedBody
+from airtime.body import Color, Cube
+from airtime.joint import HingeJoint
+from airtime.matrix import Matrix
+
+COLOR = Color(1, 1, 1)
+
+
+def hinge(first, second, pos):
+    return HingeJoint(None, 0.1, 0.1, COLOR, first, second, Vector(0, 0, 1), 0, pos, Matrix.identity())
+
+
+def limb(parent, start: Vector, direction: Vector, lengths):
+    "Segments and joints of a limb hanging off parent at start"
+    segments = []
+    joints = []
+    for length in lengths:
+        segment = Cube(None, 0.1 + length * abs(direction.x), 0.1, 0.1 + length * abs(direction.z), COLOR,
+                       pos=start + direction * (length / 2))
+        joints.append(hinge(parent, segment, start))
+        segments.append(segment)
+        parent = segment
+        start = start + direction * length
+    return segments, joints
+
+
+def gymnast(packed: bool) -> ArticulatedBody:
+    "15 segments: torso, neck, head and four limbs of upper, lower and end segment"
+    torso = Cube(None, 0.35, 0.2, 0.6, COLOR)
+    joints = []
+    for start, direction, lengths in (
+        (Vector(0, 0, 0.3), Vector(0, 0, 1), (0.1, 0.2)),  # Neck and head
+        (Vector(0.2, 0, 0.3), Vector(0, 0, 1), (0.3, 0.3, 0.1)),  # Arms
+        (Vector(-0.2, 0, 0.3), Vector(0, 0, 1), (0.3, 0.3, 0.1)),
+        (Vector(0.1, 0, -0.3), Vector(0, 0, -1), (0.45, 0.45, 0.1)),  # Legs
+        (Vector(-0.1, 0, -0.3), Vector(0, 0, -1), (0.45, 0.45, 0.1)),
+    ):
+        joints += limb(torso, start, direction, lengths)[1]
+    return ArticulatedBody(torso, joints, packed)
+
+
+def chain(n: int, packed: bool) -> ArticulatedBody:
+    root = Cube(None, 0.3, 0.3, 0.3, COLOR)
+    joints = limb(root, Vector(0.15, 0, 0), Vector(1, 0, 0), [0.3] * (n - 1))[1]
+    return ArticulatedBody(root, joints, packed)
+
+
+def measure(body: ArticulatedBody, steps: int) -> float:
+    "Seconds per bend of all joints"
+    deltas = [0.001] * len(body.joints)
+    start = time.perf_counter()
+    for _ in range(steps):
+        body.bend(deltas)
+    return (time.perf_counter() - start) / steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=200, help="bends per measurement (default: 200)")
+    args = parser.parse_args()
+
+    print(f"{'model':16} {'segments':>8} {'packed':>8} {'ms/step':>10} {'us/segment':>12}")
+    for packed in (False, True):
+        models = [("gymnast", gymnast(packed))] + [("chain", chain(n, packed)) for n in (15, 30, 60, 120)]
+        for name, body in models:
+            seconds = measure(body, args.steps)
+            n = len(body.segments)
+            print(f"{name:16} {n:8} {str(packed):>8} {seconds * 1e3:10.3f} {seconds / n * 1e6:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Wall time each rotation integrator needs to reach a given accuracy.
+
+Integrates a free asymmetric body spinning close to its intermediate axis
+(the tennis racket effect) with several step sizes per integrator and reports
+the relative energy and angular momentum errors at the end of the run. The
+summary tables list, per target error, the fastest run that reached it.
+
+Usage:
+    python benchmarks/bench_integrators.py [--duration SECONDS]
+"""
+import argparse
+import time
+from airtime import Vector, dot
+from airtime.body import RigidBody
+from airtime.integrators import RK4, DormandPrince, ForwardEuler, Splitting
+from airtime.matrix import Matrix
+from airtime.rotating_body import RotatingBody
+
+INERTIA = Matrix.from_diagonal(1, 2, 3)
+W = Vector(0.01, 2, 0.01)
+TARGETS = (1e-2, 1e-4, 1e-6, 1e-8)
+
+# Integrator factories and the settings (step size or tolerance) to try with each
+RUNS = {
+    "ForwardEuler": [(lambda: ForwardEuler(), dt) for dt in (0.01, 0.001, 0.0001)],
+    "RK4": [(lambda: RK4(), dt) for dt in (0.1, 0.05, 0.02, 0.01, 0.005)],
+    "DormandPrince": [
+        (lambda rtol=rtol: DormandPrince(rtol=rtol, atol=rtol * 1e-3), 0.1) for rtol in (1e-4, 1e-6, 1e-8, 1e-10)
+    ],
+    "Splitting": [(lambda: Splitting(), dt) for dt in (0.1, 0.05, 0.02, 0.01, 0.005, 0.002)],
+}
+
+
+def momentum_and_energy(rotating_body):
+    body = rotating_body.body
+    i = body.inertia_tensor_in(body.pos, Matrix.identity())
+    l = i * rotating_body.w
+    return l, dot(rotating_body.w, l) / 2
+
+
+def measure(integrator, delta_time: float, duration: float) -> tuple[float, float, float]:
+    "Wall time, relative energy error and relative angular momentum error of one run"
+    rotating_body = RotatingBody(RigidBody(None, None, 1, INERTIA), Vector(W.x, W.y, W.z), integrator)
+    l0, e0 = momentum_and_energy(rotating_body)
+    steps = round(duration / delta_time)
+    start = time.perf_counter()
+    for _ in range(steps):
+        rotating_body.time_step(delta_time)
+    wall_time = time.perf_counter() - start
+    l, e = momentum_and_energy(rotating_body)
+    return wall_time, abs(e - e0) / e0, (l - l0).length() / l0.length()
+
+
+def table(title: str, best: dict) -> None:
+    print(f"\nWall time [s] to reach a relative {title} error of")
+    print(f"{'integrator':16}" + "".join(f"{target:>10.0e}" for target in TARGETS))
+    for name, times in best.items():
+        print(f"{name:16}" + "".join(f"{'-' if t is None else f'{t:.3f}':>10}" for t in times))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="simulated seconds (default: 10)")
+    args = parser.parse_args()
+
+    print(f"{'integrator':16} {'delta_time':>10} {'wall [s]':>10} {'energy':>10} {'momentum':>10}")
+    results = {}
+    for name, runs in RUNS.items():
+        for factory, delta_time in runs:
+            integrator = factory()
+            result = measure(integrator, delta_time, args.duration)
+            results.setdefault(name, []).append(result)
+            setting = f"rtol={integrator.rtol:.0e}" if isinstance(integrator, DormandPrince) else f"{delta_time:g}"
+            print(f"{name:16} {setting:>10} {result[0]:10.3f} {result[1]:10.1e} {result[2]:10.1e}")
+
+    for title, column in (("energy", 1), ("angular momentum", 2)):
+        best = {
+            name: [min((r[0] for r in runs if r[column] <= target), default=None) for target in TARGETS]
+            for name, runs in results.items()
+        }
+        table(title, best)
+
+
+if __name__ == "__main__":
+    main()
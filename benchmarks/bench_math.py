@@ -0,0 +1,144 @@
+"""Micro-benchmarks of the airtime math primitives.
+
+Usage:
+    python benchmarks/bench_math.py                        # print results
+    python benchmarks/bench_math.py --save baseline.json   # store a baseline
+    python benchmarks/bench_math.py --compare baseline.json [--tolerance 0.2]
+
+With --compare the run exits with status 1 if any benchmark got slower than
+the baseline by more than the tolerance (a fraction of the baseline ops/sec).
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import timeit
+import tracemalloc
+from airtime import Vector, Quaternion, RotationQuaternion, dot, cross
+from airtime.matrix import Matrix, MatrixAccumulator
+
+v1 = Vector(1.0, 2.0, 3.0)
+v2 = Vector(-4.0, 0.5, 2.0)
+m1 = Matrix.from_euler(0.1, 0.2, 0.3)
+m2 = Matrix.from_euler(0.4, -0.5, 0.6)
+q1 = Quaternion(1.0, 2.0, 3.0, 4.0)
+q2 = Quaternion(5.0, 6.0, 7.0, 8.0)
+r = RotationQuaternion(2 * math.pi / 3, Vector(1.0, 1.0, 1.0))
+total = MatrixAccumulator()
+
+BENCHMARKS = {
+    "vector_add": lambda: v1 + v2,
+    "vector_sub": lambda: v1 - v2,
+    "vector_scale": lambda: v1 * 2.0,
+    "vector_div": lambda: v1 / 2.0,
+    "vector_length": lambda: v1.length(),
+    "dot": lambda: dot(v1, v2),
+    "cross": lambda: cross(v1, v2),
+    "matrix_mul": lambda: m1 * m2,
+    "matrix_mul_vector": lambda: m1 * v1,
+    "matrix_add": lambda: m1 + m2,
+    "matrix_accumulate": lambda: total.__iadd__(m1),
+    "matrix_inv": lambda: m1.inv(),
+    "matrix_transposed": lambda: m1.transposed(),
+    "matrix_from_axis_angle": lambda: Matrix.from_axis_angle(v1, 0.3),
+    "quaternion_mul": lambda: q1 * q2,
+    "rotation_quaternion_rotate": lambda: r.rotate(v1),
+    "quaternion_to_matrix": lambda: r.to_matrix(),
+}
+
+
+def ops_per_second(fn, repeat: int = 5) -> float:
+    "Best of repeat runs, each long enough to be timed reliably"
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def allocations_per_op(fn, number: int = 1000) -> tuple[float, float]:
+    "Memory blocks and bytes allocated per call that are still alive afterwards, i.e. held by the result"
+    results = [None] * number
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for k in range(number):
+        results[k] = fn()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    size = sum(s.size_diff for s in stats if s.size_diff > 0)
+    return blocks / number, size / number
+
+
+def run(names) -> dict:
+    results = {}
+    for name in names:
+        fn = BENCHMARKS[name]
+        blocks, size = allocations_per_op(fn)
+        results[name] = {
+            "ops_per_sec": ops_per_second(fn),
+            "allocs_per_op": blocks,
+            "bytes_per_op": size,
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    "Names of the benchmarks that are slower than the baseline by more than tolerance"
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if result["ops_per_sec"] < (1 - tolerance) * baseline[name]["ops_per_sec"]:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown (default: 0.2)")
+    args = parser.parse_args()
+
+    results = run(args.names or BENCHMARKS)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'benchmark':28} {'ops/sec':>12} {'allocs/op':>10} {'bytes/op':>10} {'vs baseline':>12}")
+    for name, result in results.items():
+        change = ""
+        if name in baseline:
+            change = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        print(
+            f"{name:28} {result['ops_per_sec']:12,.0f} {result['allocs_per_op']:10.1f}"
+            f" {result['bytes_per_op']:10.0f} {change:>12}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "machine": platform.machine(),
+                    "processor": platform.processor(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.compare:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+import numbers
+import numpy as np
+from .matrix import Matrix
+from .quaternion import Quaternion
+from .vector import Vector
+
+# Batched companions of Vector, Matrix and Quaternion.
+# Every operation broadcasts over the leading axis, so one call transforms N values.
+# Like np.asarray, the constructors wrap float arrays without copying them, so the
+# array stays shared with the caller; pass a copy to keep them apart.
+
+
+def _vector(o) -> np.ndarray:
+    if isinstance(o, VectorArray):
+        return o.v
+    if isinstance(o, Vector):
+        return np.array((o.x, o.y, o.z))
+    return np.asarray(o, dtype=float)
+
+
+def as_ndarray(o) -> np.ndarray:
+    "(..., 3, 3) array of a Matrix, a MatrixArray or anything np.asarray takes"
+    if isinstance(o, MatrixArray):
+        return o.m
+    if isinstance(o, Matrix):
+        return np.reshape(np.array(o.e, dtype=float), (3, 3))
+    return np.asarray(o, dtype=float)
+
+
+def _quaternion(o) -> np.ndarray:
+    if isinstance(o, QuaternionArray):
+        return o.q
+    if isinstance(o, Quaternion):
+        return np.array((o.a, o.b, o.c, o.d))
+    return np.asarray(o, dtype=float)
+
+
+def _scalar(o):
+    "Scalars broadcast as is, arrays of N scalars broadcast over the trailing axes"
+    if isinstance(o, numbers.Real):
+        return o
+    if isinstance(o, np.ndarray):
+        return o[..., None]
+    raise NotImplementedError
+
+
+class VectorArray:
+    "N vectors stored as an (N, 3) array"
+
+    # NumPy scalars and arrays on the left leave the operators to the reflected ones here
+    __array_ufunc__ = None
+
+    def __init__(self, v) -> None:
+        self.v = _vector(v)
+        if self.v.shape[-1] != 3:
+            raise ValueError
+
+    @staticmethod
+    def from_vectors(vectors) -> "VectorArray":
+        return VectorArray([(v.x, v.y, v.z) for v in vectors])
+
+    @staticmethod
+    def zero(n: int) -> "VectorArray":
+        return VectorArray(np.zeros((n, 3)))
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.v[..., 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.v[..., 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.v[..., 2]
+
+    def __len__(self) -> int:
+        return len(self.v)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return Vector(*self.v[i].tolist())
+        return VectorArray(self.v[i])
+
+    def __iter__(self):
+        return (Vector(*row) for row in self.v.tolist())
+
+    def __add__(self, o) -> "VectorArray":
+        return VectorArray(self.v + _vector(o))
+
+    def __radd__(self, o) -> "VectorArray":
+        return VectorArray(_vector(o) + self.v)
+
+    def __iadd__(self, o) -> "VectorArray":
+        self.v += _vector(o)
+        return self
+
+    def __sub__(self, o) -> "VectorArray":
+        return VectorArray(self.v - _vector(o))
+
+    def __rsub__(self, o) -> "VectorArray":
+        return VectorArray(_vector(o) - self.v)
+
+    def __isub__(self, o) -> "VectorArray":
+        self.v -= _vector(o)
+        return self
+
+    def __neg__(self) -> "VectorArray":
+        return VectorArray(-self.v)
+
+    def __mul__(self, o) -> "VectorArray":
+        return VectorArray(self.v * _scalar(o))
+
+    def __rmul__(self, o) -> "VectorArray":
+        return self * o
+
+    def __imul__(self, o) -> "VectorArray":
+        self.v *= _scalar(o)
+        return self
+
+    def __truediv__(self, o) -> "VectorArray":
+        return VectorArray(self.v / _scalar(o))
+
+    def __itruediv__(self, o) -> "VectorArray":
+        self.v /= _scalar(o)
+        return self
+
+    def __str__(self) -> str:
+        return f"VectorArray({self.v})"
+
+    def length(self) -> np.ndarray:
+        return np.sqrt(np.einsum("...i,...i->...", self.v, self.v))
+
+    def normalized(self) -> "VectorArray":
+        return self / self.length()
+
+    def isclose(self, o, tol: float = 1e-6) -> bool:
+        return bool(np.all(np.abs(self.v - _vector(o)) < tol))
+
+
+class MatrixArray:
+    "N 3x3 matrices stored as an (N, 3, 3) array"
+
+    __array_ufunc__ = None
+
+    def __init__(self, m) -> None:
+        self.m = as_ndarray(m)
+        if self.m.shape[-2:] != (3, 3):
+            raise ValueError
+
+    @staticmethod
+    def from_matrices(matrices) -> "MatrixArray":
+        return MatrixArray(np.reshape([m.e for m in matrices], (-1, 3, 3)))
+
+    @staticmethod
+    def identity(n: int) -> "MatrixArray":
+        return MatrixArray(np.tile(np.eye(3), (n, 1, 1)))
+
+    @staticmethod
+    def zero(n: int) -> "MatrixArray":
+        return MatrixArray(np.zeros((n, 3, 3)))
+
+    @staticmethod
+    def from_diagonal(d, e, f) -> "MatrixArray":
+        m = np.zeros(np.broadcast(d, e, f).shape + (3, 3))
+        m[..., 0, 0] = d
+        m[..., 1, 1] = e
+        m[..., 2, 2] = f
+        return MatrixArray(m)
+
+    @staticmethod
+    def from_axis_angle(axis, angle) -> "MatrixArray":
+        axis = _vector(axis)
+        n = np.sqrt(np.einsum("...i,...i->...", axis, axis))
+        if np.any(n == 0):
+            raise ValueError
+        c = np.cos(angle)
+        s = np.sin(angle)
+        t = 1 - c
+        x = axis[..., 0] / n
+        y = axis[..., 1] / n
+        z = axis[..., 2] / n
+        m = np.empty(np.broadcast(x, c).shape + (3, 3))
+        m[..., 0, 0] = t * x**2 + c
+        m[..., 0, 1] = t * x * y - s * z
+        m[..., 0, 2] = t * x * z + s * y
+        m[..., 1, 0] = t * x * y + s * z
+        m[..., 1, 1] = t * y**2 + c
+        m[..., 1, 2] = t * y * z - s * x
+        m[..., 2, 0] = t * x * z - s * y
+        m[..., 2, 1] = t * y * z + s * x
+        m[..., 2, 2] = t * z**2 + c
+        return MatrixArray(m)
+
+    @staticmethod
+    def from_axis(axis) -> "MatrixArray":
+        axis = _vector(axis)
+        return MatrixArray.from_axis_angle(axis, np.sqrt(np.einsum("...i,...i->...", axis, axis)))
+
+    def __len__(self) -> int:
+        return len(self.m)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return Matrix(*self.m[i].ravel().tolist())
+        return MatrixArray(self.m[i])
+
+    def __iter__(self):
+        return (Matrix(*m) for m in self.m.reshape(-1, 9).tolist())
+
+    def __add__(self, o) -> "MatrixArray":
+        return MatrixArray(self.m + as_ndarray(o))
+
+    def __iadd__(self, o) -> "MatrixArray":
+        self.m += as_ndarray(o)
+        return self
+
+    def __sub__(self, o) -> "MatrixArray":
+        return MatrixArray(self.m - as_ndarray(o))
+
+    def __isub__(self, o) -> "MatrixArray":
+        self.m -= as_ndarray(o)
+        return self
+
+    def __neg__(self) -> "MatrixArray":
+        return MatrixArray(-self.m)
+
+    def __mul__(self, o):
+        if isinstance(o, (VectorArray, Vector)):
+            return VectorArray(np.einsum("...ij,...j->...i", self.m, _vector(o)))
+        if isinstance(o, (MatrixArray, Matrix)):
+            return MatrixArray(self.m @ as_ndarray(o))
+        if isinstance(o, np.ndarray):
+            return MatrixArray(self.m * o[..., None, None])
+        return MatrixArray(self.m * _scalar(o))
+
+    def __rmul__(self, o):
+        if isinstance(o, Matrix):
+            return MatrixArray(as_ndarray(o) @ self.m)
+        return MatrixArray(self.m * _scalar(o))
+
+    def __str__(self) -> str:
+        return f"MatrixArray({self.m})"
+
+    def transposed(self) -> "MatrixArray":
+        return MatrixArray(np.swapaxes(self.m, -1, -2))
+
+    def det(self) -> np.ndarray:
+        m = self.m
+        return (
+            m[..., 0, 0] * m[..., 1, 1] * m[..., 2, 2]
+            + m[..., 0, 1] * m[..., 1, 2] * m[..., 2, 0]
+            + m[..., 0, 2] * m[..., 1, 0] * m[..., 2, 1]
+            - m[..., 0, 2] * m[..., 1, 1] * m[..., 2, 0]
+            - m[..., 0, 1] * m[..., 1, 0] * m[..., 2, 2]
+            - m[..., 0, 0] * m[..., 1, 2] * m[..., 2, 1]
+        )
+
+    def inv(self) -> "MatrixArray":
+        # Adjugate over determinant, as in Matrix.inv
+        det = self.det()
+        if np.any(det == 0):
+            raise ValueError
+        m = self.m
+        r = np.empty_like(m)
+        r[..., 0, 0] = m[..., 1, 1] * m[..., 2, 2] - m[..., 1, 2] * m[..., 2, 1]
+        r[..., 0, 1] = m[..., 0, 2] * m[..., 2, 1] - m[..., 0, 1] * m[..., 2, 2]
+        r[..., 0, 2] = m[..., 0, 1] * m[..., 1, 2] - m[..., 0, 2] * m[..., 1, 1]
+        r[..., 1, 0] = m[..., 1, 2] * m[..., 2, 0] - m[..., 1, 0] * m[..., 2, 2]
+        r[..., 1, 1] = m[..., 0, 0] * m[..., 2, 2] - m[..., 0, 2] * m[..., 2, 0]
+        r[..., 1, 2] = m[..., 0, 2] * m[..., 1, 0] - m[..., 0, 0] * m[..., 1, 2]
+        r[..., 2, 0] = m[..., 1, 0] * m[..., 2, 1] - m[..., 1, 1] * m[..., 2, 0]
+        r[..., 2, 1] = m[..., 0, 1] * m[..., 2, 0] - m[..., 0, 0] * m[..., 2, 1]
+        r[..., 2, 2] = m[..., 0, 0] * m[..., 1, 1] - m[..., 0, 1] * m[..., 1, 0]
+        return MatrixArray(r / det[..., None, None])
+
+    def isclose(self, o, tol: float = 1e-6) -> bool:
+        return bool(np.all(np.abs(self.m - as_ndarray(o)) < tol))
+
+
+class QuaternionArray:
+    "N quaternions stored as an (N, 4) array of (a, b, c, d)"
+
+    __array_ufunc__ = None
+
+    def __init__(self, q) -> None:
+        self.q = _quaternion(q)
+        if self.q.shape[-1] != 4:
+            raise ValueError
+
+    @staticmethod
+    def from_quaternions(quaternions) -> "QuaternionArray":
+        return QuaternionArray([(q.a, q.b, q.c, q.d) for q in quaternions])
+
+    @property
+    def a(self) -> np.ndarray:
+        return self.q[..., 0]
+
+    @property
+    def b(self) -> np.ndarray:
+        return self.q[..., 1]
+
+    @property
+    def c(self) -> np.ndarray:
+        return self.q[..., 2]
+
+    @property
+    def d(self) -> np.ndarray:
+        return self.q[..., 3]
+
+    def __len__(self) -> int:
+        return len(self.q)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return Quaternion(*self.q[i].tolist())
+        return QuaternionArray(self.q[i])
+
+    def __iter__(self):
+        return (Quaternion(*q) for q in self.q.tolist())
+
+    def __add__(self, o) -> "QuaternionArray":
+        return QuaternionArray(self.q + _quaternion(o))
+
+    def __sub__(self, o) -> "QuaternionArray":
+        return QuaternionArray(self.q - _quaternion(o))
+
+    def __neg__(self) -> "QuaternionArray":
+        return QuaternionArray(-self.q)
+
+    def __mul__(self, o) -> "QuaternionArray":
+        if isinstance(o, (QuaternionArray, Quaternion)):
+            return QuaternionArray(_hamilton(self.q, _quaternion(o)))
+        return QuaternionArray(self.q * _scalar(o))
+
+    def __rmul__(self, o) -> "QuaternionArray":
+        if isinstance(o, Quaternion):
+            return QuaternionArray(_hamilton(_quaternion(o), self.q))
+        return QuaternionArray(self.q * _scalar(o))
+
+    def __truediv__(self, o) -> "QuaternionArray":
+        if isinstance(o, (QuaternionArray, Quaternion)):
+            return self * QuaternionArray(o).reciprocal()
+        return QuaternionArray(self.q / _scalar(o))
+
+    def __str__(self) -> str:
+        return f"QuaternionArray({self.q})"
+
+    def conjugated(self) -> "QuaternionArray":
+        return QuaternionArray(self.q * (1, -1, -1, -1))
+
+    def norm(self) -> np.ndarray:
+        return np.sqrt(np.einsum("...i,...i->...", self.q, self.q))
+
+    def normalized(self) -> "QuaternionArray":
+        return self / self.norm()
+
+    def reciprocal(self) -> "QuaternionArray":
+        return self.conjugated() / self.norm() ** 2
+
+    def isclose(self, o, tol: float = 1e-6) -> bool:
+        return bool(np.all(np.abs(self.q - _quaternion(o)) < tol))
+
+    def to_matrix(self) -> MatrixArray:
+        "Rotation matrices of unit quaternions"
+        a, b, c, d = np.moveaxis(self.q, -1, 0)
+        m = np.empty(self.q.shape[:-1] + (3, 3))
+        m[..., 0, 0] = 1 - 2 * (c * c + d * d)
+        m[..., 0, 1] = 2 * (b * c - a * d)
+        m[..., 0, 2] = 2 * (b * d + a * c)
+        m[..., 1, 0] = 2 * (b * c + a * d)
+        m[..., 1, 1] = 1 - 2 * (b * b + d * d)
+        m[..., 1, 2] = 2 * (c * d - a * b)
+        m[..., 2, 0] = 2 * (b * d - a * c)
+        m[..., 2, 1] = 2 * (c * d + a * b)
+        m[..., 2, 2] = 1 - 2 * (b * b + c * c)
+        return MatrixArray(m)
+
+
+class RotationQuaternionArray(QuaternionArray):
+    "N unit quaternions, each rotating by an angle around an axis"
+
+    def __init__(self, angle, axis) -> None:
+        axis = VectorArray(axis).normalized().v
+        half = np.asarray(angle, dtype=float) / 2
+        q = np.empty(np.broadcast(half, axis[..., 0]).shape + (4,))
+        q[..., 0] = np.cos(half)
+        q[..., 1:] = np.sin(half)[..., None] * axis
+        super().__init__(q)
+
+    def axis(self) -> VectorArray:
+        return VectorArray(self.q[..., 1:]).normalized()
+
+    def angle(self) -> np.ndarray:
+        return 2 * np.arctan2(VectorArray(self.q[..., 1:]).length(), self.q[..., 0])
+
+    def rotate(self, v) -> VectorArray:
+        # Expansion of q * (0, v) * conjugate(q) for unit q
+        w = self.q[..., :1]
+        u = self.q[..., 1:]
+        t = 2 * np.cross(u, _vector(v))
+        return VectorArray(_vector(v) + w * t + np.cross(u, t))
+
+    def __str__(self) -> str:
+        return f"RotationQuaternionArray({self.q})"
+
+
+def _hamilton(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    pa, pb, pc, pd = np.moveaxis(p, -1, 0)
+    qa, qb, qc, qd = np.moveaxis(q, -1, 0)
+    return np.stack(
+        (
+            pa * qa - pb * qb - pc * qc - pd * qd,
+            pa * qb + pb * qa + pc * qd - pd * qc,
+            pa * qc - pb * qd + pc * qa + pd * qb,
+            pa * qd + pb * qc - pc * qb + pd * qa,
+        ),
+        axis=-1,
+    )
+
+
+def dot(a, b) -> np.ndarray:
+    return np.einsum("...i,...i->...", _vector(a), _vector(b))
+
+
+def cross(a, b) -> VectorArray:
+    return VectorArray(np.cross(_vector(a), _vector(b)))
+
+
+def norm(a) -> np.ndarray:
+    return VectorArray(a).length()
+
+
+def outer(a, b) -> MatrixArray:
+    return MatrixArray(_vector(a)[..., :, None] * _vector(b)[..., None, :])
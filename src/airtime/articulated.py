@@ -0,0 +1,112 @@
+from .body import MultiBody, RigidBody
+from .matrix import Matrix, outer
+from .quaternion import RotationQuaternion
+from .vector import Vector, cross, dot
+
+
+class ArticulatedBody(MultiBody):
+    """Segments connected by joints into a tree, bent as a whole in linear time.
+
+    A bend turns every joint by a prescribed amount. Without external torques the
+    angular momentum around the center of mass must not change, so the whole body
+    turns against the joint motion. Following the recursive articulated-body
+    algorithm (Featherstone) this takes one inward pass, accumulating mass, center
+    of mass and inertia of every subtree, and one outward pass, composing the joint
+    rotations from the root to the leaves. Both are O(n) in the number of segments.
+    """
+
+    def __init__(self, root: RigidBody, joints, packed: bool = False):
+        "joints connect root and the other segments into a tree, each joint moves with the segment nearer the root"
+        self.root = root
+        self.joints = []  # In breadth-first order from the root
+        self.segments = [root]  # segments[k + 1] is the child of joints[k]
+        self.parents = []  # Index into segments of the parent of joints[k]
+        self.signs = []  # +1 if the child of joints[k] is its second body, -1 if it is its first
+        touching = {}
+        for joint in joints:
+            touching.setdefault(id(joint.first), []).append(joint)
+            touching.setdefault(id(joint.second), []).append(joint)
+        reached = {id(root)}
+        for index, segment in enumerate(self.segments):  # Grows while iterating
+            for joint in touching.get(id(segment), []):
+                child = joint.second if joint.first is segment else joint.first
+                if id(child) in reached:
+                    continue
+                reached.add(id(child))
+                self.joints.append(joint)
+                self.segments.append(child)
+                self.parents.append(index)
+                self.signs.append(1 if child is joint.second else -1)
+        if len(self.joints) != len(joints):
+            raise ValueError("joints do not form a tree from the root")
+        MultiBody.__init__(self, self.segments + self.joints, packed)
+
+    def bend(self, deltas) -> None:
+        "Bend joints[k] by deltas[k], turning the whole body such that its angular momentum is conserved"
+        segments = self.segments
+        origin = self.root.pos
+        identity = Matrix.identity()
+        # World rotation vectors of the children relative to their parents
+        r = [
+            joint.articulate(delta) * sign
+            for joint, delta, sign in zip(self.joints, deltas, self.signs)
+        ]
+
+        # Inward pass: mass, first mass moment and inertia tensor around origin of every
+        # subtree, with each joint body attached to its parent segment
+        mass = [segment.m for segment in segments]
+        moment = [segment.m * (segment.pos - origin) for segment in segments]
+        inertia = [segment.inertia_tensor_in(origin, identity) for segment in segments]
+        for k, joint in enumerate(self.joints):
+            p = self.parents[k]
+            mass[p] += joint.m
+            moment[p] += joint.m * (joint.pos - origin)
+            inertia[p] = inertia[p] + joint.inertia_tensor_in(origin, identity)
+        for k in reversed(range(len(self.joints))):
+            p = self.parents[k]
+            mass[p] += mass[k + 1]
+            moment[p] += moment[k + 1]
+            inertia[p] = inertia[p] + inertia[k + 1]
+
+        # Angular momentum around the center of mass c that the joint motion alone carries.
+        # A subtree turning by r around the joint point contributes its own spin and the
+        # motion of its center of mass.
+        c = moment[0] / mass[0]
+        h = Vector(0, 0, 0)
+        for k, joint in enumerate(self.joints):
+            m = mass[k + 1]
+            cs = moment[k + 1] / m
+            i = inertia[k + 1] - m * (dot(cs, cs) * identity - outer(cs, cs))
+            h += i * r[k] + m * cross(cs - c, cross(r[k], cs - (joint.pos - origin)))
+        i = inertia[0] - mass[0] * (dot(c, c) * identity - outer(c, c))
+        # The whole body turns such that the total angular momentum stays zero
+        turn = -(i.inv() * h)
+
+        # Outward pass: rigid transforms x -> q x + t of every segment in world coordinates,
+        # the root turning around the center of mass and every child around its joint
+        c += origin
+        q0 = RotationQuaternion.from_axis(turn)
+        transforms = [(q0, c - q0.rotate(c))]
+        for k, joint in enumerate(self.joints):
+            qp, tp = transforms[self.parents[k]]
+            qj = RotationQuaternion.from_axis(r[k])
+            p = joint.pos
+            transforms.append((qp * qj, qp.rotate(p - qj.rotate(p)) + tp))
+
+        # Keep the center of mass in place
+        moved = Vector(0, 0, 0)
+        for segment, (q, t) in zip(segments, transforms):
+            moved += segment.m * (q.rotate(segment.pos) + t)
+        for k, joint in enumerate(self.joints):
+            q, t = transforms[self.parents[k]]
+            moved += joint.m * (q.rotate(joint.pos) + t)
+        shift = c - moved / mass[0]
+
+        zero = Vector(0, 0, 0)
+        for segment, (q, t) in zip(segments, transforms):
+            segment.rotate(zero, q)
+            segment.translate(t + shift)
+        for k, joint in enumerate(self.joints):
+            q, t = transforms[self.parents[k]]
+            joint.rotate(zero, q)
+            joint.translate(t + shift)
@@ -1,11 +1,22 @@
 from dataclasses import dataclass
 import math
-import numpy as np
 import glm
 from .camera import Camera
-from .matrix import Matrix, outer
+from .matrix import Matrix, MatrixAccumulator, outer
 from .vector import Vector, dot
 from .quaternion import Quaternion
+from .renderer import appearance_changed, count, get_mesh, get_vertex_array, write_camera
+from .state import BodyState
+
+
+def model_matrix(pos: Vector, rot: Matrix, scale=(1, 1, 1)) -> glm.mat4:
+    "Model matrix of a body at pos with orientation rot, its mesh scaled by scale along the body axes"
+    # glm matrices are column-major
+    a, b, c, d, e, f, g, h, i = rot.e
+    x, y, z = scale
+    return glm.mat4(
+        a * x, d * x, g * x, 0, b * y, e * y, h * y, 0, c * z, f * z, i * z, 0, pos.x, pos.y, pos.z, 1
+    )
 
 
 @dataclass
@@ -31,63 +42,157 @@ class RigitBody:
 class Body:
     "A body in 3D space"
 
+    # Orientations are renormalized after this many compositions to stop rounding drift
+    renormalize_interval = 64
+
     def __init__(self, pos, rot):
+        "rot is the orientation as a unit Quaternion or rotation Matrix"
+        self.state = None  # Packed BodyState this body is a view into, if any
+        self.index = None
+        self.rotations = 0  # Compositions since the last renormalization
+        self._version = 0
         self.pos = pos or Vector(0, 0, 0)
-        self.rot = rot or Matrix.identity()
+        if isinstance(rot, Matrix):
+            rot = Quaternion.from_matrix(rot)
+        self.orientation = rot or Quaternion(1, 0, 0, 0)
+
+    def bind(self, state, index: int) -> None:
+        "Make this body a view into row index of a packed BodyState"
+        self.state = state
+        self.index = index
+        # Continue counting where this body left off so that cached results stay distinguishable
+        state.versions[index] = self._version
+
+    @property
+    def version(self) -> int:
+        "Incremented whenever the body moves or its mass properties change, to invalidate cached results"
+        if self.state is None:
+            return self._version
+        return int(self.state.versions[self.index])
+
+    def _changed(self) -> None:
+        if self.state is None:
+            self._version += 1
+        else:
+            self.state.versions[self.index] += 1
+
+    @property
+    def pos(self) -> Vector:
+        if self.state is None:
+            return self._pos
+        return Vector(*self.state.pos[self.index].tolist())
+
+    @pos.setter
+    def pos(self, v: Vector) -> None:
+        if self.state is None:
+            self._pos = v
+        else:
+            self.state.pos[self.index] = (v.x, v.y, v.z)
+        self._changed()
+
+    @property
+    def orientation(self) -> Quaternion:
+        "Unit quaternion rotating body coordinates into world coordinates"
+        if self.state is None:
+            return self._orientation
+        return Quaternion(*self.state.orientation[self.index].tolist())
+
+    @orientation.setter
+    def orientation(self, q: Quaternion) -> None:
+        if self.state is None:
+            self._orientation = q
+        else:
+            self.state.orientation[self.index] = (q.a, q.b, q.c, q.d)
+        self._changed()
+
+    @property
+    def rot(self) -> Matrix:
+        "Orientation as a rotation matrix"
+        return self.orientation.to_matrix()
+
+    @rot.setter
+    def rot(self, r: Matrix) -> None:
+        self.orientation = Quaternion.from_matrix(r)
 
     def translate(self, v: Vector) -> None:
         self.pos += v
 
-    def rotate(self, p: Vector, r: Matrix) -> None:
-        "Rotate by Matrix r around point p"
-        self.pos = r * (self.pos - p) + p
-        self.rot = r * self.rot
+    def rotate(self, p: Vector, r: Quaternion) -> None:
+        "Rotate by unit quaternion r around point p"
+        self.pos = r.rotate(self.pos - p) + p
+        q = r * self.orientation
+        self.rotations += 1
+        if self.rotations >= self.renormalize_interval:
+            q = q.normalized()
+            self.rotations = 0
+        self.orientation = q
 
     @property
     def mat4(self) -> glm.mat4:
-        return glm.mat4(
-            self.rot.m[0][0],
-            self.rot.m[1][0],
-            self.rot.m[2][0],
-            0,
-            self.rot.m[0][1],
-            self.rot.m[1][1],
-            self.rot.m[2][1],
-            0,
-            self.rot.m[0][2],
-            self.rot.m[1][2],
-            self.rot.m[2][2],
-            0,
-            self.pos.v[0],
-            self.pos.v[1],
-            self.pos.v[2],
-            1,
-        )
+        return model_matrix(self.pos, self.rot)
 
 
 class RigidBody(Body):
     "A rigid body with mass and inertia tensor"
 
     def __init__(self, pos, rot, m: float, i: Matrix):
+        self._inertia_cache = None  # (key, tensor) of the last inertia_tensor_in call
         Body.__init__(self, pos, rot)
         self.m = m  # Mass
         self.i = i  # Inertia tensor
 
+    @property
+    def m(self) -> float:
+        if self.state is None:
+            return self._m
+        return float(self.state.m[self.index])
+
+    @m.setter
+    def m(self, m: float) -> None:
+        if self.state is None:
+            self._m = m
+        else:
+            self.state.m[self.index] = m
+        self._changed()
+
+    @property
+    def i(self) -> Matrix:
+        if self.state is None:
+            return self._i
+        return Matrix(*self.state.i[self.index].ravel().tolist())
+
+    @i.setter
+    def i(self, i: Matrix) -> None:
+        if self.state is None:
+            self._i = i
+        else:
+            self.state.i[self.index].flat = i.e
+        self._changed()
+
     @property
     def center_of_mass(self) -> Vector:
         return self.pos
 
     def inertia_tensor_in(self, pos: Vector, rot: Matrix) -> Matrix:
-        "Inertia tensor at point p"
+        """Inertia tensor at point pos, in the frame that rot maps to world coordinates.
+
+        The result is cached until the body changes or is asked about another frame.
+        """
+        key = (pos.x, pos.y, pos.z, rot.e, self.version)
+        if self._inertia_cache is not None and self._inertia_cache[0] == key:
+            return Matrix(*self._inertia_cache[1].e)
         # Parallel axis theorem (https://en.wikipedia.org/wiki/Parallel_axis_theorem)
-        delta_pos = pos - self.pos
-        delta_rot = rot * self.rot.transposed()
-        return delta_rot * self.i * delta_rot.transposed() + self.m * (
+        to_frame = rot.transposed()
+        delta_pos = to_frame * (pos - self.pos)
+        delta_rot = to_frame * self.rot
+        i = delta_rot * self.i * delta_rot.transposed() + self.m * (
             dot(delta_pos, delta_pos) * Matrix.identity() - outer(delta_pos, delta_pos)
         )
+        self._inertia_cache = (key, i)
+        return Matrix(*i.e)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Color:
     red: float
     green: float
@@ -97,45 +202,66 @@ class Color:
 class GraphicalBody(Body):
     "A body that can be rendered"
 
-    def __init__(self, ctx, pos, rot, points, triangles, shader, color: Color):
+    def __init__(self, ctx, pos, rot, mesh: tuple, scale, shader, color: Color):
+        """mesh is the name of a function in airtime.mesh followed by its arguments,
+        scale the size of the body along its axes relative to that unit mesh.
+        Without a ctx the body is headless: it takes part in the simulation but cannot be rendered"""
         super().__init__(pos, rot)
+        self._color = color
+        self._scale = tuple(scale)
+        self.ctx = ctx
+        self.vertex_buffer = None
+        self.index_buffer = None
+        self.vertex_array = None
+        if ctx is None:
+            return
+
+        # Bodies of the same kind share program, mesh and vertex array
+        self.vertex_buffer, self.index_buffer = get_mesh(ctx, *mesh)
+        self.vertex_array = get_vertex_array(ctx, shader, *mesh)
 
-        v = np.array([points[i] for t in triangles for i in t], dtype="f4")
-        n = [
-            np.cross(v[i + 1] - v[i], v[i + 2] - v[i])
-            for i in range(0, len(v), 3)
-            for _ in range(3)
-        ]
-        self.vertex_buffer = ctx.buffer(np.hstack([v, n]))
-
-        with open(f"shaders/{shader}.vert", "r", encoding="utf-8") as f:
-            vertex_shader = f.read()
-        with open(f"shaders/{shader}.frag", "r", encoding="utf-8") as f:
-            fragment_shader = f.read()
-
-        self.vertex_array = ctx.vertex_array(
-            ctx.program(vertex_shader, fragment_shader),
-            [(self.vertex_buffer, "3f 3f", "in_position", "in_normal")],
-        )
+    @property
+    def color(self) -> Color:
+        return self._color
 
-        self.vertex_array.program["color"].write(
-            glm.vec3(color.red, color.green, color.blue)
-        )
-        self.vertex_array.program["m_model"].write(self.mat4)
+    @color.setter
+    def color(self, color: Color) -> None:
+        self._color = color
+        appearance_changed(self.ctx)
 
-    def render(self, camera: Camera):
-        self.vertex_array.program["m_proj"].write(camera.projection)
-        self.vertex_array.program["m_view"].write(camera.view)
-        self.vertex_array.program["m_model"].write(self.mat4)
+    @property
+    def scale(self) -> tuple[float, float, float]:
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale) -> None:
+        self._scale = tuple(scale)
+        appearance_changed(self.ctx)
+
+    @property
+    def mat4(self) -> glm.mat4:
+        return model_matrix(self.pos, self.rot, self.scale)
+
+    def render(self, camera: Camera, model: glm.mat4 | None = None):
+        "model overrides the model matrix of the current pose, e.g. with an interpolated one"
+        if self.vertex_array is None:
+            return
+        ctx = self.ctx
+        write_camera(ctx, camera)
+        program = self.vertex_array.program
+        program["m_model"].write(self.mat4 if model is None else model)
+        program["color"].write(glm.vec3(self.color.red, self.color.green, self.color.blue))
         self.vertex_array.render()
+        count(ctx, "uniform_writes", 2)
+        count(ctx, "draw_calls")
 
 
 class SimulationBody(RigidBody, GraphicalBody):
     "A body that is both a rigid body and a graphical body"
 
-    def __init__(self, ctx, pos, rot, m, i, points, triangles, shader, color: Color):
+    def __init__(self, ctx, pos, rot, m, i, mesh, scale, shader, color: Color):
         RigidBody.__init__(self, pos, rot, m, i)
-        GraphicalBody.__init__(self, ctx, pos, rot, points, triangles, shader, color)
+        GraphicalBody.__init__(self, ctx, pos, rot, mesh, scale, shader, color)
 
 
 class Cube(SimulationBody):
@@ -147,7 +273,7 @@ class Cube(SimulationBody):
         c: float,
         color: Color,
         pos: Vector | None = None,
-        rot: Matrix | None = None,
+        rot: Matrix | Quaternion | None = None,
         shader: str = "default",
     ):
         m = a * b * c
@@ -155,35 +281,8 @@ class Cube(SimulationBody):
             (b**2 + c**2) / 12, (a**2 + c**2) / 12, (a**2 + b**2) / 12
         )
 
-        a /= 2
-        b /= 2
-        c /= 2
-        points = [
-            (-a, -b, c),
-            (a, -b, c),
-            (a, b, c),
-            (-a, b, c),
-            (-a, b, -c),
-            (-a, -b, -c),
-            (a, -b, -c),
-            (a, b, -c),
-        ]
-        triangles = [
-            (0, 2, 3),
-            (0, 1, 2),
-            (1, 7, 2),
-            (1, 6, 7),
-            (6, 5, 4),
-            (4, 7, 6),
-            (3, 4, 5),
-            (3, 5, 0),
-            (3, 7, 4),
-            (3, 2, 7),
-            (0, 6, 1),
-            (0, 5, 6),
-        ]
         SimulationBody.__init__(
-            self, ctx, pos, rot, m, i, points, triangles, shader, color
+            self, ctx, pos, rot, m, i, ("cube",), (a, b, c), shader, color
         )
 
 
@@ -196,38 +295,18 @@ class Cylinder(SimulationBody):
         h: float,
         color: Color,
         pos: Vector | None = None,
-        rot: Matrix | None = None,
+        rot: Matrix | Quaternion | None = None,
         shader: str = "default",
+        segments: int = 24,
     ):
+        "segments is the number of sides approximating the round surface"
         m = math.pi * a * b * h
         i = m * Matrix.from_diagonal(
             b**2 / 4 + h**2 / 3, a**2 / 4 + h**2 / 3, (a**2 + b**2) / 4
         )
 
-        a /= 2
-        b /= 2
-        h /= 2
-        top_points = [
-            (a * math.cos(2 * math.pi * i / 24), b * math.sin(2 * math.pi * i / 24), h)
-            for i in range(24)
-        ]
-        bottom_points = [
-            (
-                a * math.cos(2 * math.pi * (i + 0.5) / 24),
-                b * math.sin(2 * math.pi * (i + 0.5) / 24),
-                -h,
-            )
-            for i in range(24)
-        ]
-        top_center = (0, 0, h)
-        bottom_center = (0, 0, -h)
-        points = top_points + bottom_points + [top_center, bottom_center]
-        triangles = [((i + 1) % 24, i, i + 24) for i in range(24)]
-        triangles += [(i + 24, (i + 1) % 24 + 24, (i + 1) % 24) for i in range(24)]
-        triangles += [(i, (i + 1) % 24, 48) for i in range(24)]
-        triangles += [((i + 1) % 24 + 24, i + 24, 49) for i in range(24)]
         SimulationBody.__init__(
-            self, ctx, pos, rot, m, i, points, triangles, shader, color
+            self, ctx, pos, rot, m, i, ("cylinder", segments), (a, b, h), shader, color
         )
 
 
@@ -240,74 +319,71 @@ class Sphere(SimulationBody):
         c: float,
         color: Color,
         pos: Vector | None = None,
-        rot: Matrix | None = None,
+        rot: Matrix | Quaternion | None = None,
         shader: str = "default",
+        segments: int = 24,
+        rings: int = 12,
     ):
+        "segments and rings are the resolution around and from pole to pole"
         m = 0.75 * math.pi * a * b * c
         i = 0.4 * m * Matrix.from_diagonal((b**2 + c**2), (a**2 + c**2), (a**2 + b**2))
 
-        a /= 2
-        b /= 2
-        c /= 2
-        points = []
-        for i in range(24):
-            for j in range(12):
-                points.append(
-                    (
-                        a
-                        * math.sin(math.pi * j / 11)
-                        * math.cos(2 * math.pi * (i + j / 2) / 24),
-                        b
-                        * math.sin(math.pi * j / 11)
-                        * math.sin(2 * math.pi * (i + j / 2) / 24),
-                        c * math.cos(math.pi * j / 11),
-                    )
-                )
-        triangles = []
-        for i in range(24):
-            for j in range(12):
-                triangles.append(
-                    ((i + 1) % 24 * 12 + j, i * 12 + j, i * 12 + (j + 1) % 12)
-                )
-                triangles.append(
-                    (
-                        (i + 1) % 24 * 12 + (j + 1) % 12,
-                        (i + 1) % 24 * 12 + j,
-                        i * 12 + (j + 1) % 12,
-                    )
-                )
         SimulationBody.__init__(
-            self, ctx, pos, rot, m, i, points, triangles, shader, color
+            self, ctx, pos, rot, m, i, ("sphere", segments, rings), (a, b, c), shader, color
         )
 
 
 class MultiBody:
     "A collection of bodies"
 
-    def __init__(self, bodies):
+    def __init__(self, bodies, packed: bool = False):
+        "If packed, the bodies become views into one BodyState and are moved in vectorized form"
         self.bodies = bodies
+        self.state = BodyState(bodies) if packed else None
+        self._inertia_cache = None  # (key, tensor) of the last inertia_tensor_in call
 
     def translate(self, v: Vector) -> None:
+        if self.state is not None:
+            self.state.translate(v)
+            return
         for body in self.bodies:
             body.translate(v)
 
-    def rotate(self, p: Vector, r: Matrix) -> None:
+    def rotate(self, p: Vector, r: Quaternion) -> None:
+        if self.state is not None:
+            self.state.rotate(p, r)
+            return
         for body in self.bodies:
             body.rotate(p, r)
 
     @property
     def center_of_mass(self) -> Vector:
+        if self.state is not None:
+            return self.state.center_of_mass
         m = sum(body.m for body in self.bodies)
         cm = Vector(0, 0, 0)
         for body in self.bodies:
             cm += body.m * body.center_of_mass
         return cm / m
 
-    def inertia_tensor_at(self, p: Vector) -> Matrix:
-        i = Matrix.zero()
+    def inertia_tensor_in(self, pos: Vector, rot: Matrix) -> Matrix:
+        """Inertia tensor at point pos, in the frame that rot maps to world coordinates.
+
+        Only the contributions of bodies that changed since the last call in the same
+        frame are recomputed.
+        """
+        if self.state is not None:
+            return self.state.inertia_tensor_in(pos, rot)
+        key = (pos.x, pos.y, pos.z, rot.e, tuple(body.version for body in self.bodies))
+        if self._inertia_cache is not None and self._inertia_cache[0] == key:
+            return Matrix(*self._inertia_cache[1].e)
+        # Bodies that did not change answer from their own cache
+        total = MatrixAccumulator()
         for body in self.bodies:
-            i += body.inertia_tensor_at(p)
-        return i
+            total += body.inertia_tensor_in(pos, rot)
+        i = total.matrix()
+        self._inertia_cache = (key, i)
+        return Matrix(*i.e)
 
     def render(self, camera: Camera):
         for body in self.bodies:
@@ -8,6 +8,8 @@ class Camera:
         self.azimuth = 0
         self.elevation = 0
         self.distance = 20
+        self._view = None  # (key, matrix) of the last view matrix
+        self._projection = None
 
     def update(self, delta_time):
         velocity = delta_time * 0.001
@@ -30,18 +32,32 @@ class Camera:
 
         self.elevation = glm.clamp(self.elevation, -1.57, 1.57)
 
+    @property
+    def key(self) -> tuple:
+        "Changes whenever the view or the projection changes"
+        return (self.azimuth, self.elevation, self.distance, self.aspect_ratio)
+
     @property
     def view(self):
+        key = (self.azimuth, self.elevation, self.distance)
+        if self._view is not None and self._view[0] == key:
+            return self._view[1]
         pos = glm.vec3(
             self.distance * glm.cos(self.elevation) * glm.sin(self.azimuth),
             self.distance * glm.sin(self.elevation),
             self.distance * glm.cos(self.elevation) * glm.cos(self.azimuth),
         )
-        return glm.lookAt(pos, glm.vec3(0, 0, 0), glm.vec3(0, 1, 0))
+        view = glm.lookAt(pos, glm.vec3(0, 0, 0), glm.vec3(0, 1, 0))
+        self._view = (key, view)
+        return view
 
     @property
     def projection(self):
+        if self._projection is not None and self._projection[0] == self.aspect_ratio:
+            return self._projection[1]
         field_of_view = glm.radians(50)
         near = 0.1
         far = 100
-        return glm.perspective(field_of_view, self.aspect_ratio, near, far)
+        projection = glm.perspective(field_of_view, self.aspect_ratio, near, far)
+        self._projection = (self.aspect_ratio, projection)
+        return projection
@@ -0,0 +1,156 @@
+import numpy as np
+from .arrays import QuaternionArray
+
+# Invariants that exact physics conserves, sampled while a simulation runs. Their
+# errors grow with the time step, so runs at several time steps show the largest
+# one that is still accurate enough, and a sudden jump shows an integrator blowing up.
+
+DIAGNOSTICS_DTYPE = np.dtype(
+    [
+        ("time", "<f8"),
+        ("energy", "<f8"),  # Total rotational kinetic energy
+        ("momentum", "<f8", (3,)),  # Total angular momentum
+        ("energy_error", "<f8"),  # Largest relative energy change of any member since the first sample
+        ("momentum_error", "<f8"),  # Largest relative angular momentum change of any member
+        ("shape_momentum", "<f8", (3,)),  # Angular momentum of the bodies moving since the previous sample
+        ("drift", "<f8"),  # Largest distance of a joint from where its bodies hold it
+    ]
+)
+
+
+class Diagnostics:
+    """Samples conservation laws every every-th step into a ring buffer of the last capacity samples.
+
+    Energy and angular momentum come from rotating, a RotatingBody or, for all members
+    at once, a RotatingEnsemble. The angular momentum that moving bodies carry follows
+    from finite differences of their poses between samples and must stay zero while
+    joints bend a body at rest. The drift of joints is how far they have moved away
+    from the points of their first and second body they were attached at.
+
+    Pass an instance as callback to Simulator.run. Read samples with records, poll
+    or dump. With a tolerance, a relative error beyond it raises a RuntimeError.
+
+    A sample of the gymnast with all three kinds costs about as much as two to three
+    of its steps, so the default of sampling every 100 steps adds less than 5%.
+    """
+
+    def __init__(
+        self,
+        rotating=None,
+        bodies=(),
+        joints=(),
+        capacity: int = 4096,
+        every: int = 100,
+        tolerance: float | None = None,
+    ):
+        self.rotating = rotating
+        self.bodies = list(bodies)
+        self.joints = list(joints)
+        self.every = every
+        self.tolerance = tolerance
+        self.buffer = np.zeros(capacity, dtype=DIAGNOSTICS_DTYPE)
+        self.count = 0  # Samples taken, of which the last capacity are kept
+        self._polled = 0
+        self._reference = None  # Energies and angular momenta of the first sample
+        self._previous = None  # Time and poses of bodies at the previous sample
+        if self.bodies:
+            state = self.bodies[0].state
+            if state is not None and all(body.state is state for body in self.bodies):
+                self._indices = np.array([body.index for body in self.bodies])
+            else:
+                state = None
+            self._state = state
+            self._m = np.array([body.m for body in self.bodies])
+            self._i = np.array([np.reshape(body.i.e, (3, 3)) for body in self.bodies])
+        # Joint positions in the frames of the bodies they connect
+        self._anchors = [
+            (joint, body, body.rot.transposed() * (joint.pos - body.pos))
+            for joint in self.joints
+            for body in (joint.first, joint.second)
+        ]
+
+    def __call__(self, simulator) -> None:
+        "Sample after every every-th step when passed as callback to Simulator.run"
+        if simulator.steps % self.every == 0:
+            self.sample(simulator.time)
+
+    def sample(self, t: float) -> None:
+        "Take a sample at simulated time t"
+        record = self.buffer[self.count % len(self.buffer)]
+        record["time"] = t
+        if self.rotating is not None:
+            energy = np.atleast_1d(self.rotating.kinetic_energy())
+            momentum = np.reshape(_array(self.rotating.angular_momentum()), (-1, 3))
+            if self._reference is None:
+                self._reference = (energy, momentum)
+            energy0, momentum0 = self._reference
+            record["energy"] = energy.sum()
+            record["momentum"] = momentum.sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # Members at rest have no reference to relate their error to and count as exact
+                energy_error = np.abs(energy - energy0) / energy0
+                momentum_error = np.linalg.norm(momentum - momentum0, axis=1) / np.linalg.norm(momentum0, axis=1)
+            record["energy_error"] = np.nan_to_num(energy_error, posinf=np.inf).max()
+            record["momentum_error"] = np.nan_to_num(momentum_error, posinf=np.inf).max()
+        if self.bodies:
+            record["shape_momentum"] = self._shape_momentum(t)
+        if self._anchors:
+            record["drift"] = max(
+                (body.pos + body.rot * anchor - joint.pos).length() for joint, body, anchor in self._anchors
+            )
+        self.count += 1
+        if self.tolerance is not None:
+            error = max(record["energy_error"], record["momentum_error"])
+            if not error <= self.tolerance:
+                raise RuntimeError(f"relative error {error:.3g} exceeds tolerance {self.tolerance:g} at time {t:g}")
+
+    def _shape_momentum(self, t: float) -> np.ndarray:
+        if self._state is not None:
+            pos = self._state.pos[self._indices]
+            orientation = self._state.orientation[self._indices]
+        else:
+            pos = np.array([tuple(body.pos) for body in self.bodies])
+            orientation = np.array([(q.a, q.b, q.c, q.d) for q in (body.orientation for body in self.bodies)])
+        previous = self._previous
+        self._previous = (t, pos, orientation)
+        if previous is None or t == previous[0]:
+            return np.zeros(3)
+        t0, pos0, orientation0 = previous
+        # Rotation vectors of the turns since the previous sample
+        turn = (QuaternionArray(orientation) * QuaternionArray(orientation0).conjugated()).q
+        turn *= np.where(turn[:, :1] < 0, -1, 1)
+        sin = np.linalg.norm(turn[:, 1:], axis=1)
+        angle = 2 * np.arctan2(sin, turn[:, 0])
+        theta = turn[:, 1:] * np.divide(angle, sin, out=np.full_like(sin, 2.0), where=sin > 0)[:, None]
+        # Spin of each body around its center of mass and orbit of the centers of mass around the common one
+        rot = QuaternionArray(orientation).to_matrix().m
+        i = rot @ self._i @ np.swapaxes(rot, 1, 2)
+        cm = self._m @ pos / self._m.sum()
+        momentum = np.einsum("nij,nj->i", i, theta) + np.cross(pos - cm, self._m[:, None] * (pos - pos0)).sum(axis=0)
+        return momentum / (t - t0)
+
+    def records(self) -> np.ndarray:
+        "Kept samples, oldest first"
+        n = len(self.buffer)
+        if self.count <= n:
+            return self.buffer[: self.count].copy()
+        k = self.count % n
+        return np.concatenate((self.buffer[k:], self.buffer[:k]))
+
+    def poll(self) -> np.ndarray:
+        "Samples taken since the last poll, as far as they are still kept"
+        new = min(self.count - self._polled, len(self.buffer))
+        self._polled = self.count
+        records = self.records()
+        return records[len(records) - new :]
+
+    def dump(self, path) -> None:
+        "Save the kept samples as .npy file"
+        np.save(path, self.records())
+
+
+def _array(v) -> np.ndarray:
+    "Components of a Vector or VectorArray"
+    if hasattr(v, "v"):
+        return v.v
+    return np.array((v.x, v.y, v.z))
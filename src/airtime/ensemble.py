@@ -0,0 +1,64 @@
+import numpy as np
+from .arrays import MatrixArray, QuaternionArray, RotationQuaternionArray, VectorArray, cross, dot
+
+
+class RotatingEnsemble:
+    "N independent rotating rigid bodies advanced together, the batched form of RotatingBody"
+
+    # Orientations are renormalized after this many steps, as in Body
+    renormalize_interval = 64
+
+    def __init__(self, i, w, orientation=None):
+        """i are the (N, 3, 3) inertia tensors in body coordinates,
+        w the (N, 3) angular velocities in radians per second and
+        orientation the (N, 4) unit quaternions, identity by default"""
+        self.i = MatrixArray(i)
+        self.w = VectorArray(np.array(VectorArray(w).v))
+        if orientation is None:
+            orientation = np.tile((1.0, 0.0, 0.0, 0.0), (len(self.i), 1))
+        self.orientation = QuaternionArray(np.array(QuaternionArray(orientation).q))
+        self.steps = 0
+
+    @staticmethod
+    def from_rotating_bodies(rotating_bodies) -> "RotatingEnsemble":
+        "Ensemble of the current state of RotatingBody instances around a RigidBody"
+        return RotatingEnsemble(
+            MatrixArray.from_matrices(r.body.i for r in rotating_bodies),
+            VectorArray.from_vectors(r.w for r in rotating_bodies),
+            QuaternionArray.from_quaternions(r.body.orientation for r in rotating_bodies),
+        )
+
+    def __len__(self) -> int:
+        return len(self.i)
+
+    @property
+    def rot(self) -> MatrixArray:
+        "Orientations as rotation matrices"
+        return self.orientation.to_matrix()
+
+    @property
+    def inertia_tensor(self) -> MatrixArray:
+        "Inertia tensors in world coordinates"
+        rot = self.rot
+        return rot * self.i * rot.transposed()
+
+    def angular_momentum(self) -> VectorArray:
+        "Angular momenta of all members in world coordinates"
+        return self.inertia_tensor * self.w
+
+    def kinetic_energy(self) -> np.ndarray:
+        "Rotational kinetic energies of all members"
+        return dot(self.w, self.angular_momentum()) / 2
+
+    def time_step(self, delta_time: float) -> None:
+        "delta_time in seconds"
+        # Same update as RotatingBody.time_step, for all members at once
+        i = self.inertia_tensor
+        self.w -= i.inv() * cross(self.w, i * self.w) * delta_time
+        angle = self.w.length() * delta_time
+        # A member at rest has no axis; any axis with angle 0 gives the identity
+        axis = np.where((angle == 0)[:, None], (1.0, 0.0, 0.0), self.w.v)
+        self.orientation = RotationQuaternionArray(angle, axis) * self.orientation
+        self.steps += 1
+        if self.steps % self.renormalize_interval == 0:
+            self.orientation = self.orientation.normalized()
@@ -2,12 +2,15 @@ from .body import Color, Cube, Cylinder, Sphere, MultiBody
 from .joint import HingeJoint
 from .vector import Vector
 from .matrix import Matrix
+from .motion import MotionProgram
 
 PI = 3.14159265358979323846
 
 
 class Gymnast(MultiBody):
-    def __init__(self, ctx):
+    def __init__(self, ctx=None, motion: MotionProgram | None = None):
+        """Without a ctx the gymnast is headless and can only be simulated.
+        motion drives the hinge angle, by default closing it at one radian per second."""
         cube1 = Cube(ctx, 1, 8, 8, Color(0, 0.5, 1))
         cube2 = Cube(ctx, 4, 1, 1, Color(0, 0.5, 0), pos=Vector(2.5, -3.5, 4.5))
         self.hinge = HingeJoint(
@@ -23,7 +26,38 @@ class Gymnast(MultiBody):
             rot=Matrix.identity(),
         )
         bodies = [cube1, cube2, self.hinge]
-        MultiBody.__init__(self, bodies)
+        MultiBody.__init__(self, bodies, packed=True)
+        self.motion = motion or MotionProgram((0, PI / 2), ((PI / 2,), (0,)))
+        if self.motion.angles.shape[1] != 1:
+            raise ValueError(f"motion has {self.motion.angles.shape[1]} joint axes, the gymnast has 1")
+        self.time = 0.0
+        self._delta_time = None
+        self._deltas = None
+        self._step = 0  # Index into _deltas of the next time step
+        # Keyframes are absolute angles, start in the pose of the first one
+        start = float(self.motion.angles_at(0)[0]) - self.hinge.angle
+        if start:
+            self.hinge.bend(start)
 
     def time_step(self, delta_time):
-        self.hinge.bend(-0.01)
+        "delta_time in seconds"
+        if delta_time != self._delta_time:
+            self._delta_time = delta_time
+            step = self.time / delta_time
+            if abs(step - round(step)) < 1e-6:
+                self._deltas = self.motion.table(delta_time)[:, 0].tolist()
+                self._step = round(step)
+            else:
+                # After a change of the time step the time can lie between the samples of the table
+                self._deltas = None
+        if self._deltas is None:
+            angles = self.motion.angles_at((self.time, self.time + delta_time))[:, 0]
+            angle = float(angles[1] - angles[0])
+        elif self._step < len(self._deltas):
+            angle = self._deltas[self._step]
+        else:
+            angle = 0.0
+        if angle:
+            self.hinge.bend(angle)
+        self._step += 1
+        self.time += delta_time
@@ -1,8 +1,9 @@
 import numpy as np
-from dataclasses import dataclass
+from .arrays import as_ndarray
 from .body import Color, Body, RigidBody, GraphicalBody, Cylinder, Sphere
 from .matrix import Matrix
-from .vector import Vector
+from .quaternion import RotationQuaternion
+from .vector import Vector, cross, dot
 
 
 class Joint(Body):
@@ -11,6 +12,161 @@ class Joint(Body):
         self.first = first
         self.second = second
 
+    def _bend(self, axes, angles) -> None:
+        "Turn second relative to first by angles around axes, given in the coordinate system of the joint"
+        I_a = self.first.inertia_tensor_in(self.pos, self.rot)
+        I_b = self.second.inertia_tensor_in(self.pos, self.rot)
+        alpha_a, alpha_b = solve_joint(I_a, I_b, axes, angles)
+        # Split off the rotation both bodies share, which turns the joint with them
+        shared = Vector(0, 0, 0)
+        for c in _complement(axes):
+            shared += c * dot(c, alpha_a)
+        to_global = self.rot
+        rot = RotationQuaternion.from_axis(to_global * shared)
+        rotA = RotationQuaternion.from_axis(to_global * (alpha_a - shared))
+        rotB = RotationQuaternion.from_axis(to_global * (alpha_b - shared))
+        self.first.rotate(self.pos, rotA)
+        self.second.rotate(self.pos, rotB)
+        self.first.rotate(self.pos, rot)
+        self.second.rotate(self.pos, rot)
+        self.rotate(self.pos, rot)
+
+
+_AXES = [Vector(1, 0, 0), Vector(0, 1, 0), Vector(0, 0, 1)]
+
+
+def _complement(axes) -> list[Vector]:
+    "Orthonormal basis of the directions perpendicular to all axes"
+    if len(axes) >= 3:
+        return []
+    if len(axes) == 2:
+        return [cross(axes[0], axes[1]).normalized()]
+    a = axes[0].normalized()
+    # Start from the coordinate axis least aligned with a
+    e = min(_AXES, key=lambda e: abs(dot(e, a)))
+    u = (e - a * dot(e, a)).normalized()
+    return [u, cross(a, u)]
+
+
+def solve_joint(i_a: Matrix, i_b: Matrix, axes, angles) -> tuple[Vector, Vector]:
+    """Rotations (alpha_a, alpha_b) of the two bodies of a joint that bend it by angles around axes.
+
+    Generalizes solve_hinge to joints with one to three degrees of freedom. i_a and
+    i_b are the inertia tensors at the joint and axes the directions of its degrees
+    of freedom, all in the coordinate system of the joint. The joint applies a torque
+    F tau along the axes, with opposite signs to the two bodies, and a constraint
+    torque C T along the remaining directions C, such that
+
+        I_A alpha_a = C T + F tau
+        I_B alpha_b = C T - F tau
+        alpha_b - alpha_a = F angles
+
+    With A = I_A^-1 and B = I_B^-1 this is the single 3x3 system
+    ((A - B) C | (A + B) F) (T, tau) = -F angles, whatever the number of axes.
+    """
+    A = i_a.inv()
+    B = i_b.inv()
+    C = _complement(axes)
+    columns = [(A - B) * c for c in C] + [(A + B) * f for f in axes]
+    n = Matrix(*(getattr(column, x) for x in "xyz" for column in columns))
+    relative = Vector(0, 0, 0)
+    for f, angle in zip(axes, angles):
+        relative += f * angle
+    x = n.inv() * -relative
+    torque = Vector(0, 0, 0)
+    for c, t in zip(C, x):
+        torque += c * t
+    drive = Vector(0, 0, 0)
+    for f, tau in zip(axes, list(x)[len(C):]):
+        drive += f * tau
+    return A * (torque + drive), B * (torque - drive)
+
+
+def solve_joints(i_a, i_b, axes, angles) -> tuple[np.ndarray, np.ndarray]:
+    """Batched solve_joint over (..., 3, 3) inertia tensors and (..., k) angles for k axes.
+
+    All joints share the same axes, e.g. many ball joints or one joint with many
+    candidate bends. Returns the (..., 3) rotations of the first and second bodies.
+    """
+    a = np.linalg.inv(as_ndarray(i_a))
+    b = np.linalg.inv(as_ndarray(i_b))
+    f = np.array([(axis.x, axis.y, axis.z) for axis in axes]).T  # (3, k)
+    c = np.array([(v.x, v.y, v.z) for v in _complement(axes)]).reshape(-1, 3).T  # (3, 3 - k)
+    n = np.concatenate(((a - b) @ c, (a + b) @ f), axis=-1)
+    relative = np.asarray(angles, dtype=float) @ f.T
+    shape = np.broadcast_shapes(n.shape[:-2], relative.shape[:-1])
+    n = np.broadcast_to(n, shape + (3, 3))
+    relative = np.broadcast_to(relative, shape + (3,))
+    x = np.linalg.solve(n, -relative[..., None])[..., 0]
+    torque = x[..., : c.shape[1]] @ c.T
+    drive = x[..., c.shape[1]:] @ f.T
+    alpha_a = (a @ (torque + drive)[..., None])[..., 0]
+    alpha_b = (b @ (torque - drive)[..., None])[..., 0]
+    return alpha_a, alpha_b
+
+
+def solve_hinge(i_a: Matrix, i_b: Matrix) -> tuple[float, float, float, float]:
+    """Angular accelerations (alpha_x, alpha_y, alpha_A, alpha_B) of a hinge for a unit torque.
+
+    i_a and i_b are the inertia tensors of the two bodies at the joint, in the joint
+    frame whose z-axis is the axis of rotation. The bodies share alpha_x and alpha_y
+    and the constraint torques T_x and T_y, while T_z = 1 turns the first body by
+    alpha_A and the second one, with -T_z, by alpha_B:
+
+        I_A (alpha_x, alpha_y, alpha_A) = (T_x, T_y, 1)
+        I_B (alpha_x, alpha_y, alpha_B) = (T_x, T_y, -1)
+
+    With A = I_A^-1 and B = I_B^-1 equating the shared rows leaves the 2x2 system
+    (A - B)[:2, :2] T = -(A[:2, 2] + B[:2, 2]) for the constraint torques.
+    """
+    a00, a01, a02, a10, a11, a12, a20, a21, a22 = i_a.inv().e
+    b00, b01, b02, b10, b11, b12, b20, b21, b22 = i_b.inv().e
+    # Cramer's rule
+    m00, m01, m10, m11 = a00 - b00, a01 - b01, a10 - b10, a11 - b11
+    r0, r1 = -(a02 + b02), -(a12 + b12)
+    det = m00 * m11 - m01 * m10
+    if det == 0:
+        raise ValueError
+    t_x = (r0 * m11 - m01 * r1) / det
+    t_y = (m00 * r1 - r0 * m10) / det
+    return (
+        a00 * t_x + a01 * t_y + a02,
+        a10 * t_x + a11 * t_y + a12,
+        a20 * t_x + a21 * t_y + a22,
+        b20 * t_x + b21 * t_y - b22,
+    )
+
+
+def solve_hinges(i_a, i_b, angle=None) -> np.ndarray:
+    """Batched solve_hinge over (..., 3, 3) inertia tensors, returning (..., 4) accelerations.
+
+    With angle, broadcast against the leading axes, the accelerations are scaled such that
+    alpha_B - alpha_A = angle, i.e. to the rotations that bend the hinge by angle.
+    One joint with many candidate angles is i_a and i_b of shape (3, 3) and angle of shape (N,).
+    """
+    a = np.linalg.inv(as_ndarray(i_a))
+    b = np.linalg.inv(as_ndarray(i_b))
+    m = a[..., :2, :2] - b[..., :2, :2]
+    r = -(a[..., :2, 2] + b[..., :2, 2])
+    det = m[..., 0, 0] * m[..., 1, 1] - m[..., 0, 1] * m[..., 1, 0]
+    if np.any(det == 0):
+        raise ValueError
+    t_x = (r[..., 0] * m[..., 1, 1] - m[..., 0, 1] * r[..., 1]) / det
+    t_y = (m[..., 0, 0] * r[..., 1] - r[..., 0] * m[..., 1, 0]) / det
+    alpha = np.stack(
+        (
+            a[..., 0, 0] * t_x + a[..., 0, 1] * t_y + a[..., 0, 2],
+            a[..., 1, 0] * t_x + a[..., 1, 1] * t_y + a[..., 1, 2],
+            a[..., 2, 0] * t_x + a[..., 2, 1] * t_y + a[..., 2, 2],
+            b[..., 2, 0] * t_x + b[..., 2, 1] * t_y - b[..., 2, 2],
+        ),
+        axis=-1,
+    )
+    if angle is None:
+        return alpha
+    scale = np.asarray(angle, dtype=float) / (alpha[..., 3] - alpha[..., 2])
+    return alpha * scale[..., None]
+
 
 class HingeJoint(Joint, Cylinder):
     def __init__(
@@ -31,6 +187,11 @@ class HingeJoint(Joint, Cylinder):
         self.axis = axis
         self.angle = angle
 
+    def articulate(self, angle: float) -> Vector:
+        "Record a bend by angle and return the rotation of second relative to first in world coordinates"
+        self.angle += angle
+        return self.rot * Vector(0, 0, angle)
+
     def bend(self, angle: float) -> None:
         "Bend by angle around axis of rotation"
         self.angle += angle
@@ -45,30 +206,14 @@ class HingeJoint(Joint, Cylinder):
 
         I_a = self.first.inertia_tensor_in(self.pos, self.rot)
         I_b = self.second.inertia_tensor_in(self.pos, self.rot)
-
-        A = np.array(
-            [
-                [I_a[0][0], I_a[0][1], I_a[0][2], 0, -1, 0],
-                [I_a[1][0], I_a[1][1], I_a[1][2], 0, 0, -1],
-                [I_a[2][0], I_a[2][1], I_a[2][2], 0, 0, 0],
-                [I_b[0][0], I_b[0][1], 0, I_b[0][2], -1, 0],
-                [I_b[1][0], I_b[1][1], 0, I_b[1][2], 0, -1],
-                [I_b[2][0], I_b[2][1], 0, I_b[2][2], 0, 0],
-            ]
-        )
-        b = np.array([0, 0, 1, 0, 0, -1])
-        x = np.linalg.solve(A, b)
-        alpha_x = x[0]
-        alpha_y = x[1]
-        alpha_A = x[2]
-        alpha_B = x[3]
+        alpha_x, alpha_y, alpha_A, alpha_B = solve_hinge(I_a, I_b)
 
         scale = angle / (alpha_B - alpha_A)
 
-        to_global = self.rot.transposed()
-        rot = Matrix.from_axis(to_global * Vector(alpha_x * scale, alpha_y * scale, 0))
-        rotA = Matrix.from_axis(to_global * Vector(0, 0, alpha_A * scale))
-        rotB = Matrix.from_axis(to_global * Vector(0, 0, alpha_B * scale))
+        to_global = self.rot
+        rot = RotationQuaternion.from_axis(to_global * Vector(alpha_x * scale, alpha_y * scale, 0))
+        rotA = RotationQuaternion.from_axis(to_global * Vector(0, 0, alpha_A * scale))
+        rotB = RotationQuaternion.from_axis(to_global * Vector(0, 0, alpha_B * scale))
         self.first.rotate(self.pos, rotA)
         self.second.rotate(self.pos, rotB)
         self.first.rotate(self.pos, rot)
@@ -76,29 +221,79 @@ class HingeJoint(Joint, Cylinder):
         self.rotate(self.pos, rot)
 
 
-@dataclass
-class SaddleJoint(Joint):
-    axis_a: Vector  # Axis of rotation
-    axis_b: Vector  # Axis of rotation
-    angle_a: float = 0
-    angle_b: float = 0
-
-
-@dataclass
-class BallJoint(Joint):
-    phi: float = 0
-    theta: float = 0
-    psi: float = 0
-
-    def bend(self, phi: float, theta: float, psi: float) -> None:
-        "Bend by angles"
-        # self.phi += phi
-        # self.theta += theta
-        # self.psi += psi
-        # Ia = self.first.inertia_tensor_at(self.pos)
-        # Ib = self.second.inertia_tensor_at(self.pos)
-        # # TODO: Implement physics
-        # angle_a = 0
-        # angle_b = 0
-        # self.first.rotate(self.x, Matrix.from_axis_angle(self.axis, angle_a))
-        # self.second.rotate(self.x, Matrix.from_axis_angle(self.axis, angle_b))
+class SaddleJoint(Joint, Cylinder):
+    "Joint with two axes of rotation, like the wrist or the base of the thumb"
+
+    def __init__(
+        self,
+        ctx,
+        radius: float,
+        height: float,
+        color: Color,
+        first: RigidBody,
+        second: RigidBody,
+        axis_a: Vector,  # Axes of rotation in the coordinate system of the joint
+        axis_b: Vector,
+        pos,
+        rot,
+        angle_a: float = 0,
+        angle_b: float = 0,
+    ):
+        Joint.__init__(self, pos, rot, first, second)
+        Cylinder.__init__(self, ctx, radius, radius, height, color, pos, rot)
+        self.axis_a = axis_a
+        self.axis_b = axis_b
+        self.angle_a = angle_a
+        self.angle_b = angle_b
+
+    def articulate(self, angles: tuple[float, float]) -> Vector:
+        "Record a bend by angles and return the rotation of second relative to first in world coordinates"
+        angle_a, angle_b = angles
+        self.angle_a += angle_a
+        self.angle_b += angle_b
+        return self.rot * (self.axis_a * angle_a + self.axis_b * angle_b)
+
+    def bend(self, angle_a: float, angle_b: float) -> None:
+        "Bend by angle_a around axis_a and by angle_b around axis_b"
+        self.angle_a += angle_a
+        self.angle_b += angle_b
+        self._bend([self.axis_a, self.axis_b], [angle_a, angle_b])
+
+
+class BallJoint(Joint, Sphere):
+    "Joint that rotates freely around all three axes, like the shoulder or the hip"
+
+    def __init__(
+        self,
+        ctx,
+        radius: float,
+        color: Color,
+        first: RigidBody,
+        second: RigidBody,
+        pos,
+        rot,
+    ):
+        Joint.__init__(self, pos, rot, first, second)
+        Sphere.__init__(self, ctx, radius, radius, radius, color, pos, rot)
+        # Sums of the rotation vector increments of all bends, in joint coordinates. These are
+        # no Euler angles: summing rotation vectors only approximates composing the rotations,
+        # as long as the increments are small.
+        self.rx = 0
+        self.ry = 0
+        self.rz = 0
+
+    def articulate(self, increment: tuple[float, float, float]) -> Vector:
+        """Record a bend by the small rotation vector increment in joint coordinates and
+        return the rotation of second relative to first in world coordinates"""
+        rx, ry, rz = increment
+        self.rx += rx
+        self.ry += ry
+        self.rz += rz
+        return self.rot * Vector(rx, ry, rz)
+
+    def bend(self, rx: float, ry: float, rz: float) -> None:
+        "Bend by the small rotation vector (rx, ry, rz) in joint coordinates, one step's increment"
+        self.rx += rx
+        self.ry += ry
+        self.rz += rz
+        self._bend(_AXES, [rx, ry, rz])
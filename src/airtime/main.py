@@ -1,14 +1,25 @@
+import argparse
 import sys
 import pygame as pg
 import moderngl as mgl
-from AirTime.camera import Camera
-from AirTime.gymnast import Gymnast
-from AirTime.rotating_body import RotatingBody
-from AirTime.vector import Vector
+from airtime.camera import Camera
+from airtime.gymnast import Gymnast
+from airtime.profiling import FrameProfiler, Overlay
+from airtime.renderer import InstancedRenderer, set_profiler
+from airtime.replay import Replay
+from airtime.rotating_body import RotatingBody
+from airtime.simulator import FixedStepScheduler
+from airtime.vector import Vector
+from airtime.worker import PhysicsWorker
 
 
 class GraphicsEngine:
-    def __init__(self, win_size=(800, 600)):
+    def __init__(
+        self, win_size=(800, 600), worker: str | None = None, replay: str | None = None, profile: str | None = None
+    ):
+        """worker is None to simulate between frames, or 'thread' or 'process' to simulate in the background.
+        replay is the path of a recorded trajectory to play back instead of simulating.
+        profile is the path of a .csv or .json file to export frame timings to on exit."""
         pg.init()
         self.WIN_SIZE = win_size
 
@@ -27,28 +38,99 @@ class GraphicsEngine:
         self.delta_time = 0
 
         self.camera = Camera(aspect_ratio=win_size[0] / win_size[1])
+        self.renderer = InstancedRenderer(self.ctx)
+        # F3 toggles an overlay with percentiles of the frame timings
+        self.profiler = FrameProfiler()
+        set_profiler(self.ctx, self.profiler)
+        self.profile = profile
+        self.overlay = None
+        self.show_overlay = False
         self.body = Gymnast(self.ctx)
+        self.scheduler = FixedStepScheduler(self.body, 1 / 120, bodies=self.body.bodies)
+        self.worker = None
+        self.replay = None
+        if replay is not None:
+            # Left and right scrub, up and down change the speed, space pauses
+            self.replay = Replay(replay)
+            self.replay.check_bodies(self.body.bodies)
+        elif worker is not None:
+            # The worker simulates its own headless gymnast, self.body only renders its poses
+            self.worker = PhysicsWorker(Gymnast, len(self.body.bodies), 1 / 120, process=worker == "process")
+            self.worker.start()
 
     def check_events(self):
         keys = pg.key.get_pressed()
         if keys[pg.K_ESCAPE] or pg.event.get(pg.QUIT):
+            if self.worker is not None:
+                self.worker.stop()
+            if self.profile is not None:
+                self.profiler.export(self.profile)
             pg.quit()
             sys.exit()
+        for event in pg.event.get(pg.KEYDOWN):
+            if event.key == pg.K_F3:
+                self.show_overlay = not self.show_overlay
+            if self.replay is not None:
+                if event.key == pg.K_LEFT:
+                    self.replay.step(-1)
+                elif event.key == pg.K_RIGHT:
+                    self.replay.step(1)
+                elif event.key == pg.K_UP:
+                    self.replay.speed *= 2
+                elif event.key == pg.K_DOWN:
+                    self.replay.speed /= 2
+                elif event.key == pg.K_SPACE:
+                    self.replay.paused = not self.replay.paused
 
     def render(self):
         self.ctx.clear(0, 0, 0)
-        self.body.render(self.camera)
+        if self.replay is not None:
+            self.replay.draw_poses(self.renderer, self.body.bodies)
+        else:
+            if self.worker is None:
+                poses = self.scheduler.poses()
+                pos = [tuple(p) for p, _ in poses]
+                orientation = [(q.a, q.b, q.c, q.d) for _, q in poses]
+            else:
+                _, pos, orientation = self.worker.read()
+            self.renderer.draw_poses(self.body.bodies, pos, orientation)
+        self.renderer.render(self.camera)
+        if self.show_overlay:
+            if self.overlay is None:
+                self.overlay = Overlay(self.ctx, self.WIN_SIZE)
+            if self.overlay.texture is None or self.profiler.frames % 30 == 0:
+                self.overlay.show(self.profiler.lines())
+            self.overlay.render()
         pg.display.flip()
 
     def run(self):
+        profiler = self.profiler
         while True:
-            self.render()
-            self.check_events()
-            self.body.time_step(self.delta_time)
-            self.camera.update(self.delta_time)
+            with profiler.section("render"):
+                self.render()
+            with profiler.section("check_events"):
+                self.check_events()
+            with profiler.section("time_step"):
+                if self.replay is not None:
+                    self.replay.advance(self.delta_time / 1000)
+                elif self.worker is None:
+                    # clock.tick returns milliseconds, the scheduler takes seconds
+                    self.scheduler.advance(self.delta_time / 1000)
+            with profiler.section("camera_update"):
+                self.camera.update(self.delta_time)
             self.delta_time = self.clock.tick(60)
+            profiler.end_frame()
 
 
 if __name__ == "__main__":
-    app = GraphicsEngine()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "source", nargs="?", help="'thread' or 'process' to simulate in the background, or a .npy trajectory to replay"
+    )
+    parser.add_argument("--profile", help="export frame timings to this .csv or .json file on exit")
+    args = parser.parse_args()
+    if args.source is not None and args.source.endswith(".npy"):
+        app = GraphicsEngine(replay=args.source, profile=args.profile)
+    else:
+        app = GraphicsEngine(worker=args.source, profile=args.profile)
     app.run()
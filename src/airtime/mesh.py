@@ -0,0 +1,67 @@
+import numpy as np
+
+# Unit meshes of the primitive bodies, scaled to size by the model matrix.
+# Each returns (V, 6) float32 vertices, position followed by unit normal, and
+# (T, 3) uint32 vertex indices of triangles, counterclockwise seen from outside.
+# Curved surfaces share vertices between triangles and get smooth normals,
+# edges are split into separate vertices so that faces stay flat.
+
+
+def _triangles(rows: int, columns: int) -> np.ndarray:
+    "Triangles of a grid of rows x columns vertices closed around the columns, two per quad"
+    j, i = np.meshgrid(np.arange(rows - 1), np.arange(columns), indexing="ij")
+    a = j * columns + i
+    b = j * columns + (i + 1) % columns
+    c = a + columns
+    d = b + columns
+    return np.stack((np.stack((a, c, d), -1), np.stack((a, d, b), -1)), -2).reshape(-1, 3)
+
+
+def _mesh(positions, normals, triangles) -> tuple[np.ndarray, np.ndarray]:
+    vertices = np.hstack((np.reshape(positions, (-1, 3)), np.reshape(normals, (-1, 3))))
+    return vertices.astype("f4"), np.asarray(triangles, dtype="u4").reshape(-1, 3)
+
+
+def cube() -> tuple[np.ndarray, np.ndarray]:
+    "Cube with edges of length 1"
+    # Per face its normal and two edge directions with u x v = normal
+    normals = np.array(((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)), dtype=float)
+    u = np.roll(normals, 1, axis=1)
+    v = np.cross(normals, u)
+    corners = np.array(((-1, -1), (1, -1), (1, 1), (-1, 1)), dtype=float) / 2
+    positions = normals[:, None] / 2 + corners[None, :, :1] * u[:, None] + corners[None, :, 1:] * v[:, None]
+    triangles = np.arange(6)[:, None, None] * 4 + np.array(((0, 1, 2), (0, 2, 3)))
+    return _mesh(positions, np.repeat(normals, 4, axis=0), triangles)
+
+
+def cylinder(segments: int = 24) -> tuple[np.ndarray, np.ndarray]:
+    "Cylinder of diameter 1 and height 1 along the z-axis"
+    phi = 2 * np.pi * np.arange(segments) / segments
+    ring = np.stack((np.cos(phi), np.sin(phi), np.zeros(segments)), -1) / 2
+    z = np.array((0, 0, 0.5))
+    # Side as a grid of the top and the bottom ring with radial normals
+    side = np.stack((ring + z, ring - z))
+    side_normals = np.broadcast_to(ring * 2, side.shape)
+    # Caps as a center and a ring each
+    top = np.vstack((z, ring + z))
+    bottom = np.vstack((-z, ring - z))
+    k = np.arange(segments)
+    fan = np.stack((np.zeros(segments, dtype=int), k + 1, (k + 1) % segments + 1), -1)
+    n = 2 * segments
+    triangles = np.vstack((_triangles(2, segments), fan + n, fan[:, ::-1] + n + segments + 1))
+    normals = np.vstack(
+        (side_normals.reshape(-1, 3), np.broadcast_to(z * 2, top.shape), np.broadcast_to(-z * 2, bottom.shape))
+    )
+    return _mesh(np.vstack((side.reshape(-1, 3), top, bottom)), normals, triangles)
+
+
+def sphere(segments: int = 24, rings: int = 12) -> tuple[np.ndarray, np.ndarray]:
+    "Sphere of diameter 1 with segments around the z-axis and rings from pole to pole"
+    theta, phi = np.meshgrid(
+        np.linspace(0, np.pi, rings + 1), 2 * np.pi * np.arange(segments) / segments, indexing="ij"
+    )
+    normals = np.stack((np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)), -1)
+    quads = _triangles(rings + 1, segments).reshape(rings, segments, 2, 3)
+    # The quads touching the poles have one side of length zero, drop their degenerate halves
+    triangles = np.vstack((quads[0, :, 0], quads[1:-1].reshape(-1, 3), quads[-1, :, 1]))
+    return _mesh(normals / 2, normals, triangles)
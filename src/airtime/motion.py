@@ -0,0 +1,41 @@
+import math
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+
+class MotionProgram:
+    """Joint angles over time, interpolated between keyframes by cubic splines.
+
+    Before the first and after the last keyframe the angles hold still. For a given
+    time step the curves are sampled once into a table of per-step angle changes, so
+    playback is a lookup whatever the choreography and is the same on every replay.
+    """
+
+    def __init__(self, times, angles, bc_type="not-a-knot"):
+        """times are the (K,) increasing keyframe times in seconds and angles the (K, J)
+        angles of J joint axes at them, in radians. bc_type is passed to CubicSpline,
+        e.g. "clamped" to start and end at rest. Two keyframes interpolate linearly."""
+        self.times = np.asarray(times, dtype=float)
+        self.angles = np.asarray(angles, dtype=float).reshape(len(self.times), -1)
+        self.spline = CubicSpline(self.times, self.angles, axis=0, bc_type=bc_type)
+        self._tables = {}
+
+    @property
+    def duration(self) -> float:
+        "Time of the last keyframe in seconds"
+        return float(self.times[-1])
+
+    def angles_at(self, t) -> np.ndarray:
+        "(J,) angles at time t, or (N, J) for N times"
+        return self.spline(np.clip(t, self.times[0], self.times[-1]))
+
+    def table(self, delta_time: float) -> np.ndarray:
+        "(steps, J) angle changes of each time step of length delta_time until the motion ends"
+        table = self._tables.get(delta_time)
+        if table is None:
+            steps = math.ceil(self.duration / delta_time - 1e-9)
+            # Differences of absolute samples, so the changes add up to the keyframes exactly
+            table = np.diff(self.angles_at(np.arange(steps + 1) * delta_time), axis=0)
+            table.flags.writeable = False
+            self._tables[delta_time] = table
+        return table
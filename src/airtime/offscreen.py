@@ -0,0 +1,154 @@
+import collections
+import queue
+import subprocess
+import threading
+import numpy as np
+import moderngl as mgl
+import pygame as pg
+from .camera import Camera
+from .renderer import InstancedRenderer
+
+# Rendering without a window, e.g. on servers without display or GPU through EGL and
+# llvmpipe. Frames are rendered into a framebuffer object, copied into pixel buffers
+# and read back from them a few frames later, by when the copy is done, so the
+# readback overlaps rendering. A writer thread encodes the images in the meantime.
+
+
+def create_context():
+    "Standalone OpenGL 3.3 context needing no display, through EGL where available"
+    try:
+        return mgl.create_standalone_context(require=330, backend="egl")
+    except Exception:  # pylint: disable=broad-except
+        return mgl.create_standalone_context(require=330)
+
+
+class ImageSequenceWriter:
+    "Saves frames as numbered image files, in a format given by the extension of pattern"
+
+    def __init__(self, pattern: str = "frame_{:05d}.png"):
+        self.pattern = pattern
+
+    def __call__(self, index: int, image: np.ndarray) -> None:
+        height, width, _ = image.shape
+        pg.image.save(pg.image.frombuffer(image.tobytes(), (width, height), "RGB"), self.pattern.format(index))
+
+
+class VideoWriter:
+    "Pipes frames as raw RGB video into an ffmpeg process encoding them to path"
+
+    def __init__(
+        self, path: str, size: tuple[int, int], fps: float = 60, codec: str = "libx264", ffmpeg: str = "ffmpeg"
+    ):
+        width, height = size
+        self._process = subprocess.Popen(
+            [
+                ffmpeg, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                "-c:v", codec, "-pix_fmt", "yuv420p", path,
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def __call__(self, index: int, image: np.ndarray) -> None:
+        self._process.stdin.write(image.tobytes())
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self._process.returncode}")
+
+
+class OffscreenRenderer:
+    """Framebuffer to render into and read frames back from without stalling.
+
+    Call use before and capture after rendering each frame. capture only starts
+    the copy into one of buffers pixel buffers; the copy of the oldest frame is
+    read when its buffer is needed again, and the (height, width, 3) RGB image
+    handed to writer(index, image) on a separate thread.
+    """
+
+    def __init__(self, ctx, size: tuple[int, int], writer, buffers: int = 3, queued: int = 8):
+        "queued frames at most wait for the writer before capture blocks"
+        self.ctx = ctx
+        self.size = size
+        self.writer = writer
+        self.fbo = ctx.framebuffer(
+            color_attachments=[ctx.renderbuffer(size)], depth_attachment=ctx.depth_renderbuffer(size)
+        )
+        width, height = size
+        self._free = [ctx.buffer(reserve=width * height * 3) for _ in range(buffers)]
+        self._pending = collections.deque()  # (index, buffer) of frames being copied
+        self.frames = 0
+        self._queue = queue.Queue(queued)
+        self._error = None
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    def use(self) -> None:
+        "Render into the framebuffer, cleared to black"
+        self.fbo.use()
+        self.fbo.clear(0, 0, 0)
+
+    def capture(self) -> None:
+        "Read back the frame rendered since use"
+        if not self._free:
+            self._collect()
+        buffer = self._free.pop()
+        self.fbo.read_into(buffer, components=3, alignment=1)
+        self._pending.append((self.frames, buffer))
+        self.frames += 1
+
+    def _collect(self) -> None:
+        index, buffer = self._pending.popleft()
+        width, height = self.size
+        # OpenGL rows start at the bottom, images at the top
+        image = np.frombuffer(buffer.read(), dtype=np.uint8).reshape(height, width, 3)[::-1]
+        self._free.append(buffer)
+        if self._error is not None:
+            raise RuntimeError("writing a frame failed") from self._error
+        self._queue.put((index, image))
+
+    def _write(self) -> None:
+        while (item := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    self.writer(*item)
+                except Exception as error:  # pylint: disable=broad-except
+                    self._error = error
+
+    def close(self) -> None:
+        "Write all captured frames and release the framebuffer"
+        while self._pending:
+            self._collect()
+        self._queue.put(None)
+        self._thread.join()
+        if hasattr(self.writer, "close"):
+            self.writer.close()
+        for buffer in self._free:
+            buffer.release()
+        self.fbo.release()
+        if self._error is not None:
+            raise RuntimeError("writing a frame failed") from self._error
+
+    def __enter__(self) -> "OffscreenRenderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def render_replay(ctx, replay, bodies, writer, size=(800, 600), camera: Camera | None = None) -> int:
+    """Render every skip-th frame of the range of replay with the meshes of bodies and
+    hand them to writer, returns the number of frames rendered"""
+    if camera is None:
+        camera = Camera(aspect_ratio=size[0] / size[1])
+    replay.check_bodies(bodies)
+    ctx.enable(mgl.DEPTH_TEST | mgl.CULL_FACE)
+    renderer = InstancedRenderer(ctx)
+    with OffscreenRenderer(ctx, size, writer) as offscreen:
+        for k in range(replay.first, replay.last + 1, replay.skip):
+            offscreen.use()
+            replay.draw_poses(renderer, bodies, k)
+            renderer.render(camera)
+            offscreen.capture()
+    return offscreen.frames
@@ -0,0 +1,161 @@
+import collections
+import contextlib
+import csv
+import json
+import time
+import numpy as np
+import moderngl as mgl
+import pygame as pg
+from .renderer import count, get_program
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """Wall times of the parts of each frame and counts of what each frame did.
+
+    Time a part with section(name) and count events with count(name), then close
+    the frame with end_frame. The last window frames are kept, for rolling
+    percentiles and for export to CSV or JSON. Times are in milliseconds.
+    """
+
+    def __init__(self, window: int = 600):
+        self.window = window
+        self.frames = 0
+        self.times = {"frame": collections.deque(maxlen=window)}  # name -> times of the kept frames
+        self.counts = {}  # name -> counts of the kept frames
+        self._times = {}  # Totals of the current frame
+        self._counts = {}
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        "Add the wall time of the with block to section name of the current frame"
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._times[name] = self._times.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def count(self, name: str, n: int = 1) -> None:
+        self._counts[name] = self._counts.get(name, 0) + n
+
+    def end_frame(self) -> None:
+        "Close the current frame, timed since the end of the previous one"
+        now = time.perf_counter()
+        self._times["frame"] = (now - self._start) * 1000
+        self._start = now
+        for series, current in ((self.times, self._times), (self.counts, self._counts)):
+            for name in current.keys() - series.keys():
+                # Earlier frames did not have it
+                series[name] = collections.deque([0] * min(self.frames, self.window), maxlen=self.window)
+            for name, values in series.items():
+                values.append(current.get(name, 0))
+            current.clear()
+        self.frames += 1
+
+    def percentiles(self, name: str, q=PERCENTILES) -> np.ndarray:
+        "Percentiles q of the times or counts of name over the kept frames"
+        values = self.times.get(name, self.counts.get(name))
+        if not values:
+            return np.full(len(q), np.nan)
+        return np.percentile(values, q)
+
+    def summary(self) -> dict:
+        "p50, p95, p99 and mean of every section and count over the kept frames"
+        summary = {}
+        for name, values in {**self.times, **self.counts}.items():
+            stats = dict(zip((f"p{q}" for q in PERCENTILES), self.percentiles(name).tolist()))
+            stats["mean"] = float(np.mean(values)) if values else float("nan")
+            summary[name] = stats
+        return summary
+
+    def lines(self) -> list[str]:
+        "Summary as text, one line per section or count"
+        return [
+            f"{name:16}" + "".join(f" p{q} {value:7.2f}" for q, value in zip(PERCENTILES, self.percentiles(name)))
+            for name in (*self.times, *self.counts)
+        ]
+
+    def _rows(self):
+        names = (*self.times, *self.counts)
+        series = [self.times.get(name, self.counts.get(name)) for name in names]
+        first = self.frames - len(series[0])
+        return names, [(first + k, *values) for k, values in enumerate(zip(*series))]
+
+    def export_csv(self, path) -> None:
+        "Write one row per kept frame, with its index, times and counts"
+        names, rows = self._rows()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("index", *names))
+            writer.writerows(rows)
+
+    def export_json(self, path) -> None:
+        "Write the summary and the kept frames"
+        names, rows = self._rows()
+        frames = [dict(zip(("index", *names), row)) for row in rows]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "frames": frames}, f, indent=1)
+
+    def export(self, path) -> None:
+        "export_json for paths ending in .json, export_csv otherwise"
+        if str(path).endswith(".json"):
+            self.export_json(path)
+        else:
+            self.export_csv(path)
+
+
+class Overlay:
+    "Lines of text drawn over the top left corner of the window"
+
+    def __init__(self, ctx, win_size: tuple[int, int], font_size: int = 18):
+        pg.font.init()
+        self.ctx = ctx
+        self.win_size = win_size
+        self.font = pg.font.Font(None, font_size)
+        self.program = get_program(ctx, "overlay")
+        self.texture = None
+        self.vertex_array = None
+        self.vertex_buffer = ctx.buffer(reserve=4 * 4 * 4)
+
+    def show(self, lines) -> None:
+        "Replace the text by lines"
+        lines = list(lines) or [""]
+        rendered = [self.font.render(line, True, (255, 255, 255), (0, 0, 0)) for line in lines]
+        width = max(surface.get_width() for surface in rendered)
+        height = sum(surface.get_height() for surface in rendered)
+        surface = pg.Surface((width, height), pg.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+        y = 0
+        for line in rendered:
+            surface.blit(line, (0, y))
+            y += line.get_height()
+        if self.texture is None or self.texture.size != (width, height):
+            if self.texture is not None:
+                self.texture.release()
+            self.texture = self.ctx.texture((width, height), 4)
+            # Pixel quad from the top left corner, counterclockwise
+            x1 = -1 + 2 * width / self.win_size[0]
+            y0 = 1 - 2 * height / self.win_size[1]
+            quad = np.array(((-1, y0, 0, 0), (x1, y0, 1, 0), (-1, 1, 0, 1), (x1, 1, 1, 1)), dtype="f4")
+            self.vertex_buffer.write(quad)
+            count(self.ctx, "buffer_writes")
+            if self.vertex_array is None:
+                self.vertex_array = self.ctx.vertex_array(
+                    self.program, [(self.vertex_buffer, "2f 2f", "in_position", "in_texcoord")]
+                )
+        # Textures start at the bottom row
+        self.texture.write(pg.image.tobytes(surface, "RGBA", True))
+        count(self.ctx, "texture_writes")
+
+    def render(self) -> None:
+        if self.texture is None:
+            return
+        self.ctx.disable(mgl.DEPTH_TEST)
+        self.texture.use(0)
+        self.program["text"] = 0
+        self.vertex_array.render(mgl.TRIANGLE_STRIP)
+        self.ctx.enable(mgl.DEPTH_TEST)
+        count(self.ctx, "uniform_writes")
+        count(self.ctx, "draw_calls")
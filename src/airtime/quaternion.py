@@ -1,6 +1,7 @@
 import math
 from dataclasses import dataclass
-from .vector import Vector
+from .matrix import Matrix
+from .vector import Vector, norm
 
 
 @dataclass
@@ -29,7 +30,7 @@ class Quaternion:
                 self.a * o.c - self.b * o.d + self.c * o.a + self.d * o.b,
                 self.a * o.d + self.b * o.c - self.c * o.b + self.d * o.a,
             )
-        raise NotImplementedError
+        return NotImplemented
 
     def __rmul__(self, o) -> "Quaternion":
         if isinstance(o, (int, float)):
@@ -59,6 +60,50 @@ class Quaternion:
     def reciprocal(self):
         return self.conjugated() / self.norm()**2
 
+    def rotate(self, v: Vector) -> Vector:
+        "v rotated by this unit quaternion"
+        # Expansion of self * Quaternion(0, v) * self.conjugated(), with t = 2 (u x v)
+        a, b, c, d = self.a, self.b, self.c, self.d
+        x, y, z = v.x, v.y, v.z
+        tx = 2 * (c * z - d * y)
+        ty = 2 * (d * x - b * z)
+        tz = 2 * (b * y - c * x)
+        return Vector(
+            x + a * tx + c * tz - d * ty,
+            y + a * ty + d * tx - b * tz,
+            z + a * tz + b * ty - c * tx,
+        )
+
+    def to_matrix(self) -> Matrix:
+        "Rotation matrix of a unit quaternion"
+        a, b, c, d = self.a, self.b, self.c, self.d
+        bb, cc, dd = b * b, c * c, d * d
+        ab, ac, ad = a * b, a * c, a * d
+        bc, bd, cd = b * c, b * d, c * d
+        return Matrix(
+            1 - 2 * (cc + dd), 2 * (bc - ad), 2 * (bd + ac),
+            2 * (bc + ad), 1 - 2 * (bb + dd), 2 * (cd - ab),
+            2 * (bd - ac), 2 * (cd + ab), 1 - 2 * (bb + cc),
+        )
+
+    @staticmethod
+    def from_matrix(m: Matrix) -> "Quaternion":
+        "Unit quaternion of a rotation matrix"
+        # Shepperd's method, dividing by the largest of the four candidates
+        m00, m01, m02, m10, m11, m12, m20, m21, m22 = m.e
+        t = m00 + m11 + m22
+        if t > 0:
+            s = 2 * math.sqrt(t + 1)
+            return Quaternion(s / 4, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s)
+        if m00 > m11 and m00 > m22:
+            s = 2 * math.sqrt(1 + m00 - m11 - m22)
+            return Quaternion((m21 - m12) / s, s / 4, (m01 + m10) / s, (m02 + m20) / s)
+        if m11 > m22:
+            s = 2 * math.sqrt(1 + m11 - m00 - m22)
+            return Quaternion((m02 - m20) / s, (m01 + m10) / s, s / 4, (m12 + m21) / s)
+        s = 2 * math.sqrt(1 + m22 - m00 - m11)
+        return Quaternion((m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, s / 4)
+
 
 class RotationQuaternion(Quaternion):
     def __init__(self, angle: float, axis: Vector):
@@ -66,16 +111,19 @@ class RotationQuaternion(Quaternion):
         b, c, d = math.sin(angle / 2) * axis.normalized()
         super().__init__(a, b, c, d)
 
+    @staticmethod
+    def from_axis(axis: Vector) -> "RotationQuaternion":
+        "Rotation by norm(axis) around axis, the identity for the zero vector"
+        n = norm(axis)
+        if n == 0:
+            return RotationQuaternion(0, Vector(1, 0, 0))
+        return RotationQuaternion(n, axis)
+
     def axis(self) -> Vector:
         return Vector(self.b, self.c, self.d).normalized()
 
     def angle(self) -> float:
         return 2 * math.atan2(Vector(self.b, self.c, self.d).length(), self.a)
 
-    def rotate(self, v: Vector) -> Vector:
-        q = Quaternion(0, *v)
-        r = self * q * self.conjugated()
-        return Vector(r.b, r.c, r.d)
-
     def __str__(self) -> str:
         return f"RotationQuaternion({self.a}, {self.b}, {self.c}, {self.d})"
@@ -0,0 +1,127 @@
+import numpy as np
+
+# Trajectories are .npy files of one structured record per step, so np.load(path, mmap_mode="r")
+# maps them without copying and any range of steps or any field is a slice. The header is
+# written with room for any number of steps and rewritten with the actual count on flush.
+
+_MAGIC = b"\x93NUMPY\x01\x00"
+_MAX_STEPS = 10**18  # Sizes the header such that rewriting the step count never changes its length
+
+
+def trajectory_dtype(bodies: int, joints: int = 0) -> np.dtype:
+    "Record of one step of bodies bodies and joints joint angles"
+    return np.dtype(
+        [
+            ("time", "<f8"),
+            ("pos", "<f8", (bodies, 3)),
+            ("orientation", "<f8", (bodies, 4)),  # Unit quaternions (a, b, c, d)
+            ("w", "<f8", (3,)),  # Angular velocity of the whole body in radians per second
+            ("joints", "<f8", (joints,)),  # Joint angles in radians
+        ]
+    )
+
+
+def _header(dtype: np.dtype, steps: int) -> bytes:
+    "npy format 1.0 header of steps records, padded to the same length for any steps"
+
+    def text(steps):
+        return repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (steps,)})
+
+    size = len(_MAGIC) + 2 + len(text(_MAX_STEPS)) + 1
+    size += -size % 64  # The data starts aligned
+    header = text(steps).encode("latin1")
+    header += b" " * (size - len(_MAGIC) - 2 - len(header) - 1) + b"\n"
+    return _MAGIC + len(header).to_bytes(2, "little") + header
+
+
+def _angles(joint) -> tuple:
+    "Angles of a HingeJoint or SaddleJoint, or the summed rotation vector of a BallJoint"
+    if hasattr(joint, "angle"):
+        return (joint.angle,)
+    if hasattr(joint, "angle_a"):
+        return (joint.angle_a, joint.angle_b)
+    return (joint.rx, joint.ry, joint.rz)
+
+
+class TrajectoryRecorder:
+    """Streams the state of a simulation into a trajectory file, one record per step.
+
+    Records collect in a buffer of chunk steps that is appended to the file whenever
+    it is full, so memory stays constant however long the run. Read the file with
+    load_trajectory, also while recording after a flush.
+    """
+
+    def __init__(self, path, bodies, joints=(), rotating_body=None, chunk: int = 1024):
+        """bodies are the Body instances and joints the joints whose state is recorded,
+        rotating_body the RotatingBody whose angular velocity is recorded, if any"""
+        self.bodies = list(bodies)
+        self.joints = list(joints)
+        self.rotating_body = rotating_body
+        joint_count = sum(len(_angles(joint)) for joint in self.joints)
+        self.dtype = trajectory_dtype(len(self.bodies), joint_count)
+        self.steps = 0
+        self._buffer = np.zeros(chunk, dtype=self.dtype)
+        self._buffered = 0
+        # Bodies that are all of one BodyState in order are read in one go
+        state = self.bodies[0].state if self.bodies else None
+        if state is None or len(state) != len(self.bodies):
+            state = None
+        elif any(body.state is not state or body.index != k for k, body in enumerate(self.bodies)):
+            state = None
+        self._state = state
+        self._file = open(path, "wb+")
+        self._file.write(_header(self.dtype, 0))
+
+    def record(self, t: float) -> None:
+        "Append the current state at simulated time t"
+        record = self._buffer[self._buffered]
+        record["time"] = t
+        if self._state is not None:
+            record["pos"] = self._state.pos
+            record["orientation"] = self._state.orientation
+        else:
+            for k, body in enumerate(self.bodies):
+                p = body.pos
+                q = body.orientation
+                record["pos"][k] = (p.x, p.y, p.z)
+                record["orientation"][k] = (q.a, q.b, q.c, q.d)
+        if self.rotating_body is not None:
+            w = self.rotating_body.w
+            record["w"] = (w.x, w.y, w.z)
+        if self.joints:
+            record["joints"] = [angle for joint in self.joints for angle in _angles(joint)]
+        self._buffered += 1
+        self.steps += 1
+        if self._buffered == len(self._buffer):
+            self._write_buffer()
+
+    def __call__(self, simulator) -> None:
+        "Record after every step when passed as callback to Simulator.run"
+        self.record(simulator.time)
+
+    def _write_buffer(self) -> None:
+        self._file.seek(0, 2)
+        self._file.write(self._buffer[: self._buffered].tobytes())
+        self._buffered = 0
+
+    def flush(self) -> None:
+        "Write all buffered steps and update the step count in the header"
+        self._write_buffer()
+        self._file.seek(0)
+        self._file.write(_header(self.dtype, self.steps))
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_trajectory(path) -> np.memmap:
+    "Recorded steps, memory-mapped read-only: slicing them reads only the slices from disk"
+    return np.load(path, mmap_mode="r")
@@ -0,0 +1,231 @@
+import collections
+import os
+import numpy as np
+from .arrays import QuaternionArray
+from .camera import Camera
+from . import mesh
+
+SHADERS = os.path.join(os.path.dirname(__file__), "shaders")
+
+
+def read_shader(name: str) -> tuple[str, str]:
+    "Source of the vertex and fragment shader called name"
+    with open(os.path.join(SHADERS, f"{name}.vert"), "r", encoding="utf-8") as f:
+        vertex_shader = f.read()
+    with open(os.path.join(SHADERS, f"{name}.frag"), "r", encoding="utf-8") as f:
+        fragment_shader = f.read()
+    return vertex_shader, fragment_shader
+
+
+# Binding point of the uniform block with the camera matrices
+CAMERA_BINDING = 0
+
+
+def _resources(ctx) -> dict:
+    "Programs, meshes and the camera uniform buffer shared by everything drawn with ctx, kept in ctx.extra"
+    if ctx.extra is None:
+        ctx.extra = {
+            "programs": {},
+            "meshes": {},
+            "vertex_arrays": {},
+            "camera": None,
+            "camera_key": None,
+            "profiler": None,
+            "appearance": 0,  # Changes whenever the color or scale of a body drawn with ctx changes
+        }
+    return ctx.extra
+
+
+def set_profiler(ctx, profiler) -> None:
+    """Count what is drawn with ctx into profiler, a FrameProfiler, or stop counting if None:
+    draw_calls, uniform_writes to programs and uniform buffers, buffer_writes of vertex
+    and instance data and texture_writes"""
+    _resources(ctx)["profiler"] = profiler
+
+
+def count(ctx, name: str, n: int = 1) -> None:
+    "Count n events called name into the profiler of ctx, if any"
+    profiler = _resources(ctx)["profiler"]
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def write_camera(ctx, camera: Camera) -> None:
+    "Upload the camera matrices into the uniform buffer of ctx, unless they did not change since the last upload"
+    resources = _resources(ctx)
+    # The values the matrices are made of, such that another camera in the same place needs no upload
+    key = camera.key
+    if key == resources["camera_key"]:
+        return
+    if resources["camera"] is None:
+        resources["camera"] = ctx.buffer(reserve=2 * 64)
+    buffer = resources["camera"]
+    buffer.write(camera.projection.to_bytes() + camera.view.to_bytes())
+    buffer.bind_to_uniform_block(CAMERA_BINDING)
+    resources["camera_key"] = key
+    count(ctx, "uniform_writes")
+
+
+def get_program(ctx, shader: str):
+    "Program of the shaders called shader, compiled once per context"
+    programs = _resources(ctx)["programs"]
+    if shader not in programs:
+        program = ctx.program(*read_shader(shader))
+        if "Camera" in program:
+            program["Camera"].binding = CAMERA_BINDING
+        programs[shader] = program
+    return programs[shader]
+
+
+def get_mesh(ctx, primitive: str, *parameters):
+    "Vertex and index buffer of mesh.<primitive>(*parameters), built once per context"
+    meshes = _resources(ctx)["meshes"]
+    key = (primitive, parameters)
+    if key not in meshes:
+        vertices, triangles = getattr(mesh, primitive)(*parameters)
+        meshes[key] = (ctx.buffer(vertices), ctx.buffer(triangles))
+    return meshes[key]
+
+
+def get_vertex_array(ctx, shader: str, primitive: str, *parameters):
+    "Vertex array drawing the mesh of get_mesh with the program of get_program, built once per context"
+    vertex_arrays = _resources(ctx)["vertex_arrays"]
+    key = (shader, primitive, parameters)
+    if key not in vertex_arrays:
+        vertex_buffer, index_buffer = get_mesh(ctx, primitive, *parameters)
+        vertex_arrays[key] = ctx.vertex_array(
+            get_program(ctx, shader),
+            [(vertex_buffer, "3f 3f", "in_position", "in_normal")],
+            index_buffer=index_buffer,
+            index_element_size=4,
+        )
+    return vertex_arrays[key]
+
+
+def appearance_changed(ctx) -> None:
+    "Invalidate the colors and scales cached for drawing bodies with ctx, see InstancedRenderer.draw_poses"
+    if ctx is not None:
+        _resources(ctx)["appearance"] += 1
+
+
+def model_matrices(pos, orientation, scale=(1, 1, 1)) -> np.ndarray:
+    """(N, 16) column-major model matrices of bodies at (N, 3) positions with (N, 4) orientations,
+    their meshes scaled by (3,) or (N, 3) factors along the body axes"""
+    pos = np.asarray(pos, dtype=float).reshape(-1, 3)
+    model = np.zeros((len(pos), 4, 4))
+    # Row k of the transposed matrix is column k of the model matrix
+    model[:, :3, :3] = np.swapaxes(QuaternionArray(np.asarray(orientation, dtype=float)).to_matrix().m, 1, 2)
+    model[:, :3, :3] *= np.asarray(scale, dtype=float)[..., :, None]
+    model[:, 3, :3] = pos
+    model[:, 3, 3] = 1
+    return model.reshape(-1, 16)
+
+
+class _Group:
+    "Instances of one mesh, drawn with one draw call"
+
+    def __init__(self, vertex_buffer, index_buffer):
+        self.vertex_buffer = vertex_buffer
+        self.index_buffer = index_buffer
+        self.instance_buffer = None
+        self.vertex_array = None
+        self.capacity = 0  # Instances the instance buffer holds
+        self.instances = []  # (N, 19) model matrices and colors queued for the next render
+
+
+class InstancedRenderer:
+    """Draws all instances of each mesh with a single draw call.
+
+    Instead of every body writing its uniforms and drawing itself, bodies and poses
+    are queued with draw and draw_bodies. render then uploads the model matrices and
+    colors of every mesh into one instance buffer and draws them all at once.
+    """
+
+    def __init__(self, ctx, shader: str = "instanced"):
+        self.ctx = ctx
+        self.program = get_program(ctx, shader)
+        self._groups = {}  # Vertex buffer -> _Group
+        # Bodies -> appearance, scales, colors and the rows of each group, see draw_poses
+        self._layouts = collections.OrderedDict()
+
+    # Layouts of this many body lists are kept, the least recently drawn are dropped
+    max_layouts = 16
+
+    def _group(self, body) -> _Group:
+        if body.vertex_buffer is None:
+            raise ValueError("body has no mesh, it was created without a ctx")
+        group = self._groups.get(body.vertex_buffer)
+        if group is None:
+            group = self._groups[body.vertex_buffer] = _Group(body.vertex_buffer, body.index_buffer)
+        return group
+
+    def draw(self, body, pos, orientation, color=None) -> None:
+        """Queue N instances of the mesh of body at (N, 3) positions with (N, 4) orientations.
+        color is an (N, 3) array or one RGB color for all, the color of body by default."""
+        model = model_matrices(pos, orientation, body.scale)
+        if color is None:
+            color = body.color
+        if hasattr(color, "red"):
+            color = (color.red, color.green, color.blue)
+        colors = np.broadcast_to(np.asarray(color, dtype=float), (len(model), 3))
+        self._group(body).instances.append(np.hstack((model, colors)))
+
+    def draw_poses(self, bodies, pos, orientation) -> None:
+        """Queue each of the N bodies at its row of (N, 3) positions and (N, 4) orientations,
+        e.g. the arrays of a BodyState, with one vectorized model matrix computation for all"""
+        # The key holds the bodies themselves, so that their ids cannot be reused while it is kept
+        key = tuple(bodies)
+        appearance = _resources(self.ctx)["appearance"]
+        layout = self._layouts.get(key)
+        if layout is not None and layout[0] == appearance:
+            self._layouts.move_to_end(key)
+        else:
+            scale = np.array([body.scale for body in bodies], dtype=float)
+            colors = np.array([(body.color.red, body.color.green, body.color.blue) for body in bodies])
+            rows = {}
+            for k, body in enumerate(bodies):
+                rows.setdefault(id(body.vertex_buffer), (self._group(body), []))[1].append(k)
+            layout = (appearance, scale, colors, [(group, np.array(r)) for group, r in rows.values()])
+            self._layouts[key] = layout
+            if len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        _, scale, colors, rows = layout
+        data = np.hstack((model_matrices(pos, orientation, scale), colors))
+        for group, r in rows:
+            group.instances.append(data[r])
+
+    def draw_bodies(self, bodies) -> None:
+        "Queue bodies in their current poses"
+        pos = [tuple(body.pos) for body in bodies]
+        orientation = [(q.a, q.b, q.c, q.d) for q in (body.orientation for body in bodies)]
+        self.draw_poses(bodies, pos, orientation)
+
+    def render(self, camera: Camera) -> None:
+        "Draw everything queued since the last render"
+        write_camera(self.ctx, camera)
+        for group in self._groups.values():
+            if not group.instances:
+                continue
+            data = np.concatenate(group.instances).astype("f4")
+            group.instances = []
+            n = len(data)
+            if n > group.capacity:
+                # Grow geometrically so that a slowly growing count rarely reallocates
+                group.capacity = max(n, 2 * group.capacity)
+                if group.instance_buffer is not None:
+                    group.vertex_array.release()
+                    group.instance_buffer.release()
+                group.instance_buffer = self.ctx.buffer(reserve=group.capacity * data.itemsize * 19)
+                group.vertex_array = self.ctx.vertex_array(
+                    self.program,
+                    [
+                        (group.vertex_buffer, "3f 3f", "in_position", "in_normal"),
+                        (group.instance_buffer, "16f 3f/i", "in_model", "in_color"),
+                    ],
+                    index_buffer=group.index_buffer,
+                    index_element_size=4,
+                )
+            group.instance_buffer.write(data)
+            group.vertex_array.render(instances=n)
+            count(self.ctx, "buffer_writes")
+            count(self.ctx, "draw_calls")
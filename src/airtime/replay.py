@@ -0,0 +1,103 @@
+import math
+import numpy as np
+from .recording import load_trajectory
+
+
+class Replay:
+    """Plays back a recorded trajectory without simulating it again.
+
+    The trajectory stays memory-mapped, only the frames shown are read from disk.
+    Recordings of fixed time steps are seeked in O(1) by computing the frame index
+    from the time, others by binary search. Playback runs at speed times real time
+    within the frames first to last and shows only every skip-th of them.
+    """
+
+    def __init__(self, trajectory, speed: float = 1.0, skip: int = 1, first: int = 0, last: int | None = None):
+        "trajectory is the path of a recording or the array load_trajectory returns"
+        if isinstance(trajectory, np.ndarray):
+            self.trajectory = trajectory
+        else:
+            self.trajectory = load_trajectory(trajectory)
+        if len(self.trajectory) == 0:
+            raise ValueError("trajectory has no frames")
+        self.times = self.trajectory["time"]
+        n = len(self.times)
+        self.delta_time = (self.times[-1] - self.times[0]) / (n - 1) if n > 1 else 0.0
+        # Fixed time steps if the second frame lies where the average step puts it
+        self._uniform = n > 1 and math.isclose(self.times[1] - self.times[0], self.delta_time, rel_tol=1e-6)
+        self.speed = speed
+        self.skip = skip
+        self.first = first
+        self.last = n - 1 if last is None else last
+        if not 0 <= self.first <= self.last < n:
+            raise ValueError(f"frames {self.first} to {self.last} are not a range of the {n} recorded")
+        self.paused = False
+        self.loop = True
+        self.time = float(self.times[self.first])
+
+    def __len__(self) -> int:
+        return len(self.trajectory)
+
+    @property
+    def bodies(self) -> int:
+        "Number of bodies recorded"
+        return self.trajectory.dtype["pos"].shape[0]
+
+    def check_bodies(self, bodies) -> None:
+        "Raise a ValueError unless bodies are as many as the recorded ones"
+        if len(bodies) != self.bodies:
+            raise ValueError(f"the trajectory records {self.bodies} bodies, but {len(bodies)} were given")
+
+    def index_at(self, t: float) -> int:
+        "Index of the frame at or nearest to time t"
+        n = len(self.times)
+        if self._uniform:
+            k = min(max(round((t - self.times[0]) / self.delta_time), 0), n - 1)
+            if abs(self.times[k] - t) <= self.delta_time / 2 * (1 + 1e-6) or k in (0, n - 1):
+                return k
+        k = int(np.searchsorted(self.times, t))
+        if k == n or (k > 0 and t - self.times[k - 1] < self.times[k] - t):
+            k -= 1
+        return k
+
+    def frame(self, k: int) -> tuple[float, np.ndarray, np.ndarray]:
+        "Time, (N, 3) positions and (N, 4) orientations of frame k"
+        record = self.trajectory[k]
+        return float(record["time"]), record["pos"], record["orientation"]
+
+    @property
+    def index(self) -> int:
+        "Frame shown at the current time, rounded down to every skip-th frame from first"
+        k = min(max(self.index_at(self.time), self.first), self.last)
+        return k - (k - self.first) % self.skip
+
+    def pose(self) -> tuple[np.ndarray, np.ndarray]:
+        "Positions and orientations of the frame shown, ready for InstancedRenderer.draw_poses"
+        _, pos, orientation = self.frame(self.index)
+        return pos, orientation
+
+    def draw_poses(self, renderer, bodies, k: int | None = None) -> None:
+        "Queue bodies on an InstancedRenderer in their poses of frame k, by default the frame shown"
+        self.check_bodies(bodies)
+        _, pos, orientation = self.frame(self.index if k is None else k)
+        renderer.draw_poses(bodies, pos, orientation)
+
+    def seek(self, t: float) -> None:
+        "Jump to time t, limited to the frame range"
+        self.time = min(max(t, float(self.times[self.first])), float(self.times[self.last]))
+
+    def step(self, frames: int) -> None:
+        "Scrub by frames shown, backwards for negative frames"
+        k = min(max(self.index + frames * self.skip, self.first), self.last)
+        self.time = float(self.times[k])
+
+    def advance(self, frame_time: float) -> None:
+        "Move on by frame_time seconds of real time, wrapping around at the end of the range if loop is set"
+        if self.paused:
+            return
+        start = float(self.times[self.first])
+        end = float(self.times[self.last])
+        t = self.time + self.speed * frame_time
+        if self.loop and end > start and not start <= t <= end:
+            t = start + (t - start) % (end - start)
+        self.seek(t)
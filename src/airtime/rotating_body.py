@@ -1,21 +1,32 @@
 from .matrix import Matrix
-from .vector import Vector, cross
+from .vector import Vector, dot
 from .body import RigidBody
+from .integrators import ForwardEuler
 
 
 class RotatingBody:
-    def __init__(self, body: RigidBody, w: Vector):
-        "w is the angular velocity of the body in radians per second"
+    def __init__(self, body: RigidBody, w: Vector, integrator=None):
+        """w is the angular velocity of the body in radians per second.
+        integrator is one of airtime.integrators, ForwardEuler by default."""
         self.body = body
         self.w = w
+        self.integrator = integrator or ForwardEuler()
 
-    def time_step(self, delta_time: int):
-        # https://en.wikipedia.org/wiki/Euler%27s_equations_(rigid_body_dynamics)
+    def time_step(self, delta_time: float):
+        "delta_time in seconds"
         cm = self.body.center_of_mass
-        i = self.body.inertia_tensor_in(cm)
-        self.w -= i.inv() * (cross(self.w, i * self.w)) * delta_time
-        rot = Matrix.from_axis_angle(self.w, self.w.length() * delta_time)
+        i = self.body.inertia_tensor_in(cm, Matrix.identity())
+        self.w, rot = self.integrator.step(i, self.w, delta_time)
         self.body.rotate(cm, rot)
 
+    def angular_momentum(self) -> Vector:
+        "Angular momentum around the center of mass in world coordinates"
+        i = self.body.inertia_tensor_in(self.body.center_of_mass, Matrix.identity())
+        return i * self.w
+
+    def kinetic_energy(self) -> float:
+        "Rotational kinetic energy"
+        return dot(self.w, self.angular_momentum()) / 2
+
     def render(self, camera):
         self.body.render(camera)
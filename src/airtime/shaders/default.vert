@@ -6,8 +6,11 @@ layout (location = 1) in vec3 in_normal;
 out vec3 normal;
 out vec3 fragPos;
 
-uniform mat4 m_proj;
-uniform mat4 m_view;
+layout (std140) uniform Camera
+{
+    mat4 m_proj;
+    mat4 m_view;
+};
 uniform mat4 m_model;
 
 void main()
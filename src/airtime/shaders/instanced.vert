@@ -0,0 +1,24 @@
+#version 330 core
+
+layout (location = 0) in vec3 in_position;
+layout (location = 1) in vec3 in_normal;
+layout (location = 2) in mat4 in_model;
+layout (location = 6) in vec3 in_color;
+
+out vec3 normal;
+out vec3 fragPos;
+out vec3 color;
+
+layout (std140) uniform Camera
+{
+    mat4 m_proj;
+    mat4 m_view;
+};
+
+void main()
+{
+    fragPos = vec3(in_model * vec4(in_position, 1.0));
+    normal = mat3(transpose(inverse(in_model))) * normalize(in_normal);
+    color = in_color;
+    gl_Position = m_proj * m_view * in_model * vec4(in_position, 1.0);
+}
@@ -0,0 +1,12 @@
+#version 330 core
+
+in vec2 uv;
+
+layout (location = 0) out vec4 fragColor;
+
+uniform sampler2D text;
+
+void main()
+{
+    fragColor = texture(text, uv);
+}
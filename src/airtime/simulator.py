@@ -0,0 +1,111 @@
+import time
+from .body import model_matrix
+from .quaternion import Quaternion
+from .vector import Vector
+
+
+class Simulator:
+    "Advances a simulation as fast as possible, without a window or GL context"
+
+    def __init__(self, body, delta_time: float):
+        "body is anything with a time_step(delta_time) method, delta_time in seconds"
+        self.body = body
+        self.delta_time = delta_time
+        self.time = 0.0
+        self.steps = 0
+
+    def step(self) -> None:
+        self.body.time_step(self.delta_time)
+        self.steps += 1
+        self.time = self.steps * self.delta_time
+
+    def run(self, steps: int, callback=None) -> float:
+        """Advance by steps time steps, calling callback(simulator) after each one.
+        Returns the wall time in seconds."""
+        start = time.perf_counter()
+        time_step = self.body.time_step
+        delta_time = self.delta_time
+        for _ in range(steps):
+            time_step(delta_time)
+            self.steps += 1
+            if callback is not None:
+                self.time = self.steps * delta_time
+                callback(self)
+        self.time = self.steps * delta_time
+        return time.perf_counter() - start
+
+    def run_until(self, end_time: float, callback=None) -> float:
+        "Advance until the simulated time reaches end_time. Returns the wall time in seconds."
+        steps = max(0, round((end_time - self.time) / self.delta_time))
+        return self.run(steps, callback)
+
+
+class FixedStepScheduler:
+    """Advances a simulation in fixed time steps from variable frame times.
+
+    Frame times add up in an accumulator and every whole delta_time in it runs one
+    step, so the results are the same at any frame rate. At most max_steps steps run
+    per frame and the time beyond is dropped, such that one long frame cannot make the
+    next ones longer still. Rendered poses are interpolated between the last two steps
+    by the fraction of a step left in the accumulator.
+    (https://gafferongames.com/post/fix_your_timestep/)
+    """
+
+    def __init__(self, body, delta_time: float = 1 / 120, max_steps: int = 8, bodies=()):
+        """body is anything with a time_step(delta_time) method, delta_time in seconds.
+        bodies are the Body instances whose poses render interpolates."""
+        self.simulator = Simulator(body, delta_time)
+        self.delta_time = delta_time
+        self.max_steps = max_steps
+        self.bodies = list(bodies)
+        self.accumulator = 0.0
+        self.dropped = 0.0  # Seconds not simulated because frames took too long
+        self._previous = None  # Poses of bodies before the last step
+
+    @property
+    def alpha(self) -> float:
+        "Fraction of a step between the last simulated state and the current time"
+        return self.accumulator / self.delta_time
+
+    def advance(self, frame_time: float) -> int:
+        "Let frame_time seconds pass and run the steps that fit. Returns the number of steps run."
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.delta_time)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.delta_time
+            self.accumulator -= (steps - self.max_steps) * self.delta_time
+            steps = self.max_steps
+        for k in range(steps):
+            if k == steps - 1:
+                self._previous = [_pose(body) for body in self.bodies]
+            self.simulator.step()
+            self.accumulator -= self.delta_time
+        # Rounding can leave the accumulator a hair off a whole step
+        self.accumulator = min(max(self.accumulator, 0.0), self.delta_time)
+        return steps
+
+    def poses(self) -> list:
+        "(pos, orientation) of every body at the current time, interpolated between the last two steps"
+        current = [_pose(body) for body in self.bodies]
+        if self._previous is None:
+            return current
+        a = self.alpha
+        poses = []
+        for (p0, q0), (p1, q1) in zip(self._previous, current):
+            if q0.a * q1.a + q0.b * q1.b + q0.c * q1.c + q0.d * q1.d < 0:
+                q1 = -q1  # Same rotation, shorter way
+            # Normalized linear interpolation, close to slerp for the small turns of one step
+            poses.append((p0 + (p1 - p0) * a, (q0 * (1 - a) + q1 * a).normalized()))
+        return poses
+
+    def render(self, camera) -> None:
+        "Render bodies in their interpolated poses"
+        for body, (pos, orientation) in zip(self.bodies, self.poses()):
+            body.render(camera, model_matrix(pos, orientation.to_matrix(), body.scale))
+
+
+def _pose(body) -> tuple:
+    "Copies of the position and orientation of body"
+    p = body.pos
+    q = body.orientation
+    return Vector(p.x, p.y, p.z), Quaternion(q.a, q.b, q.c, q.d)
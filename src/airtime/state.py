@@ -0,0 +1,96 @@
+import numpy as np
+from .arrays import QuaternionArray
+from .matrix import Matrix
+from .quaternion import Quaternion
+from .vector import Vector
+
+
+class BodyState:
+    "Positions, orientations, masses and inertia tensors of many rigid bodies in contiguous arrays"
+
+    # Orientations are renormalized after this many compositions, as in Body
+    renormalize_interval = 64
+
+    def __init__(self, bodies):
+        n = len(bodies)
+        self.pos = np.empty((n, 3))
+        self.orientation = np.empty((n, 4))  # Unit quaternions (a, b, c, d)
+        self.m = np.empty(n)
+        self.i = np.empty((n, 3, 3))
+        self.rotations = 0  # Compositions since the last renormalization
+        self.versions = np.zeros(n, dtype=np.int64)  # Per body change counters, see Body.version
+        # Per body inertia tensors of the last inertia_tensor_in call, with its frame and versions
+        self._inertia_key = None
+        self._inertia_versions = None
+        self._inertia = np.empty((n, 3, 3))
+        for index, body in enumerate(bodies):
+            q = body.orientation
+            self.pos[index] = tuple(body.pos)
+            self.orientation[index] = (q.a, q.b, q.c, q.d)
+            self.m[index] = body.m
+            self.i[index].flat = body.i.e
+            body.bind(self, index)
+
+    def __len__(self) -> int:
+        return len(self.m)
+
+    @property
+    def rot(self) -> np.ndarray:
+        "Orientations as (N, 3, 3) rotation matrices"
+        return QuaternionArray(self.orientation).to_matrix().m
+
+    def translate(self, v: Vector) -> None:
+        self.pos += (v.x, v.y, v.z)
+        self.versions += 1
+
+    def rotate(self, p: Vector, r: Quaternion) -> None:
+        "Rotate all bodies by unit quaternion r around point p"
+        p = np.array((p.x, p.y, p.z))
+        self.pos[...] = (self.pos - p) @ np.reshape(r.to_matrix().e, (3, 3)).T + p
+        # Left multiplication by r as a 4x4 matrix acting on (a, b, c, d)
+        a, b, c, d = r.a, r.b, r.c, r.d
+        left = np.array(
+            (
+                (a, -b, -c, -d),
+                (b, a, -d, c),
+                (c, d, a, -b),
+                (d, -c, b, a),
+            )
+        )
+        self.orientation[...] = self.orientation @ left.T
+        self.rotations += 1
+        if self.rotations >= self.renormalize_interval:
+            self.orientation /= np.linalg.norm(self.orientation, axis=1)[:, None]
+            self.rotations = 0
+        self.versions += 1
+
+    @property
+    def center_of_mass(self) -> Vector:
+        return Vector(*(self.m @ self.pos / self.m.sum()).tolist())
+
+    def inertia_tensor_in(self, pos: Vector, rot: Matrix) -> Matrix:
+        """Sum of the inertia tensors of all bodies at point pos, in the frame that rot maps to world coordinates.
+
+        Only bodies that changed since the last call in the same frame are recomputed.
+        """
+        key = (pos.x, pos.y, pos.z, rot.e)
+        if key == self._inertia_key:
+            changed = np.flatnonzero(self.versions != self._inertia_versions)
+        else:
+            changed = np.arange(len(self))
+        if len(changed):
+            self._inertia[changed] = self._inertia_tensors(pos, rot, changed)
+            self._inertia_key = key
+            self._inertia_versions = self.versions.copy()
+        return Matrix(*self._inertia.sum(axis=0).ravel().tolist())
+
+    def _inertia_tensors(self, pos: Vector, rot: Matrix, index: np.ndarray) -> np.ndarray:
+        "(len(index), 3, 3) inertia tensors of the bodies index at point pos in frame rot"
+        # Vectorized form of RigidBody.inertia_tensor_in
+        to_frame = np.reshape(rot.e, (3, 3)).T
+        delta_pos = (np.array((pos.x, pos.y, pos.z)) - self.pos[index]) @ to_frame.T
+        delta_rot = to_frame @ QuaternionArray(self.orientation[index]).to_matrix().m
+        rotated = delta_rot @ self.i[index] @ delta_rot.transpose(0, 2, 1)
+        d2 = np.einsum("ni,ni->n", delta_pos, delta_pos)
+        parallel = d2[:, None, None] * np.eye(3) - delta_pos[:, :, None] * delta_pos[:, None, :]
+        return rotated + self.m[index][:, None, None] * parallel
@@ -0,0 +1,107 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from .gymnast import Gymnast
+from .matrix import Matrix
+from .rotating_body import RotatingBody
+from .simulator import Simulator
+from .vector import Vector
+
+
+@dataclass(frozen=True)
+class Skill:
+    "Take-off and hinge bend schedule of one simulated skill"
+
+    w: tuple[float, float, float]  # Take-off angular velocity in radians per second
+    bend: float = 0  # Hinge bend per time step in radians
+    bend_steps: int = 0  # Number of time steps to bend for
+
+
+class SkillSimulation:
+    "A headless Gymnast performing a Skill"
+
+    def __init__(self, skill: Skill):
+        self.skill = skill
+        self.gymnast = Gymnast()
+        self.rotation = RotatingBody(self.gymnast, Vector(*skill.w))
+        self.steps = 0
+
+    def time_step(self, delta_time: float) -> None:
+        if self.steps < self.skill.bend_steps:
+            self.gymnast.hinge.bend(self.skill.bend)
+        self.rotation.time_step(delta_time)
+        self.steps += 1
+
+    @property
+    def orientation(self) -> Matrix:
+        "Orientation of the torso"
+        return self.gymnast.bodies[0].rot
+
+
+@dataclass
+class SweepResult:
+    parameters: object
+    orientation: Matrix
+    landing_error: float  # Angle in radians between the final and the target orientation
+
+
+def landing_error(orientation: Matrix, target: Matrix) -> float:
+    "Angle of the rotation that takes orientation to target"
+    d = orientation.transposed() * target
+    return math.acos(max(-1.0, min(1.0, (d.e[0] + d.e[4] + d.e[8] - 1) / 2)))
+
+
+def simulate(parameters, factory, steps: int, delta_time: float, target: Matrix) -> SweepResult:
+    "Run a single headless simulation built by factory(parameters)"
+    simulation = factory(parameters)
+    Simulator(simulation, delta_time).run(steps)
+    orientation = simulation.orientation
+    return SweepResult(parameters, orientation, landing_error(orientation, target))
+
+
+# Per worker process configuration, sent once through the pool initializer
+# so that tasks only carry their parameters.
+_config = None
+
+
+def _init_worker(factory, steps, delta_time, target) -> None:
+    global _config
+    _config = (factory, steps, delta_time, target)
+
+
+def _run_chunk(chunk) -> list[SweepResult]:
+    return [simulate(parameters, *_config) for parameters in chunk]
+
+
+def sweep(
+    parameters,
+    steps: int,
+    delta_time: float,
+    target: Matrix | None = None,
+    factory=SkillSimulation,
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+):
+    """Simulate factory(p) for every p in parameters across worker processes.
+
+    factory must be picklable and return an object with time_step(delta_time)
+    and an orientation property. Yields a SweepResult per parameter set in
+    completion order, as soon as its chunk is done.
+    """
+    parameters = list(parameters)
+    target = target or Matrix.identity()
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        # A few chunks per worker balances load without paying per task overhead
+        chunksize = max(1, math.ceil(len(parameters) / (4 * max_workers)))
+    chunks = [parameters[i:i + chunksize] for i in range(0, len(parameters), chunksize)]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(factory, steps, delta_time, target),
+    ) as executor:
+        futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
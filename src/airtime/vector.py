@@ -4,6 +4,7 @@ from dataclasses import dataclass
 
 @dataclass
 class Vector:
+    __slots__ = ("x", "y", "z")
     x: float
     y: float
     z: float
@@ -0,0 +1,157 @@
+import multiprocessing
+import threading
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from .simulator import FixedStepScheduler
+
+
+class PoseBuffer:
+    """Double buffered positions and orientations of n bodies in shared memory.
+
+    One writer fills the slot that readers are not pointed to and then publishes it.
+    Readers never wait for a step: a sequence number per slot, odd while the slot is
+    written, tells them to retry in the rare case that the writer laps them.
+
+    There are no explicit memory barriers. Between threads the GIL orders the writes
+    of the header and the data. Between processes the seqlock relies on the hardware
+    keeping stores and loads in program order, as x86-64 does; on weakly ordered CPUs
+    such as ARM64 a reader may rarely see a torn snapshot.
+    """
+
+    def __init__(self, n: int, name: str | None = None):
+        "Creates a new buffer, or attaches to the one called name"
+        self.n = n
+        size = 3 * 8 + 2 * (1 + 7 * n) * 8
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        # Published slot and the sequence numbers of both slots
+        self.header = np.ndarray(3, dtype=np.int64, buffer=self.shm.buf)
+        # Per slot the simulated time followed by (pos, orientation) of every body
+        self.slots = np.ndarray((2, 1 + 7 * n), dtype=np.float64, buffer=self.shm.buf, offset=3 * 8)
+        if name is None:
+            self.header[:] = 0
+            self.slots[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, t: float, pos: np.ndarray, orientation: np.ndarray) -> None:
+        "Publish the (n, 3) positions and (n, 4) unit quaternions at simulated time t"
+        slot = 1 - self.header[0]
+        self.header[1 + slot] += 1
+        data = self.slots[slot]
+        data[0] = t
+        poses = data[1:].reshape(self.n, 7)
+        poses[:, :3] = pos
+        poses[:, 3:] = orientation
+        self.header[1 + slot] += 1
+        self.header[0] = slot
+
+    def read(self) -> tuple[float, np.ndarray, np.ndarray] | None:
+        """Simulated time, (n, 3) positions and (n, 4) orientations of the newest snapshot,
+        None if nothing was published yet"""
+        while True:
+            slot = self.header[0]
+            sequence = self.header[1 + slot]
+            if sequence == 0:
+                return None
+            if sequence % 2 == 0:
+                data = self.slots[slot].copy()
+                if self.header[1 + slot] == sequence:
+                    poses = data[1:].reshape(self.n, 7)
+                    return float(data[0]), poses[:, :3], poses[:, 3:]
+            # Let the writer finish
+            time.sleep(0)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        "Wait until the first snapshot is published, returns whether it was within timeout seconds"
+        end = None if timeout is None else time.perf_counter() + timeout
+        while self.header[1] == 0 and self.header[2] == 0:
+            if end is not None and time.perf_counter() > end:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self) -> None:
+        # Drop the views first, shared memory with exported buffers cannot be closed
+        del self.header, self.slots
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+
+def _poses(simulation) -> tuple[np.ndarray, np.ndarray]:
+    "Positions and orientations of the bodies of simulation"
+    state = getattr(simulation, "state", None)
+    if state is not None:
+        return state.pos, state.orientation
+    bodies = simulation.bodies
+    pos = np.array([(b.pos.x, b.pos.y, b.pos.z) for b in bodies])
+    orientation = np.array([(b.orientation.a, b.orientation.b, b.orientation.c, b.orientation.d) for b in bodies])
+    return pos, orientation
+
+
+def _run(factory, delta_time: float, max_steps: int, name: str, n: int, stop) -> None:
+    "Step factory() in real time and publish every new state until stop is set"
+    simulation = factory()
+    buffer = PoseBuffer(n, name)
+    scheduler = FixedStepScheduler(simulation, delta_time, max_steps)
+    buffer.write(0.0, *_poses(simulation))
+    last = time.perf_counter()
+    while not stop.is_set():
+        now = time.perf_counter()
+        if scheduler.advance(now - last):
+            buffer.write(scheduler.simulator.time, *_poses(simulation))
+        last = now
+        # Sleep until the next step is due
+        stop.wait(max(0.0, delta_time - scheduler.accumulator))
+    buffer.close()
+
+
+class PhysicsWorker:
+    """Runs a simulation in real time on a background thread or process.
+
+    The worker builds its own simulation with factory(), which must return an object
+    with time_step(delta_time) and n bodies, and publishes their poses after every
+    step into a PoseBuffer. The render loop reads the newest poses with read() and
+    never waits for a step to finish. In a process, factory must be picklable and
+    the simulation runs in parallel with rendering, not only concurrently.
+    """
+
+    def __init__(self, factory, n: int, delta_time: float = 1 / 120, process: bool = False, max_steps: int = 8):
+        self.buffer = PoseBuffer(n)
+        context = multiprocessing.get_context("spawn")
+        self._stop = context.Event() if process else threading.Event()
+        args = (factory, delta_time, max_steps, self.buffer.name, n, self._stop)
+        if process:
+            self._worker = context.Process(target=_run, args=args, daemon=True)
+        else:
+            self._worker = threading.Thread(target=_run, args=args, daemon=True)
+
+    def start(self, timeout: float = 30.0) -> "PhysicsWorker":
+        "Start the worker and wait until it published the initial poses, such that read never returns None"
+        self._worker.start()
+        while not self.buffer.wait(0.1):
+            timeout -= 0.1
+            if not self._worker.is_alive() or timeout <= 0:
+                self.stop()
+                raise RuntimeError("the physics worker did not publish its initial poses")
+        return self
+
+    def read(self) -> tuple[float, np.ndarray, np.ndarray]:
+        "Simulated time, positions and orientations of the newest published state"
+        return self.buffer.read()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._worker.join()
+        self.buffer.close()
+        self.buffer.unlink()
+
+    def __enter__(self) -> "PhysicsWorker":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
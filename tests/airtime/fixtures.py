@@ -0,0 +1,39 @@
+"Bodies shared by several test modules"
+from airtime import Vector
+from airtime.articulated import ArticulatedBody
+from airtime.body import Color, Cube
+from airtime.joint import HingeJoint
+from airtime.matrix import Matrix
+from airtime.offscreen import create_context
+
+RED = Color(1, 0, 0)
+
+
+def gl_context():
+    "Standalone OpenGL context, None where there is none such that GL tests can skip"
+    try:
+        return create_context()
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def make_limb(joint_type, *args):
+    "A torso and an arm connected by a joint of joint_type"
+    torso = Cube(None, 1, 2, 3, RED)
+    arm = Cube(None, 2, 0.5, 0.5, RED, pos=Vector(1.5, 0, 1))
+    joint = joint_type(None, 0.2, *args[:1], RED, torso, arm, *args[1:], Vector(0.5, 0, 1), Matrix.from_euler(0.2, 0.1, 0.3))
+    return torso, arm, joint
+
+
+def make_skeleton(packed=False):
+    "A torso with a two segment arm on one side and a one segment arm on the other"
+    torso = Cube(None, 1, 2, 3, RED)
+    upper = Cube(None, 2, 0.5, 0.5, RED, pos=Vector(1.5, 0, 1))
+    lower = Cube(None, 2, 0.4, 0.4, RED, pos=Vector(3.5, 0, 1))
+    other = Cube(None, 0.5, 0.5, 2, RED, pos=Vector(-0.5, 0, -2), rot=Matrix.from_euler(0, 0.3, 0))
+    joints = [
+        HingeJoint(None, 0.2, 0.2, RED, torso, upper, Vector(0, 0, 1), 0, Vector(0.5, 0, 1), Matrix.identity()),
+        HingeJoint(None, 0.2, 0.2, RED, lower, upper, Vector(0, 0, 1), 0, Vector(2.5, 0, 1), Matrix.from_euler(0.4, 0, 0)),
+        HingeJoint(None, 0.2, 0.2, RED, other, torso, Vector(0, 0, 1), 0, Vector(-0.5, 0, -1), Matrix.from_euler(0, 1.2, 0)),
+    ]
+    return ArticulatedBody(torso, joints, packed)
@@ -0,0 +1,134 @@
+import unittest
+import math
+import numpy as np
+from airtime import Vector, Quaternion, RotationQuaternion, dot, cross
+from airtime.matrix import Matrix, outer
+from airtime.arrays import (
+    VectorArray,
+    MatrixArray,
+    QuaternionArray,
+    RotationQuaternionArray,
+)
+from airtime import arrays
+
+VECTORS = [Vector(1, 2, 3), Vector(-4, 0.5, 2), Vector(0, -1, 7)]
+OTHERS = [Vector(4, 5, 6), Vector(1, 1, -1), Vector(2, 3, 0.5)]
+MATRICES = [
+    Matrix.from_euler(0.1, 0.2, 0.3),
+    Matrix(2, 1, 0, 0, 3, 1, 1, 0, 4),
+    Matrix.from_diagonal(1, 2, 3),
+]
+
+
+class TestVectorArray(unittest.TestCase):
+    def test_operators(self):
+        a = VectorArray.from_vectors(VECTORS)
+        b = VectorArray.from_vectors(OTHERS)
+        self.assertTrue((a + b).isclose(VectorArray.from_vectors(v + o for v, o in zip(VECTORS, OTHERS))))
+        self.assertTrue((a - b).isclose(VectorArray.from_vectors(v - o for v, o in zip(VECTORS, OTHERS))))
+        self.assertTrue((2 * a).isclose(VectorArray.from_vectors(2 * v for v in VECTORS)))
+        self.assertTrue((a / 2).isclose(VectorArray.from_vectors(v / 2 for v in VECTORS)))
+        self.assertTrue((a + Vector(1, 1, 1)).isclose(VectorArray.from_vectors(v + Vector(1, 1, 1) for v in VECTORS)))
+
+    def test_per_element_scalars(self):
+        a = VectorArray.from_vectors(VECTORS)
+        s = np.array([1.0, 2.0, 3.0])
+        self.assertEqual((a * s)[2], VECTORS[2] * 3)
+
+    def test_numpy_scalars(self):
+        a = VectorArray.from_vectors(VECTORS)
+        self.assertTrue((a * np.int64(2)).isclose(2 * a))
+        self.assertTrue((np.float32(0.5) * a).isclose(a / 2))
+
+    def test_shares_array(self):
+        v = np.zeros((2, 3))
+        a = VectorArray(v)
+        v[0, 0] = 1
+        self.assertEqual(a[0], Vector(1, 0, 0))
+
+    def test_dot_cross(self):
+        a = VectorArray.from_vectors(VECTORS)
+        b = VectorArray.from_vectors(OTHERS)
+        np.testing.assert_allclose(arrays.dot(a, b), [dot(v, o) for v, o in zip(VECTORS, OTHERS)])
+        self.assertTrue(arrays.cross(a, b).isclose(VectorArray.from_vectors(cross(v, o) for v, o in zip(VECTORS, OTHERS))))
+
+    def test_length(self):
+        a = VectorArray.from_vectors(VECTORS)
+        np.testing.assert_allclose(a.length(), [v.length() for v in VECTORS])
+        np.testing.assert_allclose(a.normalized().length(), 1)
+
+
+class TestMatrixArray(unittest.TestCase):
+    def test_multiplication(self):
+        m = MatrixArray.from_matrices(MATRICES)
+        n = MatrixArray.from_matrices(reversed(MATRICES))
+        for i, (a, b) in enumerate(zip(MATRICES, reversed(MATRICES))):
+            self.assertTrue(MatrixArray((m * n)[i]).isclose(a * b))
+        # Matrices multiplied from the left come first
+        for i, (a, b) in enumerate(zip(MATRICES, (MATRICES[1] * m).m)):
+            self.assertTrue(MatrixArray(b).isclose(MATRICES[1] * a))
+
+    def test_matrix_vector(self):
+        m = MatrixArray.from_matrices(MATRICES)
+        v = VectorArray.from_vectors(VECTORS)
+        expected = [
+            Vector(*(sum(a[i][j] * b[j] for j in range(3)) for i in range(3)))
+            for a, b in zip(MATRICES, VECTORS)
+        ]
+        self.assertTrue((m * v).isclose(VectorArray.from_vectors(expected)))
+
+    def test_inv(self):
+        m = MatrixArray.from_matrices(MATRICES)
+        self.assertTrue((m * m.inv()).isclose(MatrixArray.identity(3)))
+        for i, a in enumerate(MATRICES):
+            self.assertTrue(MatrixArray(m.inv()[i]).isclose(a.inv()))
+
+    def test_inv_singular(self):
+        with self.assertRaises(ValueError):
+            MatrixArray.zero(2).inv()
+
+    def test_transposed(self):
+        m = MatrixArray.from_matrices(MATRICES)
+        for i, a in enumerate(MATRICES):
+            self.assertEqual(m.transposed()[i], a.transposed())
+
+    def test_from_axis_angle(self):
+        angles = np.array([0.3, -1.2, math.pi])
+        m = MatrixArray.from_axis_angle(VectorArray.from_vectors(VECTORS), angles)
+        for i, (v, angle) in enumerate(zip(VECTORS, angles)):
+            self.assertTrue(MatrixArray(m[i]).isclose(Matrix.from_axis_angle(v, angle)))
+
+    def test_outer(self):
+        m = arrays.outer(VectorArray.from_vectors(VECTORS), VectorArray.from_vectors(OTHERS))
+        for i, (v, o) in enumerate(zip(VECTORS, OTHERS)):
+            self.assertEqual(m[i], outer(v, o))
+
+
+class TestQuaternionArray(unittest.TestCase):
+    def test_multiplication(self):
+        q1 = QuaternionArray([(1, 2, 3, 4), (0.5, -1, 2, 0)])
+        q2 = QuaternionArray([(5, 6, 7, 8), (1, 1, 1, 1)])
+        result = q1 * q2
+        self.assertEqual(result[0], Quaternion(-60, 12, 30, 24))
+        self.assertEqual(result[1], Quaternion(0.5, -1, 2, 0) * Quaternion(1, 1, 1, 1))
+        # Quaternions multiplied from the left come first
+        q = Quaternion(1, 2, 3, 4)
+        self.assertEqual((q * q2)[0], q * Quaternion(5, 6, 7, 8))
+        self.assertEqual((q2 * q)[0], Quaternion(5, 6, 7, 8) * q)
+
+    def test_division(self):
+        q1 = QuaternionArray([(1, 2, 3, 4), (0.5, -1, 2, 0)])
+        q2 = QuaternionArray([(5, 6, 7, 8), (1, 1, 1, 1)])
+        self.assertTrue(((q1 * q2) / q2).isclose(q1))
+
+    def test_rotate(self):
+        angles = np.array([2 * math.pi / 3, 0.4, -2.0])
+        q = RotationQuaternionArray(angles, VectorArray.from_vectors(VECTORS))
+        result = q.rotate(VectorArray.from_vectors(OTHERS))
+        for i, (angle, axis, v) in enumerate(zip(angles, VECTORS, OTHERS)):
+            self.assertTrue(result[i].isclose(RotationQuaternion(angle, axis).rotate(v)))
+        np.testing.assert_allclose(q.angle(), np.abs(angles))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from airtime import Quaternion, Vector, cross
+from airtime.articulated import ArticulatedBody
+from airtime.body import Cube
+from airtime.joint import HingeJoint
+from airtime.matrix import Matrix
+from airtime.sweep import landing_error
+from fixtures import RED, make_skeleton
+
+
+def rotation_vector(q: Quaternion) -> Vector:
+    "Small rotation vector of unit quaternion q"
+    if q.a < 0:
+        q = -q
+    return Vector(q.b, q.c, q.d) * 2
+
+
+class TestArticulatedBody(unittest.TestCase):
+    def test_tree(self):
+        skeleton = make_skeleton()
+        self.assertEqual(skeleton.parents, [0, 0, 1])
+        self.assertEqual(skeleton.signs, [1, -1, -1])
+        self.assertEqual(len(skeleton.bodies), 7)
+
+    def test_not_a_tree(self):
+        torso = Cube(None, 1, 1, 1, RED)
+        loose = Cube(None, 1, 1, 1, RED, pos=Vector(5, 0, 0))
+        other = Cube(None, 1, 1, 1, RED, pos=Vector(7, 0, 0))
+        joint = HingeJoint(None, 1, 1, RED, loose, other, Vector(0, 0, 1), 0, Vector(6, 0, 0), Matrix.identity())
+        with self.assertRaises(ValueError):
+            ArticulatedBody(torso, [joint])
+
+    def test_joints_bend_by_deltas(self):
+        skeleton = make_skeleton()
+        deltas = [0.1, -0.2, 0.05]
+        before = [j.first.rot.transposed() * j.second.rot for j in skeleton.joints]
+        skeleton.bend(deltas)
+        for joint, delta, b in zip(skeleton.joints, deltas, before):
+            after = joint.first.rot.transposed() * joint.second.rot
+            self.assertAlmostEqual(landing_error(b, after), abs(delta))
+        self.assertEqual([j.angle for j in skeleton.joints], deltas)
+
+    def test_center_of_mass_stays(self):
+        skeleton = make_skeleton()
+        cm = skeleton.center_of_mass
+        skeleton.bend([0.3, 0.2, -0.4])
+        self.assertTrue(skeleton.center_of_mass.isclose(cm))
+
+    def test_joints_stay_connected(self):
+        skeleton = make_skeleton()
+        # Joint positions in the coordinates of both connected segments
+        def anchors():
+            return [
+                (j.first.rot.transposed() * (j.pos - j.first.pos), j.second.rot.transposed() * (j.pos - j.second.pos))
+                for j in skeleton.joints
+            ]
+
+        before = anchors()
+        for _ in range(10):
+            skeleton.bend([0.1, 0.1, 0.1])
+        for (a0, b0), (a1, b1) in zip(before, anchors()):
+            self.assertTrue(a0.isclose(a1))
+            self.assertTrue(b0.isclose(b1))
+
+    def test_conserves_angular_momentum(self):
+        for packed in (False, True):
+            skeleton = make_skeleton(packed)
+            bodies = skeleton.bodies
+            delta = 1e-4
+            cm = skeleton.center_of_mass
+            pos = [body.pos for body in bodies]
+            orientation = [body.orientation for body in bodies]
+            i = [body.inertia_tensor_in(body.pos, Matrix.identity()) for body in bodies]
+            skeleton.bend([delta, 2 * delta, -delta])
+            # Angular momentum around the center of mass of the displacement, to first order
+            l = Vector(0, 0, 0)
+            for body, p, q, ib in zip(bodies, pos, orientation, i):
+                l += ib * rotation_vector(body.orientation * q.conjugated())
+                l += body.m * cross(p - cm, body.pos - p)
+            self.assertLess(l.length(), 1e-3 * delta)
+
+    def test_packed_matches_unpacked(self):
+        packed = make_skeleton(packed=True)
+        unpacked = make_skeleton()
+        for _ in range(5):
+            packed.bend([0.1, -0.1, 0.2])
+            unpacked.bend([0.1, -0.1, 0.2])
+        for a, b in zip(packed.bodies, unpacked.bodies):
+            self.assertTrue(a.pos.isclose(b.pos))
+
+
+if __name__ == "__main__":
+    unittest.main()
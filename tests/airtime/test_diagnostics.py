@@ -0,0 +1,92 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from airtime import Vector
+from airtime.body import RigidBody
+from airtime.diagnostics import Diagnostics
+from airtime.ensemble import RotatingEnsemble
+from airtime.gymnast import Gymnast
+from airtime.integrators import RK4
+from airtime.matrix import Matrix
+from airtime.rotating_body import RotatingBody
+from airtime.simulator import Simulator
+from fixtures import make_skeleton
+
+
+def rotating_body(integrator=None):
+    return RotatingBody(RigidBody(None, None, 1, Matrix.from_diagonal(1, 2, 3)), Vector(0.01, 2, 0.01), integrator)
+
+
+class TestDiagnostics(unittest.TestCase):
+    def test_rotating_body(self):
+        body = rotating_body(RK4())
+        diagnostics = Diagnostics(body, every=1)
+        Simulator(body, 0.01).run(100, diagnostics)
+        records = diagnostics.records()
+        self.assertEqual(len(records), 100)
+        self.assertAlmostEqual(records["energy"][-1], body.kinetic_energy())
+        self.assertEqual(tuple(records["momentum"][-1]), tuple(body.angular_momentum()))
+        self.assertEqual(records["energy_error"][0], 0)
+        self.assertLess(records["energy_error"].max(), 1e-6)
+        self.assertLess(records["momentum_error"].max(), 1e-6)
+
+    def test_tolerance(self):
+        body = rotating_body()  # ForwardEuler gains energy every step
+        diagnostics = Diagnostics(body, every=1, tolerance=1e-3)
+        simulator = Simulator(body, 0.01)
+        with self.assertRaises(RuntimeError):
+            simulator.run(1000, diagnostics)
+        self.assertLess(simulator.steps, 1000)
+
+    def test_ensemble(self):
+        i = np.tile(np.diag((1.0, 2.0, 3.0)), (3, 1, 1))
+        ensemble = RotatingEnsemble(i, [(0.01, 2, 0.01), (1, 0, 0), (0, 0, 0)])
+        diagnostics = Diagnostics(ensemble, every=10)
+        Simulator(ensemble, 0.01).run(100, diagnostics)
+        records = diagnostics.records()
+        self.assertEqual(len(records), 10)
+        self.assertAlmostEqual(records["energy"][-1], ensemble.kinetic_energy().sum())
+        # Only the member near its unstable axis loses accuracy, the one at rest has no error
+        self.assertGreater(records["energy_error"][-1], 0)
+        self.assertTrue(np.isfinite(records["momentum_error"]).all())
+
+    def test_bend_conserves_momentum(self):
+        skeleton = make_skeleton(packed=True)
+        diagnostics = Diagnostics(bodies=skeleton.bodies, joints=skeleton.joints)
+        for k in range(50):
+            diagnostics.sample(k * 0.01)
+            skeleton.bend((0.002, -0.003, 0.001))
+        records = diagnostics.records()
+        self.assertLess(np.abs(records["shape_momentum"]).max(), 1e-3)
+        self.assertLess(records["drift"].max(), 1e-9)
+
+    def test_hinge_drift(self):
+        gymnast = Gymnast()
+        diagnostics = Diagnostics(bodies=gymnast.bodies, joints=[gymnast.hinge], every=1)
+        Simulator(gymnast, 0.01).run(150, diagnostics)
+        records = diagnostics.records()
+        self.assertLess(records["drift"].max(), 1e-9)
+        # HingeJoint.bend conserves angular momentum around the joint, not around the
+        # center of mass, so the bending gymnast carries angular momentum of its own
+        momentum = np.linalg.norm(records["shape_momentum"][1:], axis=1)
+        self.assertGreater(momentum.min(), 1)
+
+    def test_ring_buffer(self):
+        body = rotating_body()
+        diagnostics = Diagnostics(body, capacity=8, every=1)
+        simulator = Simulator(body, 0.01)
+        simulator.run(5, diagnostics)
+        np.testing.assert_allclose(diagnostics.poll()["time"], np.arange(1, 6) * 0.01)
+        self.assertEqual(len(diagnostics.poll()), 0)
+        simulator.run(20, diagnostics)
+        np.testing.assert_allclose(diagnostics.records()["time"], np.arange(18, 26) * 0.01)
+        np.testing.assert_allclose(diagnostics.poll()["time"], np.arange(18, 26) * 0.01)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "diagnostics.npy")
+            diagnostics.dump(path)
+            np.testing.assert_array_equal(np.load(path), diagnostics.records())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from airtime import Vector
+from airtime.arrays import MatrixArray, VectorArray
+from airtime.body import RigidBody
+from airtime.ensemble import RotatingEnsemble
+from airtime.matrix import Matrix
+from airtime.rotating_body import RotatingBody
+
+
+def make_rotating_bodies():
+    return [
+        RotatingBody(RigidBody(None, None, 1, Matrix.from_diagonal(1, 2, 3)), Vector(0.1, 2, 0.05)),
+        RotatingBody(RigidBody(None, Matrix.from_euler(0.3, 0.2, 0.1), 2, Matrix.from_diagonal(4, 1, 2)), Vector(1, 0, 1)),
+        RotatingBody(RigidBody(None, None, 3, Matrix(2, 0.1, 0, 0.1, 3, 0.2, 0, 0.2, 4)), Vector(-0.5, 0.3, 3)),
+    ]
+
+
+class TestRotatingEnsemble(unittest.TestCase):
+    def test_matches_scalar_path(self):
+        rotating_bodies = make_rotating_bodies()
+        ensemble = RotatingEnsemble.from_rotating_bodies(rotating_bodies)
+        for _ in range(100):
+            ensemble.time_step(0.01)
+            for r in rotating_bodies:
+                r.time_step(0.01)
+        for k, r in enumerate(rotating_bodies):
+            self.assertTrue(ensemble.w[k].isclose(r.w, 1e-9))
+            self.assertTrue(MatrixArray(ensemble.rot[k]).isclose(r.body.rot, 1e-9))
+
+    def test_member_at_rest(self):
+        ensemble = RotatingEnsemble(MatrixArray.from_diagonal(np.ones(2), 2, 3), [(0, 0, 0), (0, 0, 1)])
+        ensemble.time_step(0.1)
+        self.assertTrue(ensemble.w.isclose(VectorArray([(0, 0, 0), (0, 0, 1)])))
+        self.assertEqual(ensemble.rot[0], Matrix.identity())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import math
+from airtime import Vector, Quaternion, dot
+from airtime.body import RigidBody
+from airtime.integrators import RK4, DormandPrince, ForwardEuler, Splitting
+from airtime.matrix import Matrix
+from airtime.rotating_body import RotatingBody
+
+INTEGRATORS = [ForwardEuler, RK4, DormandPrince, Splitting]
+
+
+def simulate(integrator, w: Vector, delta_time: float, steps: int):
+    body = RigidBody(None, None, 1, Matrix.from_diagonal(1, 2, 3))
+    rotating_body = RotatingBody(body, w, integrator)
+    for _ in range(steps):
+        rotating_body.time_step(delta_time)
+    return rotating_body
+
+
+def momentum_and_energy(rotating_body):
+    i = rotating_body.body.inertia_tensor_in(rotating_body.body.pos, Matrix.identity())
+    l = i * rotating_body.w
+    return l, dot(rotating_body.w, l) / 2
+
+
+class TestIntegrators(unittest.TestCase):
+    def test_principal_axis(self):
+        # Rotation around a principal axis is steady: a quarter turn in one second
+        for integrator in INTEGRATORS:
+            r = simulate(integrator(), Vector(0, 0, math.pi / 2), 0.01, 100)
+            self.assertTrue(r.w.isclose(Vector(0, 0, math.pi / 2)), integrator)
+            self.assertTrue((r.body.rot * Vector(1, 0, 0)).isclose(Vector(0, 1, 0)), integrator)
+
+    def test_accuracy(self):
+        w = Vector(0.05, 2, 0.05)
+        reference = simulate(RK4(), w, 0.001, 2000)
+        for integrator, tol in [(RK4(), 1e-6), (DormandPrince(rtol=1e-8, atol=1e-10), 1e-6), (Splitting(), 1e-3)]:
+            r = simulate(integrator, w, 0.02, 100)
+            self.assertTrue(r.w.isclose(reference.w, tol), integrator)
+
+    def test_splitting_conserves_momentum(self):
+        r0 = simulate(Splitting(), Vector(0.05, 2, 0.05), 0.1, 0)
+        l0, e0 = momentum_and_energy(r0)
+        r = simulate(Splitting(), Vector(0.05, 2, 0.05), 0.1, 200)
+        l, e = momentum_and_energy(r)
+        self.assertTrue(l.isclose(l0, 1e-12))
+        self.assertAlmostEqual(e, e0, places=3)
+
+    def test_dormand_prince_substeps(self):
+        integrator = DormandPrince(rtol=1e-10, atol=1e-12)
+        w, q = integrator.step(Matrix.from_diagonal(1, 2, 3), Vector(0.05, 2, 0.05), 1.0)
+        self.assertGreater(integrator.evaluations, 7)
+        self.assertAlmostEqual(q.norm(), 1)
+        self.assertIsInstance(q, Quaternion)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import numpy as np
+from airtime import Vector, dot
+from airtime.articulated import ArticulatedBody
+from airtime.body import RigidBody
+from airtime.gymnast import Gymnast
+from airtime.joint import BallJoint, SaddleJoint, solve_hinge, solve_hinges, solve_joint, solve_joints
+from airtime.matrix import Matrix
+from airtime.sweep import landing_error
+from fixtures import make_limb
+
+
+def solve_hinge_6x6(I_a, I_b):
+    "The original formulation as one 6x6 system"
+    A = np.array(
+        [
+            [I_a[0][0], I_a[0][1], I_a[0][2], 0, -1, 0],
+            [I_a[1][0], I_a[1][1], I_a[1][2], 0, 0, -1],
+            [I_a[2][0], I_a[2][1], I_a[2][2], 0, 0, 0],
+            [I_b[0][0], I_b[0][1], 0, I_b[0][2], -1, 0],
+            [I_b[1][0], I_b[1][1], 0, I_b[1][2], 0, -1],
+            [I_b[2][0], I_b[2][1], 0, I_b[2][2], 0, 0],
+        ]
+    )
+    return np.linalg.solve(A, np.array([0, 0, 1, 0, 0, -1]))[:4]
+
+
+def inertia_tensors(n):
+    rng = np.random.default_rng(1)
+    tensors = []
+    for _ in range(n):
+        body = RigidBody(
+            Vector(*rng.normal(size=3).tolist()),
+            Matrix.from_euler(*rng.uniform(-3, 3, size=3).tolist()),
+            rng.uniform(0.5, 5),
+            Matrix.from_diagonal(*rng.uniform(0.5, 5, size=3).tolist()),
+        )
+        tensors.append(body.inertia_tensor_in(Vector(0.1, -0.2, 0.3), Matrix.from_euler(0.3, 0.2, 0.1)))
+    return tensors
+
+
+class TestHingeSolver(unittest.TestCase):
+    def test_matches_6x6_system(self):
+        tensors = inertia_tensors(20)
+        for i_a, i_b in zip(tensors[::2], tensors[1::2]):
+            expected = solve_hinge_6x6(i_a, i_b)
+            np.testing.assert_allclose(solve_hinge(i_a, i_b), expected, rtol=1e-12, atol=1e-12)
+
+    def test_batched(self):
+        tensors = inertia_tensors(20)
+        i_a = np.array([np.reshape(t.e, (3, 3)) for t in tensors[::2]])
+        i_b = np.array([np.reshape(t.e, (3, 3)) for t in tensors[1::2]])
+        expected = [solve_hinge(a, b) for a, b in zip(tensors[::2], tensors[1::2])]
+        np.testing.assert_allclose(solve_hinges(i_a, i_b), expected, rtol=1e-12, atol=1e-12)
+
+    def test_batched_candidate_angles(self):
+        i_a, i_b = inertia_tensors(2)
+        angles = np.linspace(-0.1, 0.1, 5)
+        alpha = solve_hinges(i_a, i_b, angles)
+        self.assertEqual(alpha.shape, (5, 4))
+        np.testing.assert_allclose(alpha[:, 3] - alpha[:, 2], angles, atol=1e-15)
+
+    def test_bend(self):
+        gymnast = Gymnast()
+        first, second = gymnast.hinge.first, gymnast.hinge.second
+        before = first.rot.transposed() * second.rot
+        gymnast.hinge.bend(-0.01)
+        after = first.rot.transposed() * second.rot
+        # The bodies turn relative to each other by the bend angle
+        self.assertAlmostEqual(landing_error(before, after), 0.01)
+
+
+class TestJointSolver(unittest.TestCase):
+    def test_hinge(self):
+        tensors = inertia_tensors(10)
+        for i_a, i_b in zip(tensors[::2], tensors[1::2]):
+            alpha_x, alpha_y, alpha_A, alpha_B = solve_hinge(i_a, i_b)
+            scale = 0.3 / (alpha_B - alpha_A)
+            alpha_a, alpha_b = solve_joint(i_a, i_b, [Vector(0, 0, 1)], [0.3])
+            np.testing.assert_allclose(tuple(alpha_a), np.array((alpha_x, alpha_y, alpha_A)) * scale, rtol=1e-12)
+            np.testing.assert_allclose(tuple(alpha_b), np.array((alpha_x, alpha_y, alpha_B)) * scale, rtol=1e-12)
+
+    def test_constraints(self):
+        i_a, i_b = inertia_tensors(2)
+        for axes, angles in (
+            ([Vector(0, 0, 1)], [0.1]),
+            ([Vector(1, 0, 0), Vector(0.6, 0.8, 0)], [0.1, -0.2]),
+            ([Vector(1, 0, 0), Vector(0, 1, 0), Vector(0, 0, 1)], [0.1, -0.2, 0.3]),
+        ):
+            alpha_a, alpha_b = solve_joint(i_a, i_b, axes, angles)
+            relative = Vector(0, 0, 0)
+            for axis, angle in zip(axes, angles):
+                relative += axis * angle
+            self.assertTrue((alpha_b - alpha_a).isclose(relative))
+            # The joint drives both bodies with opposite torques along its axes
+            torque = i_a * alpha_a + i_b * alpha_b
+            for axis in axes:
+                self.assertAlmostEqual(dot(torque, axis), 0)
+
+    def test_batched(self):
+        tensors = inertia_tensors(20)
+        i_a = np.array([np.reshape(t.e, (3, 3)) for t in tensors[::2]])
+        i_b = np.array([np.reshape(t.e, (3, 3)) for t in tensors[1::2]])
+        angles = np.linspace(-0.3, 0.3, 30).reshape(10, 3)
+        for axes in (
+            [Vector(0, 0, 1)],
+            [Vector(1, 0, 0), Vector(0.6, 0.8, 0)],
+            [Vector(1, 0, 0), Vector(0, 1, 0), Vector(0, 0, 1)],
+        ):
+            k = len(axes)
+            alpha_a, alpha_b = solve_joints(i_a, i_b, axes, angles[:, :k])
+            for n, (a, b) in enumerate(zip(tensors[::2], tensors[1::2])):
+                expected_a, expected_b = solve_joint(a, b, axes, angles[n, :k].tolist())
+                np.testing.assert_allclose(alpha_a[n], tuple(expected_a), rtol=1e-10, atol=1e-14)
+                np.testing.assert_allclose(alpha_b[n], tuple(expected_b), rtol=1e-10, atol=1e-14)
+
+    def test_ball_joint_bend(self):
+        torso, arm, joint = make_limb(BallJoint)
+        before = torso.rot.transposed() * arm.rot
+        joint.bend(0.01, -0.02, 0.02)
+        after = torso.rot.transposed() * arm.rot
+        self.assertAlmostEqual(landing_error(before, after), 0.03, places=5)
+        self.assertEqual((joint.rx, joint.ry, joint.rz), (0.01, -0.02, 0.02))
+
+    def test_saddle_joint_bend(self):
+        torso, arm, joint = make_limb(SaddleJoint, 0.2, Vector(1, 0, 0), Vector(0, 1, 0))
+        before = torso.rot.transposed() * arm.rot
+        joint.bend(0.03, -0.04)
+        after = torso.rot.transposed() * arm.rot
+        self.assertAlmostEqual(landing_error(before, after), 0.05, places=5)
+        self.assertEqual((joint.angle_a, joint.angle_b), (0.03, -0.04))
+
+    def test_articulated(self):
+        torso, arm, joint = make_limb(BallJoint)
+        body = ArticulatedBody(torso, [joint])
+        before = torso.rot.transposed() * arm.rot
+        body.bend([(0.01, -0.02, 0.02)])
+        after = torso.rot.transposed() * arm.rot
+        self.assertAlmostEqual(landing_error(before, after), 0.03)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import math
+from airtime import Vector
+from airtime.matrix import Matrix, MatrixAccumulator, outer
+
+
+class MatrixTestCase(unittest.TestCase):
+    def test_construction(self):
+        m = Matrix(((1, 2, 3), (4, 5, 6), (7, 8, 9)))
+        self.assertEqual(m, Matrix(1, 2, 3, 4, 5, 6, 7, 8, 9))
+        self.assertEqual(m[1], (4, 5, 6))
+        self.assertEqual(m.m, ((1, 2, 3), (4, 5, 6), (7, 8, 9)))
+
+    def test_addition(self):
+        m1 = Matrix(1, 2, 3, 4, 5, 6, 7, 8, 9)
+        m2 = Matrix.identity()
+        self.assertEqual(m1 + m2, Matrix(2, 2, 3, 4, 6, 6, 7, 8, 10))
+        self.assertEqual(m1 - m2, Matrix(0, 2, 3, 4, 4, 6, 7, 8, 8))
+
+    def test_augmented_assignment_makes_new_matrix(self):
+        m = Matrix.zero()
+        alias = m
+        m += Matrix.identity()
+        m *= 2
+        m -= Matrix.identity()
+        self.assertIsNot(m, alias)
+        self.assertEqual(m, Matrix.from_diagonal(1, 1, 1))
+        self.assertEqual(alias, Matrix.zero())
+
+    def test_accumulator(self):
+        total = MatrixAccumulator()
+        alias = total
+        total += Matrix.identity()
+        total *= 2
+        total -= Matrix.from_diagonal(0, 1, 0)
+        total *= Matrix(1, 2, 3, 4, 5, 6, 7, 8, 9)
+        self.assertIs(total, alias)
+        m = total.matrix()
+        self.assertEqual(m, Matrix(2, 4, 6, 4, 5, 6, 14, 16, 18))
+        total += Matrix.identity()
+        self.assertEqual(m, Matrix(2, 4, 6, 4, 5, 6, 14, 16, 18))
+        self.assertEqual(MatrixAccumulator(m).matrix(), m)
+
+    def test_multiplication(self):
+        m1 = Matrix(1, 2, 3, 4, 5, 6, 7, 8, 9)
+        m2 = Matrix(9, 8, 7, 6, 5, 4, 3, 2, 1)
+        self.assertEqual(m1 * m2, Matrix(30, 24, 18, 84, 69, 54, 138, 114, 90))
+        self.assertEqual(2 * m1, Matrix(2, 4, 6, 8, 10, 12, 14, 16, 18))
+
+    def test_matrix_vector(self):
+        m = Matrix(1, 2, 3, 4, 5, 6, 7, 8, 9)
+        self.assertEqual(m * Vector(1, 0, -1), Vector(-2, -2, -2))
+
+    def test_transposed(self):
+        m = Matrix(1, 2, 3, 4, 5, 6, 7, 8, 9)
+        self.assertEqual(m.transposed(), Matrix(1, 4, 7, 2, 5, 8, 3, 6, 9))
+
+    def test_inv(self):
+        m = Matrix(2, 1, 0, 0, 3, 1, 1, 0, 4)
+        p = m * m.inv()
+        for i in range(3):
+            for j in range(3):
+                self.assertAlmostEqual(p[i][j], 1 if i == j else 0)
+        with self.assertRaises(ValueError):
+            Matrix.zero().inv()
+
+    def test_from_axis_angle(self):
+        m = Matrix.from_axis_angle(Vector(0, 0, 2), math.pi / 2)
+        self.assertTrue((m * Vector(1, 0, 0)).isclose(Vector(0, 1, 0)))
+
+    def test_outer(self):
+        self.assertEqual(outer(Vector(1, 2, 3), Vector(4, 5, 6)), Matrix(4, 5, 6, 8, 10, 12, 12, 15, 18))
+
+
+if __name__ == "__main__":
+    unittest.main()
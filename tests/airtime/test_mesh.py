@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from airtime import mesh
+
+
+def check_mesh(test, vertices, triangles):
+    test.assertEqual(vertices.dtype, np.float32)
+    test.assertEqual(triangles.dtype, np.uint32)
+    test.assertEqual(vertices.shape[1], 6)
+    test.assertLess(triangles.max(), len(vertices))
+    positions = vertices[:, :3].astype(float)
+    normals = vertices[:, 3:].astype(float)
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1, rtol=1e-6)
+    test.assertLessEqual(np.abs(positions).max(), 0.5 + 1e-6)
+    # Counterclockwise seen from outside: the face normal points the way of the vertex normals
+    p = positions[triangles]
+    face = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    test.assertTrue(np.all(np.linalg.norm(face, axis=1) > 0))
+    test.assertTrue(np.all(np.einsum("ti,tvi->tv", face, normals[triangles]) > 0))
+
+
+class TestMesh(unittest.TestCase):
+    def test_cube(self):
+        vertices, triangles = mesh.cube()
+        check_mesh(self, vertices, triangles)
+        self.assertEqual(vertices.shape, (24, 6))
+        self.assertEqual(triangles.shape, (12, 3))
+
+    def test_cylinder(self):
+        for segments in (3, 24, 100):
+            vertices, triangles = mesh.cylinder(segments)
+            check_mesh(self, vertices, triangles)
+            self.assertEqual(len(vertices), 4 * segments + 2)
+            self.assertEqual(len(triangles), 4 * segments)
+
+    def test_sphere(self):
+        for segments, rings in ((3, 2), (24, 12), (64, 32)):
+            vertices, triangles = mesh.sphere(segments, rings)
+            check_mesh(self, vertices, triangles)
+            np.testing.assert_allclose(np.linalg.norm(vertices[:, :3], axis=1), 0.5, rtol=1e-6)
+            self.assertEqual(len(triangles), 2 * segments * (rings - 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
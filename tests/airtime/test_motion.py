@@ -0,0 +1,75 @@
+import unittest
+import math
+import numpy as np
+from airtime.gymnast import Gymnast
+from airtime.motion import MotionProgram
+from airtime.simulator import Simulator
+
+
+class TestMotionProgram(unittest.TestCase):
+    def test_linear(self):
+        program = MotionProgram((0, 2), ((0,), (1,)))
+        self.assertAlmostEqual(program.angles_at(0.5)[0], 0.25)
+        np.testing.assert_allclose(program.table(0.5), [[0.25]] * 4)
+
+    def test_holds_outside_keyframes(self):
+        program = MotionProgram((0.5, 1, 2), ((0, 1), (1, 3), (0, 2)))
+        np.testing.assert_allclose(program.angles_at(0), (0, 1))
+        np.testing.assert_allclose(program.angles_at(5), (0, 2))
+        table = program.table(0.1)
+        self.assertEqual(table.shape, (20, 2))
+        np.testing.assert_allclose(table[:5], 0)
+
+    def test_table_adds_up_to_keyframes(self):
+        program = MotionProgram((0, 0.3, 1), ((0,), (-1,), (0.5,)), bc_type="clamped")
+        for delta_time in (0.001, 0.01, 0.03, 0.7):
+            table = program.table(delta_time)
+            self.assertEqual(len(table), math.ceil(1 / delta_time - 1e-9))
+            self.assertAlmostEqual(table.sum(), 0.5)
+
+    def test_table_is_cached(self):
+        program = MotionProgram((0, 1), ((0,), (1,)))
+        self.assertIs(program.table(0.01), program.table(0.01))
+
+
+class TestGymnastMotion(unittest.TestCase):
+    def test_independent_of_time_step(self):
+        program = MotionProgram((0, 0.5, 1), ((0,), (-0.8,), (-0.2,)))
+        angles = []
+        for delta_time in (0.01, 0.005, 0.002):
+            gymnast = Gymnast(motion=program)
+            Simulator(gymnast, delta_time).run_until(2)
+            angles.append(gymnast.hinge.angle)
+        for angle in angles:
+            self.assertAlmostEqual(angle, -0.2)
+
+    def test_starts_at_first_keyframe(self):
+        gymnast = Gymnast(motion=MotionProgram((0, 1), ((0,), (1,))))
+        self.assertAlmostEqual(gymnast.hinge.angle, 0)
+        Simulator(gymnast, 0.01).run_until(2)
+        self.assertAlmostEqual(gymnast.hinge.angle, 1)
+
+    def test_time_step_change(self):
+        program = MotionProgram((0, 1), ((0,), (1,)))
+        gymnast = Gymnast(motion=program)
+        for delta_time, steps in ((0.01, 33), (0.007, 10), (0.01, 7), (0.005, 20)):
+            for _ in range(steps):
+                gymnast.time_step(delta_time)
+            self.assertAlmostEqual(gymnast.hinge.angle, program.angles_at(gymnast.time)[0])
+
+    def test_one_joint(self):
+        with self.assertRaises(ValueError):
+            Gymnast(motion=MotionProgram((0, 1), ((0, 0), (1, 1))))
+
+    def test_deterministic_replay(self):
+        program = MotionProgram((0, 0.5, 1), ((0,), (-0.8,), (-0.2,)))
+        runs = []
+        for _ in range(2):
+            gymnast = Gymnast(motion=program)
+            Simulator(gymnast, 0.01).run(60)
+            runs.append([tuple(body.pos) for body in gymnast.bodies])
+        self.assertEqual(runs[0], runs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from airtime.body import Color, Cube
+from airtime.camera import Camera
+from airtime.gymnast import Gymnast
+from airtime.offscreen import ImageSequenceWriter, OffscreenRenderer, render_replay
+from airtime.recording import TrajectoryRecorder
+from airtime.renderer import InstancedRenderer
+from airtime.replay import Replay
+from airtime.simulator import Simulator
+from fixtures import gl_context
+
+
+class TestOffscreenRenderer(unittest.TestCase):
+    def setUp(self):
+        self.ctx = gl_context()
+        if self.ctx is None:
+            self.skipTest("no OpenGL context")
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.ctx.release()
+        self.directory.cleanup()
+
+    def test_frames_in_order(self):
+        cube = Cube(self.ctx, 1, 1, 1, Color(1, 0, 0))
+        renderer = InstancedRenderer(self.ctx)
+        camera = Camera(aspect_ratio=2)
+        images = []
+
+        def writer(index, image):
+            images.append((index, image))
+
+        with OffscreenRenderer(self.ctx, (64, 32), writer, buffers=2) as offscreen:
+            for k in range(5):
+                offscreen.use()
+                renderer.draw(cube, [(k - 2, 0, 0)], [(1, 0, 0, 0)])
+                renderer.render(camera)
+                offscreen.capture()
+        self.assertEqual([index for index, _ in images], list(range(5)))
+        previous = -np.inf
+        for _, image in images:
+            self.assertEqual(image.shape, (32, 64, 3))
+            self.assertEqual(image[:, :, 1:].max(), 0)
+            # The cube moves from left to right
+            columns = np.nonzero(image[16, :, 0])[0]
+            self.assertGreater(columns.mean(), previous)
+            previous = columns.mean()
+
+    def test_writer_error(self):
+        def fail(index, image):
+            raise OSError("disk full")
+
+        offscreen = OffscreenRenderer(self.ctx, (8, 8), fail)
+        offscreen.use()
+        offscreen.capture()
+        with self.assertRaises(RuntimeError):
+            offscreen.close()
+
+    def test_render_replay(self):
+        path = os.path.join(self.directory.name, "trajectory.npy")
+        gymnast = Gymnast()
+        with TrajectoryRecorder(path, gymnast.bodies) as recorder:
+            Simulator(gymnast, 0.01).run(10, recorder)
+        pattern = os.path.join(self.directory.name, "frame_{:03d}.png")
+        bodies = Gymnast(self.ctx).bodies
+        frames = render_replay(self.ctx, Replay(path, skip=3), bodies, ImageSequenceWriter(pattern), (40, 30))
+        self.assertEqual(frames, 4)
+        files = sorted(os.listdir(self.directory.name))
+        self.assertEqual(files, [f"frame_{k:03d}.png" for k in range(4)] + ["trajectory.npy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import csv
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from airtime.body import Color, Cube
+from airtime.camera import Camera
+from airtime.profiling import FrameProfiler, Overlay
+from airtime.renderer import InstancedRenderer, set_profiler
+from fixtures import gl_context
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_sections_and_counts(self):
+        profiler = FrameProfiler(window=4)
+        for k in range(6):
+            with profiler.section("render"):
+                time.sleep(0.002)
+            with profiler.section("render"):
+                pass
+            if k >= 3:
+                profiler.count("draw_calls", k)
+            profiler.end_frame()
+        self.assertEqual(profiler.frames, 6)
+        self.assertEqual(list(profiler.counts["draw_calls"]), [0, 3, 4, 5])
+        render = np.array(profiler.times["render"])
+        self.assertEqual(len(render), 4)
+        self.assertGreaterEqual(render.min(), 2)
+        self.assertTrue(np.all(np.array(profiler.times["frame"]) >= render))
+        np.testing.assert_allclose(profiler.percentiles("draw_calls", (0, 50, 100)), (0, 3.5, 5))
+
+    def test_no_frames(self):
+        profiler = FrameProfiler()
+        self.assertTrue(np.isnan(profiler.percentiles("frame")).all())
+        self.assertTrue(np.isnan(profiler.percentiles("unknown")).all())
+
+    def test_export(self):
+        profiler = FrameProfiler(window=3)
+        for k in range(5):
+            with profiler.section("time_step"):
+                pass
+            profiler.count("uniform_writes", k % 2)
+            profiler.end_frame()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.csv")
+            profiler.export(path)
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["index", "frame", "time_step", "uniform_writes"])
+            self.assertEqual([row[0] for row in rows[1:]], ["2", "3", "4"])
+            self.assertEqual([row[3] for row in rows[1:]], ["0", "1", "0"])
+            path = os.path.join(directory, "profile.json")
+            profiler.export(path)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.assertEqual(set(data["summary"]["frame"]), {"p50", "p95", "p99", "mean"})
+            self.assertAlmostEqual(data["summary"]["uniform_writes"]["mean"], 1 / 3)
+            self.assertEqual([frame["index"] for frame in data["frames"]], [2, 3, 4])
+
+
+class TestRendererCounts(unittest.TestCase):
+    def setUp(self):
+        self.ctx = gl_context()
+        if self.ctx is None:
+            self.skipTest("no OpenGL context")
+        self.fbo = self.ctx.simple_framebuffer((64, 64))
+        self.fbo.use()
+
+    def tearDown(self):
+        self.ctx.release()
+
+    def test_counts(self):
+        profiler = FrameProfiler()
+        set_profiler(self.ctx, profiler)
+        renderer = InstancedRenderer(self.ctx)
+        camera = Camera(aspect_ratio=1)
+        cube = Cube(self.ctx, 1, 1, 1, Color(1, 0, 0))
+        overlay = Overlay(self.ctx, (64, 64))
+        for _ in range(2):
+            renderer.draw(cube, [(0, 0, 0), (2, 0, 0)], [(1, 0, 0, 0)] * 2)
+            renderer.render(camera)
+            profiler.end_frame()
+        self.assertEqual(list(profiler.counts["draw_calls"]), [1, 1])
+        self.assertEqual(list(profiler.counts["buffer_writes"]), [1, 1])
+        # The camera did not move, its matrices are uploaded once
+        self.assertEqual(list(profiler.counts["uniform_writes"]), [1, 0])
+        cube.render(camera)
+        overlay.show(["text"])
+        overlay.render()
+        profiler.end_frame()
+        self.assertEqual(profiler.counts["draw_calls"][-1], 2)
+        self.assertEqual(profiler.counts["uniform_writes"][-1], 3)
+        self.assertEqual(profiler.counts["buffer_writes"][-1], 1)
+        self.assertEqual(profiler.counts["texture_writes"][-1], 1)
+
+    def test_overlay(self):
+        overlay = Overlay(self.ctx, (64, 64))
+        self.fbo.clear()
+        overlay.show(["p50 1.00", "p95 2.00"])
+        overlay.render()
+        pixels = np.frombuffer(self.fbo.read(), dtype=np.uint8).reshape(64, 64, 3)
+        width, height = overlay.texture.size
+        # Text in the top left corner, which is the last rows of the framebuffer
+        self.assertGreater(pixels[64 - height :, :width].max(), 0)
+        self.assertEqual(pixels[: 64 - height].max(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
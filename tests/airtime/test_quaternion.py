@@ -89,6 +89,24 @@ class TestRotationQuaternion(unittest.TestCase):
         result = q.rotate(v)
         self.assertTrue(result.isclose(Vector(0, 1, 0)))
 
+    def test_from_axis(self):
+        q = RotationQuaternion.from_axis(Vector(0, 0, math.pi / 2))
+        self.assertTrue(q.rotate(Vector(1, 0, 0)).isclose(Vector(0, 1, 0)))
+        self.assertEqual(RotationQuaternion.from_axis(Vector(0, 0, 0)).angle(), 0)
+
+    def test_to_matrix(self):
+        q = RotationQuaternion(1.2, Vector(1, -2, 0.5))
+        v = Vector(0.3, 1, -2)
+        self.assertTrue((q.to_matrix() * v).isclose(q.rotate(v)))
+
+    def test_from_matrix(self):
+        for angle, axis in [(0.3, Vector(1, 2, 3)), (3.1, Vector(1, 0, 0)), (3.1, Vector(0, 1, 0.1)), (3.1, Vector(0, 0.1, 1))]:
+            q = RotationQuaternion(angle, axis)
+            result = Quaternion.from_matrix(q.to_matrix())
+            if result.a * q.a < 0:
+                result = -result
+            self.assertTrue(all(abs(x - y) < 1e-9 for x, y in zip((result.a, result.b, result.c, result.d), (q.a, q.b, q.c, q.d))))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from airtime import Vector
+from airtime.body import RigidBody
+from airtime.gymnast import Gymnast
+from airtime.matrix import Matrix
+from airtime.recording import TrajectoryRecorder, load_trajectory
+from airtime.rotating_body import RotatingBody
+from airtime.simulator import Simulator
+
+
+class TestTrajectoryRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trajectory.npy")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_gymnast(self):
+        gymnast = Gymnast()
+        rotation = RotatingBody(gymnast, Vector(0, 1, 0.1))
+        simulator = Simulator(rotation, 0.01)
+        with TrajectoryRecorder(self.path, gymnast.bodies, [gymnast.hinge], rotation, chunk=16) as recorder:
+            simulator.run(100, recorder)
+        trajectory = load_trajectory(self.path)
+        self.assertIsInstance(trajectory, np.memmap)
+        self.assertEqual(trajectory.shape, (100,))
+        self.assertAlmostEqual(trajectory["time"][-1], 1.0)
+        np.testing.assert_array_equal(trajectory["pos"][-1], gymnast.state.pos)
+        np.testing.assert_array_equal(trajectory["orientation"][-1], gymnast.state.orientation)
+        self.assertEqual(tuple(trajectory["w"][-1]), tuple(rotation.w))
+        self.assertAlmostEqual(trajectory["joints"][-1, 0], gymnast.hinge.angle)
+
+    def test_unpacked_bodies(self):
+        bodies = [RigidBody(Vector(k, 0, 0), Matrix.from_euler(0.1 * k, 0, 0), 1, Matrix.identity()) for k in range(3)]
+        with TrajectoryRecorder(self.path, bodies) as recorder:
+            recorder.record(0.5)
+            bodies[1].translate(Vector(0, 1, 0))
+            recorder.record(0.75)
+        trajectory = load_trajectory(self.path)
+        self.assertEqual(trajectory["joints"].shape, (2, 0))
+        np.testing.assert_array_equal(trajectory["time"], (0.5, 0.75))
+        np.testing.assert_array_equal(trajectory["pos"][1, 1], (1, 1, 0))
+        q = bodies[2].orientation
+        np.testing.assert_array_equal(trajectory["orientation"][1, 2], (q.a, q.b, q.c, q.d))
+
+    def test_readable_while_recording(self):
+        gymnast = Gymnast()
+        recorder = TrajectoryRecorder(self.path, gymnast.bodies, chunk=8)
+        simulator = Simulator(gymnast, 0.01)
+        simulator.run(20, recorder)
+        recorder.flush()
+        self.assertEqual(len(load_trajectory(self.path)), 20)
+        simulator.run(20, recorder)
+        recorder.close()
+        self.assertEqual(len(load_trajectory(self.path)), 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import numpy as np
+from airtime import Vector
+from airtime.body import Color, Cube, Cylinder, Sphere, model_matrix
+from airtime.camera import Camera
+from airtime.matrix import Matrix
+from airtime.renderer import InstancedRenderer, model_matrices, write_camera
+from fixtures import gl_context
+
+
+class TestModelMatrices(unittest.TestCase):
+    def test_matches_model_matrix(self):
+        rot = Matrix.from_euler(0.1, 0.2, 0.3)
+        q = Cube(None, 1, 1, 1, Color(1, 1, 1), rot=rot).orientation
+        expected = model_matrix(Vector(1, 2, 3), q.to_matrix(), (2, 3, 4))
+        model = model_matrices([(1, 2, 3)], [(q.a, q.b, q.c, q.d)], (2, 3, 4))
+        np.testing.assert_allclose(model[0], [x for column in expected.to_list() for x in column])
+
+
+class TestInstancedRenderer(unittest.TestCase):
+    def setUp(self):
+        self.ctx = gl_context()
+        if self.ctx is None:
+            self.skipTest("no OpenGL context")
+        self.ctx.enable(self.ctx.DEPTH_TEST)
+        self.fbo = self.ctx.simple_framebuffer((64, 64))
+        self.fbo.use()
+
+    def tearDown(self):
+        self.ctx.release()
+
+    def test_renders_instances(self):
+        cube = Cube(self.ctx, 1, 1, 1, Color(1, 0, 0))
+        renderer = InstancedRenderer(self.ctx)
+        n = 200
+        pos = np.zeros((n, 3))
+        pos[:, 0] = np.linspace(-5, 5, n)
+        orientation = np.tile((1.0, 0, 0, 0), (n, 1))
+        self.fbo.clear()
+        renderer.draw(cube, pos, orientation)
+        renderer.render(Camera(aspect_ratio=1))
+        pixels = np.frombuffer(self.fbo.read(), dtype=np.uint8).reshape(64, 64, 3)
+        # Red row of cubes across the middle, nothing above or below
+        self.assertGreater(pixels[32, 20:44, 0].min(), 0)
+        self.assertEqual(pixels[:, :, 1].max(), 0)
+        self.assertEqual(pixels[0].max(), 0)
+
+    def test_groups_by_mesh(self):
+        renderer = InstancedRenderer(self.ctx)
+        cubes = [Cube(self.ctx, k + 1, 1, 2, Color(0, 1, 0), pos=Vector(k, 0, 0)) for k in range(3)]
+        cylinder = Cylinder(self.ctx, 1, 1, 1, Color(0, 1, 0))
+        renderer.draw_bodies(cubes + [cylinder] + cubes)
+        self.assertEqual(len(renderer._groups), 2)
+        renderer.render(Camera(aspect_ratio=1))
+        self.assertEqual(renderer._groups[cubes[0].vertex_buffer].capacity, 6)
+
+    def test_draw_poses_matches_draw(self):
+        cubes = [Cube(self.ctx, 1, 1, 1, Color(1, 0, 0), pos=Vector(k - 2, 0, 0)) for k in range(5)]
+        renderer = InstancedRenderer(self.ctx)
+        camera = Camera(aspect_ratio=1)
+        images = []
+        for bulk in (False, True):
+            self.fbo.clear()
+            if bulk:
+                renderer.draw_bodies(cubes)
+            else:
+                for cube in cubes:
+                    q = cube.orientation
+                    renderer.draw(cube, [tuple(cube.pos)], [(q.a, q.b, q.c, q.d)])
+            renderer.render(camera)
+            images.append(self.fbo.read())
+        self.assertEqual(images[0], images[1])
+        self.assertGreater(max(images[0]), 0)
+
+    def test_draw_poses_follows_color_and_scale(self):
+        cube = Cube(self.ctx, 1, 1, 1, Color(1, 0, 0))
+        renderer = InstancedRenderer(self.ctx)
+        camera = Camera(aspect_ratio=1)
+        pixels = []
+        for _ in range(2):
+            self.fbo.clear()
+            renderer.draw_bodies([cube])
+            renderer.render(camera)
+            pixels.append(np.frombuffer(self.fbo.read(), dtype=np.uint8).reshape(64, 64, 3))
+            cube.color = Color(0, 1, 0)
+            cube.scale = (3, 1, 1)
+        self.assertEqual(pixels[0][:, :, 1].max(), 0)
+        self.assertEqual(pixels[1][:, :, 0].max(), 0)
+        self.assertGreater((pixels[1][:, :, 1] > 0).sum(), (pixels[0][:, :, 0] > 0).sum())
+
+    def test_layouts_are_bounded(self):
+        renderer = InstancedRenderer(self.ctx)
+        cubes = [Cube(self.ctx, 1, 1, 1, Color(1, 0, 0), pos=Vector(k, 0, 0)) for k in range(40)]
+        for k in range(len(cubes)):
+            renderer.draw_bodies(cubes[: k + 1])
+        self.assertEqual(len(renderer._layouts), renderer.max_layouts)
+        renderer.render(Camera(aspect_ratio=1))
+
+    def test_headless_body(self):
+        renderer = InstancedRenderer(self.ctx)
+        with self.assertRaises(ValueError):
+            renderer.draw_bodies([Cube(None, 1, 1, 1, Color(1, 0, 0))])
+
+
+class TestResourceCache(unittest.TestCase):
+    def setUp(self):
+        self.ctx = gl_context()
+        if self.ctx is None:
+            self.skipTest("no OpenGL context")
+
+    def tearDown(self):
+        self.ctx.release()
+
+    def test_shared_between_bodies(self):
+        cubes = [Cube(self.ctx, 1, k + 1, 1, Color(1, 1, 1)) for k in range(10)]
+        spheres = [Sphere(self.ctx, 1, 1, k + 1, Color(1, 1, 1)) for k in range(10)]
+        self.assertEqual(len({id(c.vertex_buffer) for c in cubes}), 1)
+        self.assertEqual(len({id(s.vertex_array) for s in spheres}), 1)
+        self.assertIs(cubes[0].vertex_array.program, spheres[0].vertex_array.program)
+        self.assertEqual(len(self.ctx.extra["meshes"]), 2)
+        self.assertEqual(len(self.ctx.extra["programs"]), 1)
+
+    def test_appearance_per_context(self):
+        other = gl_context()
+        try:
+            renderer = InstancedRenderer(other)
+            cubes = [Cube(other, 1, 1, 1, Color(1, 0, 0))]
+            renderer.draw_bodies(cubes)
+            layout = renderer._layouts[tuple(cubes)]
+            cube = Cube(self.ctx, 1, 1, 1, Color(1, 0, 0))
+            cube.color = Color(0, 1, 0)
+            cube.scale = (2, 1, 1)
+            Cube(None, 1, 1, 1, Color(1, 0, 0)).color = Color(0, 0, 1)
+            self.assertEqual(self.ctx.extra["appearance"], 2)
+            # Bodies of another context leave the layouts of this one alone
+            renderer.draw_bodies(cubes)
+            self.assertIs(renderer._layouts[tuple(cubes)], layout)
+        finally:
+            other.release()
+
+    def test_camera_written_on_change(self):
+        camera = Camera(aspect_ratio=1)
+        write_camera(self.ctx, camera)
+        buffer = self.ctx.extra["camera"]
+        self.assertEqual(buffer.read(), camera.projection.to_bytes() + camera.view.to_bytes())
+        key = self.ctx.extra["camera_key"]
+        write_camera(self.ctx, camera)
+        self.assertIs(self.ctx.extra["camera_key"], key)
+        camera.azimuth += 0.5
+        write_camera(self.ctx, camera)
+        self.assertEqual(buffer.read()[64:], camera.view.to_bytes())
+        # A new camera, possibly at the address of a freed one, is written too
+        del camera
+        camera = Camera(aspect_ratio=2)
+        write_camera(self.ctx, camera)
+        self.assertEqual(buffer.read(), camera.projection.to_bytes() + camera.view.to_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
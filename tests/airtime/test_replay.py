@@ -0,0 +1,90 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from airtime.gymnast import Gymnast
+from airtime.recording import TrajectoryRecorder, load_trajectory, trajectory_dtype
+from airtime.replay import Replay
+from airtime.simulator import Simulator
+
+
+class TestReplay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "trajectory.npy")
+        gymnast = Gymnast()
+        with TrajectoryRecorder(cls.path, gymnast.bodies, [gymnast.hinge]) as recorder:
+            Simulator(gymnast, 0.01).run(100, recorder)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_frames_match_recording(self):
+        replay = Replay(self.path)
+        trajectory = load_trajectory(self.path)
+        self.assertEqual(len(replay), 100)
+        t, pos, orientation = replay.frame(42)
+        self.assertEqual(t, trajectory["time"][42])
+        np.testing.assert_array_equal(pos, trajectory["pos"][42])
+        np.testing.assert_array_equal(orientation, trajectory["orientation"][42])
+
+    def test_body_count(self):
+        replay = Replay(self.path)
+        self.assertEqual(replay.bodies, 3)
+        replay.check_bodies(Gymnast().bodies)
+        with self.assertRaisesRegex(ValueError, "3 bodies, but 2"):
+            replay.check_bodies(Gymnast().bodies[:2])
+
+    def test_index_at(self):
+        replay = Replay(self.path)
+        self.assertEqual(replay.index_at(0.5), 49)
+        self.assertEqual(replay.index_at(0.504), 49)
+        self.assertEqual(replay.index_at(0.506), 50)
+        self.assertEqual(replay.index_at(-3), 0)
+        self.assertEqual(replay.index_at(7), 99)
+
+    def test_index_at_irregular_times(self):
+        trajectory = np.zeros(4, dtype=trajectory_dtype(1))
+        trajectory["time"] = (0, 0.1, 0.5, 0.6)
+        replay = Replay(trajectory)
+        self.assertEqual([replay.index_at(t) for t in (0.04, 0.2, 0.35, 0.58)], [0, 1, 2, 3])
+
+    def test_advance(self):
+        replay = Replay(self.path, speed=0.5)
+        replay.advance(0.2)
+        self.assertEqual(replay.index, 10)
+        replay.paused = True
+        replay.advance(0.2)
+        self.assertEqual(replay.index, 10)
+
+    def test_range_loops(self):
+        replay = Replay(self.path, first=10, last=20)
+        self.assertEqual(replay.index, 10)
+        replay.advance(0.05)
+        self.assertEqual(replay.index, 15)
+        replay.advance(0.07)
+        self.assertEqual(replay.index, 12)
+        replay.loop = False
+        replay.advance(1)
+        self.assertEqual(replay.index, 20)
+
+    def test_invalid_range(self):
+        for first, last in ((-1, 20), (20, 10), (0, 100), (100, None)):
+            with self.assertRaises(ValueError):
+                Replay(self.path, first=first, last=last)
+        self.assertEqual(Replay(self.path, first=99).index, 99)
+
+    def test_skip_and_step(self):
+        replay = Replay(self.path, skip=4)
+        replay.seek(0.075)
+        self.assertEqual(replay.index, 4)
+        replay.step(2)
+        self.assertEqual(replay.index, 12)
+        replay.step(-10)
+        self.assertEqual(replay.index, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
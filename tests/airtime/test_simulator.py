@@ -0,0 +1,72 @@
+import unittest
+import math
+from airtime import Vector
+from airtime.body import RigidBody
+from airtime.gymnast import Gymnast
+from airtime.matrix import Matrix
+from airtime.rotating_body import RotatingBody
+from airtime.simulator import FixedStepScheduler, Simulator
+
+
+class TestSimulator(unittest.TestCase):
+    def test_run(self):
+        body = RigidBody(None, None, 1, Matrix.from_diagonal(1, 2, 3))
+        simulator = Simulator(RotatingBody(body, Vector(0, 0, math.pi)), 0.001)
+        times = []
+        simulator.run(1000, callback=lambda s: times.append(s.time))
+        self.assertEqual(simulator.steps, 1000)
+        self.assertAlmostEqual(simulator.time, 1.0)
+        self.assertAlmostEqual(times[0], 0.001)
+        # Half a turn around the principal z-axis
+        self.assertTrue((body.rot * Vector(1, 0, 0)).isclose(Vector(-1, 0, 0)))
+
+    def test_run_until(self):
+        body = RigidBody(None, None, 1, Matrix.from_diagonal(1, 2, 3))
+        simulator = Simulator(RotatingBody(body, Vector(0.1, 1, 0)), 0.01)
+        simulator.run_until(0.5)
+        self.assertEqual(simulator.steps, 50)
+
+    def test_headless_gymnast(self):
+        gymnast = Gymnast(None)
+        Simulator(gymnast, 0.01).run(10)
+        self.assertAlmostEqual(gymnast.hinge.angle, math.pi / 2 - 0.1)
+
+
+class TestFixedStepScheduler(unittest.TestCase):
+    def test_independent_of_frame_times(self):
+        for frame_time in (1 / 30, 1 / 60, 1 / 144, 0.005):
+            gymnast = Gymnast()
+            scheduler = FixedStepScheduler(gymnast, 0.01, max_steps=10)
+            while scheduler.simulator.time < 0.5:
+                scheduler.advance(frame_time)
+            reference = Gymnast()
+            Simulator(reference, 0.01).run(scheduler.simulator.steps)
+            self.assertEqual(gymnast.hinge.angle, reference.hinge.angle)
+
+    def test_steps_per_frame(self):
+        scheduler = FixedStepScheduler(Gymnast(), 0.01)
+        self.assertEqual(scheduler.advance(0.025), 2)
+        self.assertAlmostEqual(scheduler.alpha, 0.5)
+        self.assertEqual(scheduler.advance(0.005), 1)
+        self.assertAlmostEqual(scheduler.alpha, 0)
+        self.assertEqual(scheduler.advance(0.004), 0)
+
+    def test_catch_up_is_capped(self):
+        scheduler = FixedStepScheduler(Gymnast(), 0.01, max_steps=4)
+        self.assertEqual(scheduler.advance(1), 4)
+        self.assertAlmostEqual(scheduler.dropped, 0.96)
+        self.assertEqual(scheduler.advance(0.01), 1)
+
+    def test_interpolated_poses(self):
+        body = RigidBody(None, None, 1, Matrix.from_diagonal(1, 1, 1))
+        scheduler = FixedStepScheduler(RotatingBody(body, Vector(0, 0, 1)), 0.1, bodies=[body])
+        scheduler.advance(0.1)
+        scheduler.advance(0.15)
+        # Rendering lags one step: half way between the turns by 0.1 and 0.2
+        pos, orientation = scheduler.poses()[0]
+        expected = Matrix.from_axis_angle(Vector(0, 0, 1), 0.15)
+        self.assertTrue((orientation.to_matrix() * Vector(1, 0, 0)).isclose(expected * Vector(1, 0, 0)))
+        self.assertEqual(pos, Vector(0, 0, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import math
+from airtime import Vector, RotationQuaternion
+from airtime.body import RigidBody, MultiBody
+from airtime.matrix import Matrix
+
+
+def make_bodies():
+    return [
+        RigidBody(Vector(0, 0, 0), None, 2, Matrix.from_diagonal(1, 2, 3)),
+        RigidBody(Vector(1, 2, 3), Matrix.from_euler(0.1, 0.2, 0.3), 1, Matrix.from_diagonal(4, 5, 6)),
+        RigidBody(Vector(-2, 1, 0), Matrix.from_euler(0.5, -0.4, 1.0), 3, Matrix.from_diagonal(1, 1, 2)),
+    ]
+
+
+def assert_matrix_almost_equal(test, a, b):
+    for i in range(3):
+        for j in range(3):
+            test.assertAlmostEqual(a[i][j], b[i][j])
+
+
+class TestBodyState(unittest.TestCase):
+    def test_bodies_are_views(self):
+        bodies = make_bodies()
+        multi = MultiBody(bodies, packed=True)
+        bodies[1].translate(Vector(1, 1, 1))
+        self.assertEqual(bodies[1].pos, Vector(2, 3, 4))
+        self.assertEqual(multi.state.pos[1].tolist(), [2, 3, 4])
+        self.assertEqual(bodies[2].m, 3)
+
+    def test_center_of_mass(self):
+        packed = MultiBody(make_bodies(), packed=True)
+        unpacked = MultiBody(make_bodies())
+        self.assertTrue(packed.center_of_mass.isclose(unpacked.center_of_mass))
+        self.assertTrue(packed.center_of_mass.isclose(Vector(-5 / 6, 5 / 6, 0.5)))
+
+    def test_translate(self):
+        multi = MultiBody(make_bodies(), packed=True)
+        multi.translate(Vector(1, 0, -1))
+        self.assertEqual(multi.bodies[0].pos, Vector(1, 0, -1))
+        self.assertEqual(multi.bodies[2].pos, Vector(-1, 1, -1))
+
+    def test_rotate(self):
+        multi = MultiBody(make_bodies(), packed=True)
+        r = RotationQuaternion(math.pi / 2, Vector(0, 0, 1))
+        multi.rotate(Vector(1, 0, 0), r)
+        self.assertTrue(multi.bodies[0].pos.isclose(Vector(1, -1, 0)))
+        self.assertTrue(multi.bodies[1].pos.isclose(Vector(-1, 0, 3)))
+        assert_matrix_almost_equal(self, multi.bodies[0].rot, Matrix.from_axis_angle(Vector(0, 0, 1), math.pi / 2))
+
+    def test_rotate_matches_unpacked(self):
+        packed = MultiBody(make_bodies(), packed=True)
+        unpacked = MultiBody(make_bodies())
+        r = RotationQuaternion(0.7, Vector(1, 2, -1))
+        for _ in range(100):
+            packed.rotate(Vector(0.5, 0, 1), r)
+            unpacked.rotate(Vector(0.5, 0, 1), r)
+        for a, b in zip(packed.bodies, unpacked.bodies):
+            self.assertTrue(a.pos.isclose(b.pos))
+            assert_matrix_almost_equal(self, a.rot, b.rot)
+
+    def test_inertia_tensor_in(self):
+        packed = MultiBody(make_bodies(), packed=True)
+        unpacked = MultiBody(make_bodies())
+        pos = Vector(0.5, -1, 2)
+        rot = Matrix.from_euler(0.3, 0.2, 0.1)
+        assert_matrix_almost_equal(
+            self, packed.inertia_tensor_in(pos, rot), unpacked.inertia_tensor_in(pos, rot)
+        )
+
+    def test_inertia_tensor_frame(self):
+        # rot maps the frame to world coordinates, like Body.rot: the body turned by a
+        # quarter around z has its x axis along world y
+        quarter = Matrix.from_axis_angle(Vector(0, 0, 1), math.pi / 2)
+        i = Matrix(2, 0, 1, 0, 3, 0, 1, 0, 4)
+        for packed in (False, True):
+            body = MultiBody([RigidBody(Vector(0, 0, 0), quarter, 2, i)], packed=packed)
+            world = body.inertia_tensor_in(Vector(0, 0, 0), Matrix.identity())
+            assert_matrix_almost_equal(self, world, Matrix(3, 0, 0, 0, 2, 1, 0, 1, 4))
+            # In its own frame the body has its own tensor
+            assert_matrix_almost_equal(self, body.inertia_tensor_in(Vector(0, 0, 0), quarter), i)
+            # The offset along world x lies along -y of the frame
+            assert_matrix_almost_equal(
+                self, body.inertia_tensor_in(Vector(1, 0, 0), quarter), Matrix(4, 0, 1, 0, 3, 0, 1, 0, 6)
+            )
+
+
+class TestInertiaCache(unittest.TestCase):
+    def test_body_cache(self):
+        body = make_bodies()[1]
+        pos = Vector(0.5, -1, 2)
+        rot = Matrix.from_euler(0.3, 0.2, 0.1)
+        i = body.inertia_tensor_in(pos, rot)
+        cache = body._inertia_cache
+        self.assertEqual(body.inertia_tensor_in(pos, rot), i)
+        self.assertIs(body._inertia_cache, cache)
+        self.assertNotEqual(body.inertia_tensor_in(pos, Matrix.identity()), i)
+        body.translate(Vector(1, 0, 0))
+        moved = body.inertia_tensor_in(pos, rot)
+        self.assertNotEqual(moved, i)
+        body.rotate(pos, RotationQuaternion(0.5, Vector(0, 1, 0)))
+        self.assertNotEqual(body.inertia_tensor_in(pos, rot), moved)
+
+    def test_multi_body_recomputes_moved_bodies(self):
+        for packed in (False, True):
+            multi = MultiBody(make_bodies(), packed=packed)
+            reference = MultiBody(make_bodies())
+            pos = Vector(0.5, -1, 2)
+            rot = Matrix.from_euler(0.3, 0.2, 0.1)
+            multi.inertia_tensor_in(pos, rot)
+            for body in (multi.bodies[2], reference.bodies[2]):
+                body.rotate(Vector(1, 1, 0), RotationQuaternion(0.4, Vector(1, 0, 1)))
+                body.translate(Vector(0, 2, 0))
+            assert_matrix_almost_equal(
+                self, multi.inertia_tensor_in(pos, rot), reference.inertia_tensor_in(pos, rot)
+            )
+            multi.translate(Vector(1, 2, 3))
+            reference.translate(Vector(1, 2, 3))
+            assert_matrix_almost_equal(
+                self, multi.inertia_tensor_in(pos, rot), reference.inertia_tensor_in(pos, rot)
+            )
+
+    def test_results_are_not_shared(self):
+        for multi in (MultiBody(make_bodies()), MultiBody(make_bodies(), packed=True)):
+            body = multi.bodies[0]
+            pos = Vector(0.5, -1, 2)
+            rot = Matrix.from_euler(0.3, 0.2, 0.1)
+            expected = body.inertia_tensor_in(pos, rot)
+            i = body.inertia_tensor_in(pos, rot)
+            i += Matrix.identity()
+            self.assertEqual(body.inertia_tensor_in(pos, rot), expected)
+            expected = multi.inertia_tensor_in(pos, rot)
+            t = multi.inertia_tensor_in(pos, rot)
+            t *= 2
+            self.assertEqual(multi.inertia_tensor_in(pos, rot), expected)
+
+    def test_multi_body_recomputes_only_changed_bodies(self):
+        pos = Vector(0.5, -1, 2)
+        rot = Matrix.from_euler(0.3, 0.2, 0.1)
+        multi = MultiBody(make_bodies())
+        multi.inertia_tensor_in(pos, rot)
+        caches = [body._inertia_cache for body in multi.bodies]
+        multi.bodies[1].translate(Vector(0, 1, 0))
+        multi.inertia_tensor_in(pos, rot)
+        kept = [body._inertia_cache is cache for body, cache in zip(multi.bodies, caches)]
+        self.assertEqual(kept, [True, False, True])
+
+        packed = MultiBody(make_bodies(), packed=True)
+        recomputed = []
+        compute = packed.state._inertia_tensors
+
+        def spy(pos, rot, index):
+            recomputed.append(list(index))
+            return compute(pos, rot, index)
+
+        packed.state._inertia_tensors = spy
+        packed.inertia_tensor_in(pos, rot)
+        packed.bodies[2].translate(Vector(0, 1, 0))
+        packed.inertia_tensor_in(pos, rot)
+        packed.inertia_tensor_in(pos, rot)
+        self.assertEqual(recomputed, [[0, 1, 2], [2]])
+
+    def test_bind_keeps_versions_increasing(self):
+        body = make_bodies()[1]
+        version = body.version
+        multi = MultiBody([body], packed=True)
+        self.assertEqual(body.version, version)
+        multi.translate(Vector(1, 0, 0))
+        self.assertGreater(body.version, version)
+
+
+if __name__ == "__main__":
+    unittest.main()
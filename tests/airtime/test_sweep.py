@@ -0,0 +1,26 @@
+import unittest
+import math
+from airtime import Vector
+from airtime.matrix import Matrix
+from airtime.sweep import Skill, SkillSimulation, landing_error, simulate, sweep
+
+
+class TestSweep(unittest.TestCase):
+    def test_landing_error(self):
+        target = Matrix.identity()
+        self.assertAlmostEqual(landing_error(target, target), 0)
+        quarter = Matrix.from_axis_angle(Vector(1, 0, 0), math.pi / 2)
+        self.assertAlmostEqual(landing_error(quarter, target), math.pi / 2)
+
+    def test_sweep_matches_serial(self):
+        skills = [Skill((0.1 * i, 2, 0), bend=-0.01, bend_steps=5) for i in range(5)]
+        results = list(sweep(skills, steps=20, delta_time=0.01, max_workers=2, chunksize=2))
+        self.assertCountEqual([r.parameters for r in results], skills)
+        for result in results:
+            expected = simulate(result.parameters, SkillSimulation, 20, 0.01, Matrix.identity())
+            self.assertAlmostEqual(result.landing_error, expected.landing_error)
+            self.assertEqual(result.orientation, expected.orientation)
+
+
+if __name__ == "__main__":
+    unittest.main()
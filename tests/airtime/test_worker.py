@@ -0,0 +1,61 @@
+import unittest
+import time
+import numpy as np
+from airtime.gymnast import Gymnast
+from airtime.worker import PhysicsWorker, PoseBuffer
+
+
+class TestPoseBuffer(unittest.TestCase):
+    def test_write_read(self):
+        buffer = PoseBuffer(2)
+        try:
+            reader = PoseBuffer(2, buffer.name)
+            for k in range(3):
+                pos = np.arange(6.0).reshape(2, 3) + k
+                orientation = np.tile((1.0, 0, 0, 0), (2, 1))
+                buffer.write(k * 0.1, pos, orientation)
+                t, p, q = reader.read()
+                self.assertEqual(t, k * 0.1)
+                np.testing.assert_array_equal(p, pos)
+                np.testing.assert_array_equal(q, orientation)
+            reader.close()
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+    def test_nothing_published(self):
+        buffer = PoseBuffer(2)
+        try:
+            self.assertIsNone(buffer.read())
+            self.assertFalse(buffer.wait(0.01))
+            buffer.write(0.0, np.zeros((2, 3)), np.tile((1.0, 0, 0, 0), (2, 1)))
+            self.assertTrue(buffer.wait(0.01))
+            self.assertIsNotNone(buffer.read())
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+
+class TestPhysicsWorker(unittest.TestCase):
+    def run_worker(self, process: bool):
+        with PhysicsWorker(Gymnast, 3, 0.01, process=process) as worker:
+            # The initial poses are published before start returns
+            _, _, orientation = worker.read()
+            np.testing.assert_allclose(np.linalg.norm(orientation, axis=1), 1)
+            deadline = time.perf_counter() + 10
+            while worker.read()[0] < 0.1 and time.perf_counter() < deadline:
+                time.sleep(0.01)
+            t, pos, orientation = worker.read()
+        self.assertGreaterEqual(t, 0.1)
+        self.assertEqual(pos.shape, (3, 3))
+        np.testing.assert_allclose(np.linalg.norm(orientation, axis=1), 1)
+
+    def test_thread(self):
+        self.run_worker(process=False)
+
+    def test_process(self):
+        self.run_worker(process=True)
+
+
+if __name__ == "__main__":
+    unittest.main()